@@ -0,0 +1,180 @@
+import os
+import shutil
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from convert_text_to_image import (convert_file, render_settings, default_output_file, DEFAULT_PROFILE, NORMAL_FONT_SIZE, TITLE_FONT_SIZE,
+                                   SECTION_FONT_SIZE, WATERMARK_WIDTH, WATERMARK_OPACITY)
+from font_registry import preload_fonts, get_registry, FONT_PATHS
+from font_coverage import get_coverage_index
+from font_discovery import get_font_index
+from watermark import get_watermark
+from build_manifest import BuildManifest, file_hash, settings_hash
+from render_profiler import RenderProfiler, NULL_PROFILER
+
+# 파일 하나의 변환 결과 (error가 None이면 성공, skipped면 이전 결과를 그대로 사용)
+# profile은 프로파일링을 켠 경우 워커에서 만든 기록(dict)
+BatchResult = namedtuple('BatchResult', ['input_file', 'image_file', 'error', 'skipped', 'profile'],
+                         defaults=(False, None))
+
+def is_input_file(filename):
+    # .txt 파일 또는 확장자가 없는 파일만 변환 대상
+    return filename.lower().endswith('.txt') or os.path.splitext(filename)[1] == ''
+
+def find_input_files(input_dir):
+    # 디렉터리에서 변환 대상 파일 경로 목록을 반환
+    return [os.path.join(input_dir, f) for f in os.listdir(input_dir)
+            if os.path.isfile(os.path.join(input_dir, f)) and is_input_file(f)]
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+def warm_up():
+    # 워커 프로세스 시작 시 모든 언어의 폰트와 워터마크를 미리 로드
+    specs = []
+    for language in FONT_PATHS:
+        specs += [(language, 'normal', NORMAL_FONT_SIZE),
+                  (language, 'bold', TITLE_FONT_SIZE),
+                  (language, 'bold', SECTION_FONT_SIZE)]
+    try:
+        preload_fonts(specs)
+        # 글자 단위 폰트 대체에 쓰는 글자 범위도 미리 읽어 둠 (디스크 캐시가 있으면 바로 로드됨)
+        index = get_coverage_index()
+        for language, weight, size in specs:
+            index.coverage(get_registry().get(language, weight, size))
+    except Exception as e:
+        print(f"폰트 미리 로드 실패: {e}")
+    try:
+        get_watermark(WATERMARK_WIDTH, WATERMARK_OPACITY)
+    except Exception as e:
+        print(f"워터마크 미리 로드 실패: {e}")
+
+def move_to_output(file_path, output_dir):
+    # 처리가 끝난 원본을 output 폴더로 이동 (같은 이름의 파일이 있으면 덮어씀)
+    shutil.move(file_path, os.path.join(output_dir, os.path.basename(file_path)))
+
+def convert_and_move(file_path, output_dir, profile=False, **render_options):
+    """
+    파일 하나를 변환해서 이미지를 output 폴더에 바로 저장하고, 성공한 경우에만 원본을 output 폴더로 이동
+
+    render_options는 convert_file에 그대로 전달됩니다 (encoder, paginate, strip_height).
+    페이지를 나눈 경우 image_file은 이미지 경로 목록입니다.
+    profile이면 이 프로세스에서 프로파일러를 만들어 이동까지 포함한 기록을 결과에 담습니다.
+    """
+    if not profile:
+        return _convert_and_move(file_path, output_dir, NULL_PROFILER, render_options)
+
+    profiler = RenderProfiler()
+    with profiler.file(file_path):
+        result = _convert_and_move(file_path, output_dir, profiler, render_options)
+    return result._replace(profile=profiler.records[-1])
+
+def _convert_and_move(file_path, output_dir, profiler, render_options):
+    try:
+        # 이미지는 입력 폴더를 거치지 않고 output 폴더에 바로 저장
+        output_file = default_output_file(file_path, render_options.get('encoder', DEFAULT_PROFILE), output_dir)
+        image_file = convert_file(file_path, output_file, profiler=profiler, **render_options)
+        if not image_file:
+            return BatchResult(file_path, None, '변환할 수 없는 파일입니다')
+
+        with profiler.stage('move'):
+            move_to_output(file_path, output_dir)
+        return BatchResult(file_path, image_file, None)
+    except Exception as e:
+        # 파일 하나의 실패가 전체 배치를 중단시키지 않도록 결과로 전달
+        return BatchResult(file_path, None, str(e))
+
+def convert_batch(files, output_dir, jobs=None, use_manifest=True, force=False, profile=False, cancel_event=None,
+                  **render_options):
+    """
+    여러 파일을 프로세스 풀에서 병렬로 변환하고 결과를 제출 순서대로 yield
+
+    jobs가 1이면 풀 없이 현재 프로세스에서 순차 처리합니다.
+    use_manifest면 output 폴더의 빌드 목록을 보고 내용과 설정이 그대로인 파일은
+    다시 변환하지 않고 원본만 output 폴더로 이동하며(skipped 결과를 먼저 yield),
+    force면 목록과 관계없이 모두 다시 변환합니다. 목록은 파일 이름으로 찾으므로
+    다른 폴더에서 온 같은 이름의 파일도 같은 항목으로 취급합니다.
+    profile이면 변환한 파일마다 결과의 profile에 단계별 기록이 담깁니다.
+    cancel_event(threading.Event)가 설정되면 아직 시작하지 않은 파일은 변환하지 않고
+    (결과도 yield하지 않음) 이미 변환 중인 파일의 결과만 yield한 뒤 끝납니다.
+    render_options는 convert_file에 그대로 전달됩니다.
+    """
+    if not use_manifest:
+        yield from _convert_all(list(files), output_dir, jobs, profile, cancel_event, render_options)
+        return
+
+    manifest = BuildManifest.for_output_dir(output_dir)
+    settings_digest = settings_hash(render_settings(**render_options))
+    content_hashes = {}
+    todo = []
+    for file_path in files:
+        if _is_cancelled(cancel_event):
+            return
+        name = os.path.basename(file_path)
+        try:
+            content_hashes[file_path] = file_hash(file_path)
+        except OSError as e:
+            yield BatchResult(file_path, None, str(e))
+            continue
+        if not force and manifest.is_current(name, content_hashes[file_path], settings_digest):
+            # 변환한 파일과 마찬가지로 원본을 output 폴더로 옮겨서 입력 폴더를 비움
+            try:
+                move_to_output(file_path, output_dir)
+            except OSError as e:
+                yield BatchResult(file_path, None, str(e))
+                continue
+            yield BatchResult(file_path, manifest.entries[name]['output'], None, True)
+        else:
+            todo.append(file_path)
+
+    try:
+        for i, result in enumerate(_convert_all(todo, output_dir, jobs, profile, cancel_event, render_options), 1):
+            if not result.error:
+                manifest.record(os.path.basename(result.input_file), content_hashes[result.input_file],
+                                settings_digest, result.image_file)
+                # 중간에 중단되어도 그때까지의 결과는 남도록 주기적으로 저장
+                if i % 100 == 0:
+                    manifest.save()
+            yield result
+    finally:
+        manifest.save()
+
+def _is_cancelled(cancel_event):
+    return cancel_event is not None and cancel_event.is_set()
+
+def _convert_all(files, output_dir, jobs, profile, cancel_event, render_options):
+    jobs = jobs or default_jobs()
+    jobs = max(1, min(jobs, len(files) or 1))
+
+    if jobs == 1:
+        for file_path in files:
+            if _is_cancelled(cancel_event):
+                return
+            yield convert_and_move(file_path, output_dir, profile, **render_options)
+        return
+
+    # 워커마다 폰트 폴더를 훑지 않도록 색인을 먼저 만들어 둠
+    get_font_index().faces()
+
+    # 메모리 사용을 제한하기 위해 동시에 대기 중인 작업 수를 제한
+    max_pending = jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_up) as executor:
+        pending = deque()
+        remaining = iter(files)
+        for file_path in remaining:
+            pending.append(executor.submit(convert_and_move, file_path, output_dir, profile, **render_options))
+            if len(pending) >= max_pending:
+                break
+
+        while pending:
+            yield pending.popleft().result()
+            if _is_cancelled(cancel_event):
+                # 시작하지 않은 작업을 먼저 모두 취소한 뒤 (기다리는 동안 풀이 다음 작업을 시작하지 않도록)
+                # 취소할 수 없었던 실행 중인 작업만 끝날 때까지 기다림
+                running = [future for future in pending if not future.cancel()]
+                for future in running:
+                    yield future.result()
+                return
+            for file_path in remaining:
+                pending.append(executor.submit(convert_and_move, file_path, output_dir, profile, **render_options))
+                break
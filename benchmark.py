@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+# 합성 코퍼스 생성용 어휘 (data/Done의 악보 형태를 흉내냄)
+LYRICS = {
+    'ko': ["사랑한다는 말은 하지 않아도", "너의 눈빛이 내게 말해줘", "오늘 밤은 너와 함께 걷고 싶어",
+           "기억 속의 그 노래가 들려와", "아무 말 없이 안아줄래", "우리 다시 만날 수 있을까",
+           "창밖에 비가 내리면", "하루 종일 네 생각만 나"],
+    'jp': ["君の名前を呼んでいる", "夢の中でまだ待っている", "夜空に星が光る",
+           "あの日の約束を忘れない", "涙の向こうに見えるもの", "もう一度だけ会いたい"],
+    'cn': ["我们的爱情在这里", "你是我心中的梦想", "时间过得很快",
+           "月亮代表我的心", "一个人走在路上", "想你的夜晚不会太长"],
+}
+CHORDS = ["C", "G", "Am", "F", "Em", "Dm", "D", "E", "A", "Bm", "Cmaj7", "G7", "Fmaj7", "Asus4", "Bb"]
+SECTIONS = ["[Intro]", "[Verse 1]", "[Pre-Chorus]", "[Chorus]", "[Verse 2]", "[Bridge]", "[Chorus 2]", "[Outro]"]
+METADATA = ["Capo 2", "Written by Someone", "Key: G", "https://example.com/tab"]
+
+# 곡 길이 구간 (섹션 반복 횟수)
+SONG_LENGTHS = {'short': 1, 'medium': 3, 'long': 8, 'very_long': 25}
+
+# 코퍼스 크기별 (언어별 곡 수, 길이 분포)
+CORPUS_SIZES = {
+    'small': (4, ['short', 'medium', 'long', 'very_long']),
+    'medium': (20, ['short'] * 3 + ['medium'] * 4 + ['long'] * 2 + ['very_long']),
+    'large': (100, ['short'] * 3 + ['medium'] * 4 + ['long'] * 2 + ['very_long']),
+}
+
+def _chord_line(rng):
+    return "      ".join(rng.choice(CHORDS) for _ in range(rng.randint(2, 5)))
+
+def generate_song(rng, language, length):
+    """악보 하나를 생성 (섹션 헤더, 코드 줄, 가사 줄, 약간의 메타데이터)"""
+    lines = []
+    if rng.random() < 0.5:
+        lines += [rng.choice(METADATA), ""]
+    for _ in range(SONG_LENGTHS[length]):
+        for section in SECTIONS:
+            lines.append(section)
+            for _ in range(rng.randint(2, 4)):
+                lines.append(_chord_line(rng))
+                lines.append(rng.choice(LYRICS[language]))
+            lines.append("")
+    return "\n".join(lines)
+
+def generate_corpus(out_dir, size='small', seed=0):
+    """재현 가능한 합성 코퍼스를 out_dir에 만들고 파일 경로 목록을 반환"""
+    rng = random.Random(seed)
+    per_language, lengths = CORPUS_SIZES[size]
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for language in LYRICS:
+        for i in range(per_language):
+            length = lengths[i % len(lengths)]
+            # 일부 파일은 data/Done처럼 버전 표기가 붙은 이름 사용
+            version = f" (ver {rng.randint(2, 4)})" if rng.random() < 0.2 else ""
+            name = f"Artist{i} {language} - Song {i} {length}{version}.txt"
+            path = os.path.join(out_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_song(rng, language, length))
+            paths.append(path)
+    return paths
+
+def _peak_rss_mb():
+    if resource is None:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def percentile(values, percent):
+    """값 목록의 percent 백분위수 (목록이 비어 있으면 None)"""
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+def _bench_convert_file(path, work_dir):
+    from convert_text_to_image import convert_file
+    convert_file(path, os.path.join(work_dir, "out.png"))
+
+def _bench_clean_file_content(path, work_dir):
+    from clean_song_content import clean_file_content
+    # 원본 코퍼스를 바꾸지 않도록 복사본을 정리
+    copy_path = os.path.join(work_dir, os.path.basename(path))
+    shutil.copyfile(path, copy_path)
+    clean_file_content(copy_path)
+
+def _bench_chord_image(path, work_dir):
+    from chord_generator import ChordGenerator
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    ChordGenerator().create_chord_image(text, os.path.join(work_dir, "chord.png"))
+
+def _bench_remove_newlines(path, work_dir):
+    from remove_newlines import remove_extra_newlines
+    copy_path = os.path.join(work_dir, os.path.basename(path))
+    shutil.copyfile(path, copy_path)
+    remove_extra_newlines(copy_path)
+
+def _bench_version_parsing(path, work_dir):
+    import remove_old_versions
+    import remove_version_from_filename
+    filename = os.path.basename(path)
+    remove_old_versions.extract_version(filename)
+    remove_old_versions.get_base_song_name(filename)
+    remove_version_from_filename.extract_version(filename)
+    remove_version_from_filename.get_base_song_name(filename)
+
+BENCHMARKS = {
+    'convert_file': _bench_convert_file,
+    'clean_file_content': _bench_clean_file_content,
+    'chord_image': _bench_chord_image,
+    'remove_newlines': _bench_remove_newlines,
+    'version_parsing': _bench_version_parsing,
+}
+
+def _run_benchmark(name, paths):
+    # 벤치마크마다 새 프로세스에서 실행되어 peak RSS가 다른 벤치마크와 섞이지 않음
+    os.chdir(ROOT_DIR)
+    func = BENCHMARKS[name]
+    latencies = []
+    with tempfile.TemporaryDirectory() as work_dir, open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for path in paths:
+                file_start = time.perf_counter()
+                func(path, work_dir)
+                latencies.append(time.perf_counter() - file_start)
+            total = time.perf_counter() - start
+
+    return {
+        'files': len(paths),
+        'seconds': round(total, 4),
+        'files_per_sec': round(len(paths) / total, 2) if total else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+def git_commit():
+    """현재 커밋 해시 (git을 사용할 수 없으면 None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(names, size='small', seed=0, corpus_dir=None):
+    """코퍼스를 만들고 벤치마크를 실행해서 결과 dict를 반환"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = generate_corpus(corpus_dir or tmp_dir, size, seed)
+        results = {}
+        context = multiprocessing.get_context('spawn')
+        for name in names:
+            print(f"벤치마크 실행 중: {name} ({len(paths)}개 파일)")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[name] = executor.submit(_run_benchmark, name, paths).result()
+
+    return {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {'size': size, 'seed': seed, 'files': len(paths)},
+        'results': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 악보 코퍼스로 변환 도구의 처리 속도를 측정합니다.")
+    parser.add_argument("--size", choices=sorted(CORPUS_SIZES), default='small', help="코퍼스 크기")
+    parser.add_argument("--seed", type=int, default=0, help="코퍼스 생성 시드 (같으면 같은 코퍼스)")
+    parser.add_argument("--only", nargs='+', choices=sorted(BENCHMARKS), help="실행할 벤치마크")
+    parser.add_argument("--corpus-dir", help="코퍼스를 임시 폴더 대신 이 폴더에 생성")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.only or list(BENCHMARKS), args.size, args.seed, args.corpus_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'벤치마크':<20}{'files/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'RSS(MB)':>10}")
+    for name, result in report['results'].items():
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else "-"
+        print(f"{name:<20}{result['files_per_sec']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}{rss:>10}")
+    print(f"\n결과가 저장되었습니다: {args.output}")
+
+if __name__ == '__main__':
+    main()
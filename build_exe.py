@@ -1,20 +1,42 @@
 import PyInstaller.__main__
 import os
+import argparse
 
-def build_exe():
+# GUI에서 쓰지 않는 모듈 (번들 크기와 시작 시 압축 해제/로드 시간을 줄임)
+EXCLUDED_MODULES = [
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb', 'lib2to3', 'xmlrpc',
+    'numpy', 'cairosvg', 'watchdog', 'psutil',
+    # src/ 의 악보 생성 도구에서만 사용
+    'ollama', 'requests', 'bs4', 'schedule', 'dotenv', 'httpx',
+    # 사용하지 않는 Qt 모듈
+    'PyQt5.QtNetwork', 'PyQt5.QtSql', 'PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebEngineCore',
+    'PyQt5.QtMultimedia', 'PyQt5.QtQml', 'PyQt5.QtQuick', 'PyQt5.QtBluetooth', 'PyQt5.QtDBus',
+]
+
+# onedir: 폴더 하나로 배포, 실행할 때마다 압축을 풀지 않아 빨리 뜸 (기본값)
+# onefile: 실행 파일 하나로 배포, 실행할 때마다 임시 폴더에 전체를 풀어서 느림
+PROFILES = ['onedir', 'onefile']
+
+def build_exe(profile='onedir'):
     script_path = os.path.abspath('text_to_image_gui.py')
     icon_path = os.path.abspath('assets/cute_icon.ico')
     assets_path = os.path.abspath('assets')
-    
+
     PyInstaller.__main__.run([
         script_path,
         '--name=텍스트이미지변환기',
-        '--onefile',
+        f'--{profile}',
         '--windowed',
         f'--icon={icon_path}',
-        f'--add-data={assets_path};assets',
+        f'--add-data={assets_path}{os.pathsep}assets',
+        *[f'--exclude-module={module}' for module in EXCLUDED_MODULES],
+        '--noconfirm',
         '--clean'
     ])
 
 if __name__ == '__main__':
-    build_exe() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="GUI 실행 파일을 만듭니다.")
+    parser.add_argument("--profile", choices=PROFILES, default='onedir',
+                        help="onedir: 폴더로 배포, 빠른 시작 (기본값) / onefile: 실행 파일 하나")
+    args = parser.parse_args()
+    build_exe(args.profile)
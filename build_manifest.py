@@ -0,0 +1,79 @@
+import os
+import json
+import hashlib
+
+MANIFEST_NAME = ".render_manifest.json"
+MANIFEST_VERSION = 1
+
+def file_hash(path):
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def settings_hash(settings):
+    """렌더링 설정(dict)의 해시 - 설정이 바뀌면 모든 항목이 다시 렌더링됨"""
+    data = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+class BuildManifest:
+    """
+    악보 파일 → 출력 이미지 매핑을 (내용 해시, 설정 해시)와 함께 기록하는 증분 빌드 목록
+
+    output 폴더에 JSON으로 저장되며, 내용과 설정이 같고 출력 파일이 남아 있으면
+    다시 렌더링하지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_output_dir(cls, output_dir):
+        return cls(os.path.join(output_dir, MANIFEST_NAME))
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('entries', {})
+
+    def is_current(self, name, content_hash, settings_digest):
+        entry = self.entries.get(name)
+        if entry is None:
+            return False
+        outputs = entry['output'] if isinstance(entry['output'], list) else [entry['output']]
+        return (entry['content_hash'] == content_hash
+                and entry['settings_hash'] == settings_digest
+                and all(os.path.exists(output) for output in outputs))
+
+    def record(self, name, content_hash, settings_digest, output):
+        # output은 이미지 경로 또는 (페이지를 나눈 경우) 경로 목록
+        if isinstance(output, list):
+            output = [os.path.abspath(path) for path in output]
+        else:
+            output = os.path.abspath(output)
+        self.entries[name] = {
+            'content_hash': content_hash,
+            'settings_hash': settings_digest,
+            'output': output
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        # 저장 도중 중단되어도 기존 목록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f,
+                      ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
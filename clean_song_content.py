@@ -1,85 +1,47 @@
 import os
-import re
+from text_decoder import read_text, LOW_CONFIDENCE
+from sheet_parser import parse_sheet, classify_line, BLANK, METADATA
 
 def is_valid_content(line):
-    # 섹션 헤더 확인 (Intro, Verse, Chorus 등)
-    section_pattern = r'^\s*[\[\(]*(intro|verse|bridge|chorus|outro|pre-chorus|hook|refrain|interlude|instrumental|solo)[\]\)]*\s*\d*\s*$'
-    if re.match(section_pattern, line, re.IGNORECASE):
-        return True
-    
-    # Capo 정보 확인
-    if re.match(r'^\s*capo\s*\d+\s*$', line.lower()):
-        return True
-    
-    # 코드 라인 확인 (예: Am  G  F)
-    chord_pattern = r'^[\s]*([A-G][#mb]?(maj|min|aug|dim|sus|add)?[0-9]?\s*)+$'
-    if re.match(chord_pattern, line):
-        return True
-    
-    # 코드와 가사가 함께 있는 라인 확인
-    chord_lyric_pattern = r'^[\s]*[A-G][#mb]?(maj|min|aug|dim|sus|add)?[0-9]?.*[a-zA-Z가-힣]+.*$'
-    if re.match(chord_lyric_pattern, line):
-        return True
-    
-    # 일반 가사 확인
-    line = line.strip()
-    if line and not is_metadata_line(line):
-        return True
-        
-    return False
-
-def is_metadata_line(line):
-    metadata_patterns = [
-        r'written by', r'performed by', r'produced by', r'recorded by',
-        r'mixed by', r'mastered by', r'published by', r'lyrics by',
-        r'music by', r'arranged by', r'composed by', r'original by',
-        r'cover by', r'tab by', r'chords by', r'@', r'©', r'=',
-        r'artist:', r'album:', r'year:', r'genre:', r'key:', 
-        r'tempo:', r'difficulty:', r'tuning:', r'note:', 
-        r'transcribed by', r'tabbed by', r'created by',
-        r'copyright', r'all rights reserved', r'source:', 
-        r'duration:', r'length:', r'release:', r'label:',
-        r'http[s]?://', r'www\.', r'youtube\.com', r'spotify\.com',
-        r'ultimate-guitar\.com', r'credits:', r'original version',
-        r'version:', r'original artist', r'original song'
-    ]
-    
-    line_lower = line.lower()
-    return any(re.search(pattern.lower(), line_lower) for pattern in metadata_patterns)
+    # 섹션 헤더, Capo, 코드, 가사는 남기고 빈 줄과 메타데이터는 제거
+    return classify_line(line) not in (BLANK, METADATA)
 
 def clean_file_content(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except UnicodeDecodeError:
-        try:
-            with open(file_path, 'r', encoding='cp949') as f:
-                lines = f.readlines()
-        except:
-            print(f"파일을 읽을 수 없습니다: {file_path}")
-            return False
+        decoded = read_text(file_path)
+    except OSError:
+        print(f"파일을 읽을 수 없습니다: {file_path}")
+        return False
+    if decoded.encoding is None:
+        print(f"파일을 읽을 수 없습니다: {file_path}")
+        return False
+    if decoded.confidence < LOW_CONFIDENCE:
+        print(f"인코딩 판별이 불확실합니다 ({decoded.encoding}): {file_path}")
+    
+    doc = parse_sheet(decoded.text)
+    last_index = len(doc.lines) - 1
 
-    # 파일 내용 정리
+    # 파일 내용 정리 (원본 줄바꿈 유지: 마지막 줄에는 원래 줄바꿈이 없음)
     cleaned_lines = []
     content_started = False
     consecutive_empty_lines = 0
     
-    for line in lines:
-        line_strip = line.strip()
+    for i, line in enumerate(doc.lines):
+        text = line.text if i == last_index else line.text + '\n'
         
         # 빈 줄 처리
-        if not line_strip:
+        if line.kind == BLANK:
             if content_started:
                 consecutive_empty_lines += 1
                 if consecutive_empty_lines <= 2:  # 최대 2개의 연속된 빈 줄만 허용
-                    cleaned_lines.append(line)
+                    cleaned_lines.append(text)
             continue
         
         consecutive_empty_lines = 0
         
-        if is_valid_content(line_strip):
+        if line.kind != METADATA:
             content_started = True
-            cleaned_lines.append(line)
+            cleaned_lines.append(text)
     
     # 파일 시작과 끝의 불필요한 빈 줄 제거
     while cleaned_lines and not cleaned_lines[0].strip():
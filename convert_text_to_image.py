@@ -1,60 +1,109 @@
+import io
 import sys
 import os
-import shutil
-from PIL import Image, ImageDraw, ImageFont
-import unicodedata
+from PIL import Image
 import re
+import argparse
+from collections import namedtuple
+from font_registry import get_font_chain, get_registry
+from watermark import get_watermark_layer, get_watermark_positions, LOGO_PATH
+from text_decoder import read_text, LOW_CONFIDENCE
+from sheet_parser import parse_sheet, SECTION
+from image_encoder import (encode_image, output_path, get_profile, can_stream, StreamingPNGWriter,
+                           PROFILES, DEFAULT_PROFILE)
+from layout_engine import build_layout, draw_layout, draw_layout_strip, split_pages, DEFAULT_STYLE
+from render_profiler import NULL_PROFILER
+
+# 렌더링 결과가 바뀌는 수정을 하면 올림 (빌드 목록의 기존 항목이 무효화됨)
+RENDERER_VERSION = 3
+
+# 폰트 크기 설정
+NORMAL_FONT_SIZE = 14
+TITLE_FONT_SIZE = NORMAL_FONT_SIZE * 2
+SECTION_FONT_SIZE = int(NORMAL_FONT_SIZE * 1.2)
+
+# A4 사이즈 설정 (72dpi 기준, 210mm x 297mm)
+A4_WIDTH = DEFAULT_STYLE.width  # A4 너비는 고정
+A4_HEIGHT = 842  # 페이지 나누기 기준 높이
+
+# 워터마크 설정 (로고는 프로세스/디스크 캐시에서 가져옴)
+WATERMARK_WIDTH = int(A4_WIDTH * 0.5)  # 워터마크 크기 조정
+WATERMARK_OPACITY = 0.15  # 투명도 15%
+
+# 언어 판별용 코드포인트 범위 (문자마다 unicodedata.name을 조회하지 않도록 미리 계산)
+CJK_RANGES = [
+    (0x3000, 0x303F),     # CJK 부호
+    (0x3040, 0x309F),     # 히라가나
+    (0x30A0, 0x30FF),     # 가타카나
+    (0x4E00, 0x9FFF),     # CJK 통합 한자
+    (0xFF00, 0xFFEF),     # 전각 문자
+    (0xAC00, 0xD7AF)      # 한글 음절
+]
+HANGUL_RANGES = [(0xAC00, 0xD7AF)]
+KANA_RANGES = [(0x3041, 0x3096), (0x3099, 0x30FF), (0xFF65, 0xFF9F)]  # 히라가나, 가타카나, 반각 가타카나
+HANZI_RANGES = [(0x4E00, 0x9FFF)]
+
+def _char_class(ranges):
+    return re.compile('[' + ''.join(f'\\u{start:04x}-\\u{end:04x}' for start, end in ranges) + ']')
+
+CJK_RE = _char_class(CJK_RANGES)
+HANGUL_RE = _char_class(HANGUL_RANGES)
+KANA_RE = _char_class(KANA_RANGES)
+HANZI_RE = _char_class(HANZI_RANGES)
+
+# 언어가 바뀌는 구간 (start 이상 end 미만의 줄 번호)
+LanguageRun = namedtuple('LanguageRun', ['language', 'start', 'end'])
 
 def is_cjk(char):
-    code = ord(char)
-    return any([
-        0x3000 <= code <= 0x303F,     # CJK 부호
-        0x3040 <= code <= 0x309F,     # 히라가나
-        0x30A0 <= code <= 0x30FF,     # 가타카나
-        0x4E00 <= code <= 0x9FFF,     # CJK 통합 한자
-        0xFF00 <= code <= 0xFFEF,     # 전각 문자
-        0xAC00 <= code <= 0xD7AF      # 한글 음절
-    ])
+    return CJK_RE.match(char) is not None
 
-def get_text_language(text):
-    # 텍스트의 주요 언어 판별
-    jp_count = 0
-    cn_count = 0
-    ko_count = 0
-    
-    for char in text:
-        if not is_cjk(char):
-            continue
-            
-        code = ord(char)
-        if 0xAC00 <= code <= 0xD7AF:  # 한글 음절 범위
-            ko_count += 1
-        else:
-            char_name = unicodedata.name(char, '').lower()
-            if 'hiragana' in char_name or 'katakana' in char_name:
-                jp_count += 1
-            elif 'cjk' in char_name:
-                cn_count += 1
-    
-    # 가중치를 둔 언어 판별
-    if ko_count > 0:  # 한글이 있으면 우선 한국어로 판단
+def detect_language(text):
+    # 주 언어를 판별 (판별할 수 없으면 None)
+    # 한글이 하나라도 있으면 나머지를 볼 필요 없이 한국어로 판단
+    if HANGUL_RE.search(text):
         return 'ko'
-    elif jp_count > cn_count:
+
+    jp_count = len(KANA_RE.findall(text))
+    cn_count = len(HANZI_RE.findall(text))
+    if jp_count > cn_count:
         return 'jp'
     elif cn_count > jp_count:
         return 'cn'
-    return 'ko'  # 기본값은 한국어
+    return None
+
+def get_text_language(text):
+    # 텍스트의 주요 언어 판별
+    return detect_language(text) or 'ko'  # 기본값은 한국어
+
+def get_language_runs(text):
+    # 줄 단위로 언어를 판별해서 같은 언어가 이어지는 구간으로 묶음
+    # CJK 문자가 없는 줄(코드, 섹션 헤더 등)은 앞 구간의 언어를 따름
+    runs = []
+    language = None
+    start = 0
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        line_language = detect_language(line) if CJK_RE.search(line) else None
+        if line_language is None or line_language == language:
+            continue
+        if language is not None:
+            runs.append(LanguageRun(language, start, i))
+            start = i
+        language = line_language
+    if lines:
+        runs.append(LanguageRun(language or 'ko', start, len(lines)))
+    return runs
 
-def is_section_header(line):
-    # 섹션 헤더 패턴 매칭 (대소문자 무관)
-    pattern = r'^\s*[\[\(]*(chorus|verse|bridge|intro|outro|pre-chorus|hook|refrain|interlude|간주|후렴|브릿지)[\]\)]*\s*$'
-    return bool(re.match(pattern, line, re.IGNORECASE))
+SPECIAL_SPACE_RE = re.compile(r'[\u3000\u2003\u2002\u2000\u2001\u2004-\u200A\u205F\u00A0]')
+WHITESPACE_RE = re.compile(r'\s+')
+ADJACENT_CHORDS_RE = re.compile(
+    r'([A-G][#mb]?(?:maj|min|aug|dim|sus|[0-9])?)\s*([A-G][#mb]?(?:maj|min|aug|dim|sus|[0-9])?)')
 
 def clean_text(text):
     # 특수 공백 문자들을 일반 공백으로 변환
-    text = re.sub(r'[\u3000\u2003\u2002\u2000\u2001\u2004-\u200A\u205F\u00A0]', ' ', text)
+    text = SPECIAL_SPACE_RE.sub(' ', text)
     # 여러 개의 연속된 공백을 하나로 통일
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     return text
 
 def clean_line(line):
@@ -62,15 +111,68 @@ def clean_line(line):
     # 앞뒤 공백 제거 및 특수 공백 처리
     line = clean_text(line.strip())
     # 코드 구분을 위한 최소 2개의 공백 유지
-    line = re.sub(r'([A-G][#mb]?(?:maj|min|aug|dim|sus|[0-9])?)\s*([A-G][#mb]?(?:maj|min|aug|dim|sus|[0-9])?)', r'\1  \2', line)
+    line = ADJACENT_CHORDS_RE.sub(r'\1  \2', line)
     return line
 
+def _file_version(path):
+    # 파일이 바뀌었는지 판단하기 위한 (경로, 수정 시각, 크기)
+    if path is None or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+def render_settings(encoder=DEFAULT_PROFILE, paginate=False, strip_height=None):
+    # 출력 이미지에 영향을 주는 모든 설정 - 빌드 목록에서 다시 렌더링할지 판단하는 데 사용
+    # 렌더링 코드의 결과가 바뀌는 수정을 하면 RENDERER_VERSION을 올려야 함
+    # (strip_height는 같은 이미지를 만들기 때문에 포함하지 않음)
+    registry = get_registry()
+    fonts = {}
+    for language, weights in registry.font_paths.items():
+        for weight in weights:
+            face = registry.resolve_face(language, weight)
+            fonts[f"{language}/{weight}"] = [_file_version(face[0]), face[1]] if face else None
+    return {
+        'renderer_version': RENDERER_VERSION,
+        'style': DEFAULT_STYLE._asdict(),
+        'font_sizes': [NORMAL_FONT_SIZE, TITLE_FONT_SIZE, SECTION_FONT_SIZE],
+        'fonts': fonts,
+        'watermark': [WATERMARK_WIDTH, WATERMARK_OPACITY, _file_version(LOGO_PATH)],
+        'encoder': get_profile(encoder)._asdict(),
+        'paginate': [paginate, A4_HEIGHT]
+    }
+
+def load_fonts(language):
+    # 언어별 (본문, 타이틀, 섹션) 폰트 - 프로세스 공용 레지스트리에서 한 번만 로드됨
+    # 각 항목은 주 언어 폰트 뒤에 다른 언어 폰트를 붙인 목록 (글자 단위 대체용)
+    return (get_font_chain(language, 'normal', NORMAL_FONT_SIZE),
+            get_font_chain(language, 'bold', TITLE_FONT_SIZE),
+            get_font_chain(language, 'bold', SECTION_FONT_SIZE))
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python convert_text_to_image.py <input_directory>")
-        sys.exit(1)
-    
-    input_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="텍스트 악보 파일을 이미지로 변환합니다.")
+    parser.add_argument("input_directory", help="변환할 텍스트 파일이 있는 디렉터리")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="동시에 변환할 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--encoder", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help="이미지 저장 형식 (기본값: png)")
+    parser.add_argument("--paginate", action="store_true",
+                        help="긴 악보를 섹션 경계에서 A4 높이로 나눠 _page{n} 파일로 저장")
+    parser.add_argument("--strip-height", type=int, default=None,
+                        help="이 높이(픽셀)의 띠 단위로 그려서 저장 (긴 악보의 메모리 사용량 제한)")
+    parser.add_argument("--watch", action="store_true",
+                        help="입력 디렉터리를 계속 감시하면서 새로 들어오는 파일을 변환")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="감시 모드에서 확인 주기 (초)")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="감시 모드에서 파일 쓰기가 끝났다고 볼 대기 시간 (초)")
+    parser.add_argument("--force", action="store_true",
+                        help="빌드 목록과 관계없이 모든 파일을 다시 변환")
+    parser.add_argument("--profile", nargs="?", const="render_profile.jsonl", default=None, metavar="JSONL",
+                        help="파일별 단계 시간/입출력 바이트/최대 메모리를 JSON lines로 저장하고 요약 표 출력 "
+                             "(기본값: render_profile.jsonl)")
+    args = parser.parse_args()
+
+    input_path = args.input_directory
     if not os.path.isdir(input_path):
         print(f"입력 경로는 디렉터리여야 합니다: {input_path}")
         sys.exit(1)
@@ -79,212 +181,246 @@ def main():
     output_dir = os.path.join(os.path.dirname(input_path), "output")
     os.makedirs(output_dir, exist_ok=True)
 
+    render_options = {'encoder': args.encoder, 'paginate': args.paginate, 'strip_height': args.strip_height}
+
+    if args.watch:
+        from folder_watcher import watch
+        watch(input_path, output_dir, interval=args.interval, settle_seconds=args.settle,
+              **render_options)
+        return
+
     # .txt 파일뿐만 아니라 확장자가 없는 파일도 모두 변환
-    for filename in os.listdir(input_path):
-        file_path = os.path.join(input_path, filename)
-        if os.path.isfile(file_path) and (filename.lower().endswith(".txt") or os.path.splitext(filename)[1] == ""):
-            image_file = convert_file(file_path)
-            if image_file:  # 변환이 성공한 경우에만 이동
-                # 원본 파일과 생성된 이미지 파일을 output 폴더로 이동
-                shutil.move(file_path, os.path.join(output_dir, os.path.basename(file_path)))
-                shutil.move(image_file, os.path.join(output_dir, os.path.basename(image_file)))
-    
-    print("모든 파일 변환 및 이동이 완료되었습니다.")
+    from batch_converter import find_input_files, convert_batch
+    from render_profiler import write_record, print_summary
+    files = find_input_files(input_path)
 
-def convert_file(input_file, output_file=None):
-    # 텍스트 파일 읽기 (여러 인코딩 시도)
-    encodings = ['utf-8', 'cp949', 'euc-kr', 'shift_jis', 'gb2312', 'big5', 'latin1']
-    text = None
-    used_encoding = None
-    
-    for encoding in encodings:
-        try:
-            with open(input_file, 'r', encoding=encoding) as f:
-                text = f.read().strip()
-                used_encoding = encoding
-                break
-        except UnicodeDecodeError:
-            continue
-    
-    if text is None:
+    profile_file = open(args.profile, 'w', encoding='utf-8') if args.profile else None
+    profile_records = []
+
+    failed_count = 0
+    skipped_count = 0
+    for result in convert_batch(files, output_dir, jobs=args.jobs, force=args.force,
+                                profile=profile_file is not None, **render_options):
+        if result.profile:
+            write_record(profile_file, result.profile)
+            profile_records.append(result.profile)
+        if result.error:
+            failed_count += 1
+            print(f"변환 실패: {result.input_file} - {result.error}")
+        elif result.skipped:
+            skipped_count += 1
+
+    converted_count = len(files) - failed_count - skipped_count
+    if skipped_count:
+        print(f"{skipped_count}개 파일은 바뀐 내용이 없어 다시 변환하지 않고 이동만 했습니다 (--force로 다시 변환)")
+    if failed_count:
+        print(f"{converted_count}개 파일 변환 완료, {skipped_count}개 파일 건너뜀, {failed_count}개 파일 실패 "
+              f"(실패한 파일은 입력 폴더에 남아 있습니다)")
+    elif skipped_count:
+        print(f"{converted_count}개 파일 변환, {skipped_count}개 파일 건너뜀 - 모든 파일을 output 폴더로 이동했습니다.")
+    else:
+        print("모든 파일 변환 및 이동이 완료되었습니다.")
+
+    if profile_file is not None:
+        profile_file.close()
+        print_summary(profile_records)
+        print(f"파일별 프로파일이 저장되었습니다: {args.profile}")
+
+# render_sheet 옵션 (convert_file, convert_batch의 render_options와 같은 이름)
+RenderOptions = namedtuple('RenderOptions', ['encoder', 'paginate', 'strip_height'],
+                           defaults=(DEFAULT_PROFILE, False, None))
+
+class EmptySheetError(ValueError):
+    """정제하고 나면 그릴 내용이 없는 악보"""
+
+def default_output_file(input_file, encoder=DEFAULT_PROFILE, output_dir=None):
+    # 입력 파일 이름에 "기타 코드 피아노 악보 가사"를 붙인 이미지 경로 (output_dir이 없으면 입력 파일 옆)
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    directory = os.path.dirname(input_file) if output_dir is None else output_dir
+    return output_path(os.path.join(directory, base_name + " 기타 코드 피아노 악보 가사"), encoder)
+
+def convert_file(input_file, output_file=None, encoder=DEFAULT_PROFILE, paginate=False, strip_height=None,
+                 profiler=None):
+    # 파일을 읽어서 render_sheet로 그린 뒤 output_file(기본값: 입력 파일 옆)에 저장
+    # paginate면 섹션 경계에서 A4 높이로 나눈 _page{n} 파일 목록을 반환
+    # profiler(RenderProfiler)를 넘기면 단계별 시간, 입출력 바이트 수, 최대 메모리 할당량을 기록
+    profiler = profiler or NULL_PROFILER
+    with profiler.file(input_file):
+        return _convert_file(input_file, output_file, RenderOptions(encoder, paginate, strip_height), profiler)
+
+def _convert_file(input_file, output_file, options, profiler):
+    # 텍스트 파일 읽기 (한 번만 읽고 인코딩 판별)
+    with profiler.stage('decode'):
+        decoded = read_text(input_file)
+        profiler.add_read(os.path.getsize(input_file))
+    if decoded.encoding is None:
         print(f"파일을 읽을 수 없습니다 (인코딩 문제): {input_file}")
         return None
     
-    print(f"사용된 인코딩: {used_encoding}")
-    
-    # 텍스트 정제
-    lines = [clean_line(line) for line in text.splitlines()]
-    lines = [line for line in lines if line]  # 빈 줄 제거
-    
-    if len(lines) == 0:
+    print(f"사용된 인코딩: {decoded.encoding} (신뢰도 {decoded.confidence:.2f})")
+    if decoded.confidence < LOW_CONFIDENCE:
+        print(f"인코딩 판별이 불확실합니다. 글자가 깨질 수 있습니다: {input_file}")
+
+    if output_file is None:
+        output_file = default_output_file(input_file, options.encoder)
+
+    output_files = []
+    def page_sink(page, page_count):
+        if page_count > 1:
+            page_base, ext = os.path.splitext(output_file)
+            output_files.append(f"{page_base}_page{page}{ext}")
+        else:
+            output_files.append(output_file)
+        return output_files[-1]
+
+    # 파일명의 내용을 타이틀로 사용
+    title_text = os.path.splitext(os.path.basename(input_file))[0]
+    try:
+        stats = render_sheet(decoded.text, title_text, options, page_sink, profiler)
+    except EmptySheetError:
         print(f"파일에 내용이 없습니다: {input_file}")
         return None
 
-    # 파일명의 내용을 타이틀로 사용
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
-    title_text = base_name
+    for current_output, page_stats in zip(output_files, stats if options.paginate else [stats]):
+        print(f"이미지가 저장되었습니다: {current_output} ({page_stats.profile}, {page_stats.bytes:,} bytes, {page_stats.seconds * 1000:.1f} ms)")
+    return output_files if options.paginate else output_files[0]
+
+def layout_sheet(text, title, paginate=False, profiler=None):
+    """
+    악보 텍스트를 정제하고 배치 계획(LayoutPlan) 목록을 반환
+
+    페이지를 나누지 않으면 계획은 하나입니다. 그릴 내용이 없으면 EmptySheetError를 던집니다.
+    """
+    profiler = profiler or NULL_PROFILER
+    text = text.strip()
+
+    # 악보 구조를 한 번 파싱하고 줄 단위 텍스트 정제
+    with profiler.stage('clean'):
+        doc = parse_sheet(text)
+        lines = []
+        for sheet_line in doc.lines:
+            line = clean_line(sheet_line.text)
+            if line:  # 빈 줄 제거
+                lines.append((line, sheet_line.kind == SECTION))
+
+    if len(lines) == 0:
+        raise EmptySheetError(f"악보에 내용이 없습니다: {title}")
 
     # 텍스트 언어 감지
-    main_language = get_text_language(text)
+    with profiler.stage('language'):
+        main_language = get_text_language(text)
     print(f"감지된 주 언어: {main_language}")
 
-    # 폰트 설정
-    normal_font_size = 14
-    title_font_size = normal_font_size * 2
-    section_font_size = int(normal_font_size * 1.2)
-
-    # 언어별 폰트 매핑
-    font_paths = {
-        'ko': {
-            'normal': r"C:\Windows\Fonts\malgun.ttf",
-            'bold': r"C:\Windows\Fonts\malgunbd.ttf"
-        },
-        'jp': {
-            'normal': r"C:\Windows\Fonts\msgothic.ttc",
-            'bold': r"C:\Windows\Fonts\msgothic.ttc"
-        },
-        'cn': {
-            'normal': r"C:\Windows\Fonts\simsun.ttc",
-            'bold': r"C:\Windows\Fonts\simsun.ttc"
-        }
-    }
+    # 폰트 로드 (프로세스 단위로 캐시됨)
+    with profiler.stage('fonts'):
+        fonts = load_fonts(main_language)
 
-    # 선택된 언어의 폰트 로드
-    try:
-        normal_font = ImageFont.truetype(font_paths[main_language]['normal'], normal_font_size)
-        title_font = ImageFont.truetype(font_paths[main_language]['bold'], title_font_size)
-        section_font = ImageFont.truetype(font_paths[main_language]['bold'], section_font_size)
-    except IOError:
-        print(f"기본 {main_language} 폰트를 찾을 수 없습니다. 한글 폰트로 대체합니다.")
-        normal_font = ImageFont.truetype(font_paths['ko']['normal'], normal_font_size)
-        title_font = ImageFont.truetype(font_paths['ko']['bold'], title_font_size)
-        section_font = ImageFont.truetype(font_paths['ko']['bold'], section_font_size)
-
-    # 라인 별 간격 설정 (픽셀 단위)
-    line_spacing = 6
-    title_spacing = 14
-    section_spacing = 28
-
-    # A4 사이즈 설정 (72dpi 기준, 210mm x 297mm)
-    a4_width = 595  # A4 너비는 고정
-    
-    # 로고 이미지 로드 및 크기 조정 (워터마크용)
-    watermark_width = int(a4_width * 0.5)  # 워터마크 크기 조정
-    try:
-        logo_path = "assets/logo.png"
-        if os.path.exists(logo_path):
-            logo_img = Image.open(logo_path)
-            ratio = watermark_width / logo_img.width
-            watermark_height = int(logo_img.height * ratio)
-            logo_img = logo_img.resize((watermark_width, watermark_height), Image.Resampling.LANCZOS)
-            
-            if logo_img.mode != 'RGBA':
-                logo_img = logo_img.convert('RGBA')
-            
-            data = logo_img.getdata()
-            new_data = []
-            for item in data:
-                new_data.append((item[0], item[1], item[2], int(255 * 0.15)))  # 투명도 15%로 감소
-            logo_img.putdata(new_data)
-        else:
-            print("로고 이미지(assets/logo.png)를 찾을 수 없습니다.")
-            logo_img = None
-    except Exception as e:
-        print(f"로고 이미지를 로드할 수 없습니다: {e}")
-        logo_img = None
-
-    # 더미 이미지를 생성하여 텍스트 크기를 측정
-    dummy_img = Image.new("RGB", (1, 1))
-    draw_dummy = ImageDraw.Draw(dummy_img)
-
-    # 타이틀 텍스트 측정
-    title_bbox = draw_dummy.textbbox((0, 0), title_text, font=title_font)
-    title_width = title_bbox[2] - title_bbox[0]
-    title_height = title_bbox[3] - title_bbox[1]
-
-    # 본문(가사) 텍스트 측정 및 섹션 구분
-    max_width = 0
-    content_line_heights = []
-    is_section_start = []
-    
-    for line in lines:
-        is_section = is_section_header(line)
-        is_section_start.append(is_section)
-        
-        # 섹션 헤더는 다른 폰트 사용
-        current_font = section_font if is_section else normal_font
-        
-        bbox = draw_dummy.textbbox((0, 0), line, font=current_font)
-        line_width = bbox[2] - bbox[0]
-        line_height = bbox[3] - bbox[1]
-        max_width = max(max_width, line_width)
-        content_line_heights.append(line_height)
-    
-    if len(content_line_heights) > 0:
-        total_content_height = sum(content_line_heights)
-        # 라인 간격과 섹션 간격 추가
-        for i in range(len(lines)):
-            if is_section_start[i]:
-                total_content_height += section_spacing
-            else:
-                total_content_height += line_spacing
-    else:
-        total_content_height = 0
+    # 한 번의 측정으로 배치 계획을 만듦 (측정 결과는 파일 간에 캐시됨)
+    with profiler.stage('layout'):
+        if paginate:
+            # 섹션 경계에서 A4 높이에 맞춰 페이지를 나눔
+            return [build_layout(title, page_lines, fonts)
+                    for page_lines in split_pages(title, lines, fonts, A4_HEIGHT)]
+        return [build_layout(title, lines, fonts)]
 
-    padding = 40
-    top_padding = 40
-    bottom_padding = 60  # A4 문서 하단 여백 추가
-    
-    # 전체 높이 계산
-    total_height = top_padding + title_height + title_spacing + total_content_height + padding + bottom_padding
-    
-    # 최종 이미지 생성
-    bg_color = "#f8f8f8"
-    img = Image.new("RGB", (a4_width, total_height), color=bg_color)
-    draw = ImageDraw.Draw(img)
-    
-    current_y = top_padding
-    
-    # 타이틀 그리기 (중앙 정렬)
-    title_x = (a4_width - title_width) // 2
-    draw.text((title_x, current_y), title_text, fill="black", font=title_font)
-    current_y += title_height + title_spacing
-
-    # 워터마크 로고 반복 그리기
-    if logo_img:
-        watermark_spacing_y = watermark_height * 3  # 워터마크 간격 증가
-        y_position = watermark_height
-        while y_position < total_height - watermark_height:
-            logo_x = (a4_width - watermark_width) // 2
-            img.paste(logo_img, (logo_x, y_position), logo_img)
-            y_position += watermark_spacing_y
-
-    # 본문(가사) 텍스트 그리기
-    for i, line in enumerate(lines):
-        # 섹션 시작이면 추가 간격 삽입
-        if is_section_start[i]:
-            current_y += section_spacing
-            # 섹션 헤더는 중앙 정렬 및 다른 폰트 사용
-            bbox = draw_dummy.textbbox((0, 0), line, font=section_font)
-            text_width = bbox[2] - bbox[0]
-            text_x = (a4_width - text_width) // 2
-            draw.text((text_x, current_y), line, fill="black", font=section_font)
-        else:
-            # 일반 텍스트는 좌측 정렬
-            draw.text((padding, current_y), line, fill="black", font=normal_font)
-        
-        # 마지막 줄이 아닐 경우에만 줄 간격 추가
-        if i < len(lines) - 1:
-            current_y += content_line_heights[i] + line_spacing
+def render_sheet(text, title, options=None, sink=None, profiler=None):
+    """
+    악보 텍스트를 이미지로 렌더링 (파일을 읽거나 쓰지 않음)
+
+    sink가 None이면 인코딩하지 않은 PIL 이미지를 반환합니다.
+    sink가 쓰기 가능한 파일 객체(또는 경로)면 options.encoder로 인코딩해서 쓰고 EncodeStats를 반환합니다.
+    페이지가 여러 개일 수 있으면 sink로 (페이지 번호, 페이지 수)를 받아 페이지별 sink를 돌려주는 함수를 넘깁니다.
+    options.paginate면 반환값은 페이지별 목록입니다.
+    """
+    options = options or RenderOptions()
+    profiler = profiler or NULL_PROFILER
+    plans = layout_sheet(text, title, options.paginate, profiler)
+
+    results = []
+    for page, plan in enumerate(plans, 1):
+        if sink is None:
+            results.append(draw_plan(plan, profiler))
+            continue
+
+        if callable(sink):
+            page_sink = sink(page, len(plans))
+        elif len(plans) > 1:
+            raise ValueError("페이지가 여러 개이면 sink로 페이지별 sink를 돌려주는 함수를 넘겨야 합니다")
         else:
-            current_y += content_line_heights[i]  # 마지막 줄은 줄 간격 추가하지 않음
-    
-    if output_file is None:
-        output_file = os.path.join(os.path.dirname(input_file), base_name + " 기타 코드 피아노 악보 가사.png")
+            page_sink = sink
+        results.append(render_plan(plan, page_sink, options.encoder, options.strip_height, profiler))
 
-    img.save(output_file)
-    print(f"이미지가 저장되었습니다: {output_file}")
-    return output_file
+    return results if options.paginate else results[0]
+
+def render_sheet_bytes(text, title, options=None, profiler=None):
+    """render_sheet 결과를 인코딩된 바이트로 반환 (paginate면 페이지별 목록)"""
+    buffers = []
+    def page_sink(page, page_count):
+        buffers.append(io.BytesIO())
+        return buffers[-1]
+
+    options = options or RenderOptions()
+    render_sheet(text, title, options, page_sink, profiler)
+    pages = [buffer.getvalue() for buffer in buffers]
+    return pages if options.paginate else pages[0]
+
+def draw_plan(plan, profiler=None):
+    # 배치 계획대로 타이틀, 워터마크, 본문을 그린 전체 이미지를 반환
+    profiler = profiler or NULL_PROFILER
+
+    # 워터마크 로고 반복 그리기 (미리 만들어 둔 레이어를 한 번에 합성)
+    with profiler.stage('watermark'):
+        try:
+            watermark_layer = get_watermark_layer(plan.width, plan.height, WATERMARK_WIDTH, WATERMARK_OPACITY)
+        except Exception as e:
+            print(f"로고 이미지를 로드할 수 없습니다: {e}")
+            watermark_layer = None
+
+    with profiler.stage('draw'):
+        img = Image.new("RGB", (plan.width, plan.height), color=plan.style.bg_color)
+        draw_layout(img, plan, watermark_layer)
+    return img
+
+def render_plan(plan, sink, encoder=DEFAULT_PROFILE, strip_height=None, profiler=None):
+    # 배치 계획을 이미지로 그려서 sink에 저장하고 EncodeStats를 반환
+    # strip_height를 지정하면 그 높이의 띠 단위로 그려서 바로 인코딩 (메모리 사용량 일정)
+    profiler = profiler or NULL_PROFILER
+    if strip_height and can_stream(encoder):
+        stats = _render_plan_strips(plan, sink, encoder, strip_height, profiler)
+        profiler.add_written(stats.bytes)
+        return stats
+    if strip_height:
+        print(f"{encoder} 형식은 띠 단위 저장을 지원하지 않아 전체 이미지를 한 번에 그립니다.")
+
+    img = draw_plan(plan, profiler)
+    with profiler.stage('encode'):
+        stats = encode_image(img, sink, encoder)
+    profiler.add_written(stats.bytes)
+    return stats
+
+def _render_plan_strips(plan, sink, encoder, strip_height, profiler):
+    with profiler.stage('watermark'):
+        try:
+            tile, positions = get_watermark_positions(plan.width, plan.height, WATERMARK_WIDTH, WATERMARK_OPACITY)
+        except Exception as e:
+            print(f"로고 이미지를 로드할 수 없습니다: {e}")
+            tile, positions = None, []
+
+    writer = StreamingPNGWriter(sink, plan.width, plan.height, encoder)
+    # 띠 이미지 하나를 계속 재사용
+    strip = Image.new("RGB", (plan.width, min(strip_height, plan.height)), color=plan.style.bg_color)
+    for top in range(0, plan.height, strip_height):
+        height = min(strip_height, plan.height - top)
+        if height != strip.height:
+            strip = Image.new("RGB", (plan.width, height), color=plan.style.bg_color)
+        else:
+            strip.paste(plan.style.bg_color, (0, 0, plan.width, height))
+        with profiler.stage('draw'):
+            draw_layout_strip(strip, plan, top, tile, positions)
+        with profiler.stage('encode'):
+            writer.write_strip(strip)
+    with profiler.stage('encode'):
+        return writer.close()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import time
+import threading
+
+from batch_converter import is_input_file, convert_and_move, warm_up
+
+# watchdog이 있으면 OS 파일 이벤트(inotify 등)를 사용하고, 없으면 주기적으로 디렉터리를 확인
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+def _signature(path):
+    # 파일이 바뀌었는지 판단하는 기준 (크기, 수정 시각)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+class FileSettler:
+    """
+    새로 생기거나 바뀐 파일을 모아 두었다가, 일정 시간 동안 변화가 없으면 넘겨줌
+
+    LLM 파이프라인이 아직 쓰고 있는 파일을 변환하지 않기 위한 디바운스 처리입니다.
+    """
+
+    def __init__(self, settle_seconds=2.0):
+        self.settle_seconds = settle_seconds
+        self._pending = {}  # 경로 → (시그니처, 마지막으로 바뀐 시각)
+        self._done = {}     # 경로 → 처리했을 때의 시그니처 (같은 내용을 다시 처리하지 않음)
+        self._lock = threading.Lock()
+
+    def touch(self, path):
+        if not is_input_file(os.path.basename(path)):
+            return
+        signature = _signature(path)
+        if signature is None or self._done.get(path) == signature:
+            return
+        with self._lock:
+            previous = self._pending.get(path)
+            if previous is None or previous[0] != signature:
+                self._pending[path] = (signature, time.monotonic())
+
+    def pop_ready(self):
+        """쓰기가 끝난 것으로 보이는 파일 목록을 반환"""
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for path, (signature, changed_at) in list(self._pending.items()):
+                current = _signature(path)
+                if current is None:
+                    # 변환 전에 삭제되거나 이동된 파일
+                    del self._pending[path]
+                elif current != signature:
+                    self._pending[path] = (current, now)
+                elif now - changed_at >= self.settle_seconds:
+                    del self._pending[path]
+                    ready.append(path)
+        return ready
+
+    def mark_done(self, path, signature):
+        self._done[path] = signature
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, settler):
+        super().__init__()
+        self.settler = settler
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.settler.touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.settler.touch(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.settler.touch(event.dest_path)
+
+def scan(input_dir, settler):
+    # 하위 폴더는 보지 않고 입력 폴더의 파일만 확인 (stat만 하므로 가벼움)
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                settler.touch(entry.path)
+
+def watch(input_dir, output_dir, interval=1.0, settle_seconds=2.0, stop_event=None, **render_options):
+    """
+    입력 폴더를 감시하면서 새 악보 파일이 생기면 바로 변환
+
+    폰트와 워터마크는 시작할 때 한 번 로드해서 계속 재사용합니다.
+    stop_event가 설정되거나 Ctrl+C를 누르면 종료합니다.
+    render_options는 convert_file에 그대로 전달됩니다.
+    """
+    stop_event = stop_event or threading.Event()
+    settler = FileSettler(settle_seconds)
+    warm_up()
+
+    observer = None
+    if Observer is not None:
+        observer = Observer()
+        observer.schedule(_EventHandler(settler), input_dir, recursive=False)
+        observer.start()
+        print(f"폴더 감시 시작 (파일 이벤트): {input_dir}")
+    else:
+        print(f"폴더 감시 시작 ({interval}초마다 확인): {input_dir}")
+
+    # 감시 시작 전에 이미 있던 파일도 변환
+    scan(input_dir, settler)
+
+    try:
+        while not stop_event.is_set():
+            if observer is None:
+                scan(input_dir, settler)
+
+            for path in settler.pop_ready():
+                signature = _signature(path)
+                result = convert_and_move(path, output_dir, **render_options)
+                if result.error:
+                    # 실패한 파일은 내용이 바뀔 때까지 다시 시도하지 않음
+                    settler.mark_done(path, signature)
+                    print(f"변환 실패: {path} - {result.error}")
+                else:
+                    print(f"변환 완료: {result.image_file}")
+
+            stop_event.wait(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        print("폴더 감시를 종료합니다.")
@@ -0,0 +1,160 @@
+import os
+import json
+import bisect
+import threading
+
+from font_tables import read_cmap_ranges, FontFormatError
+
+CACHE_PATH = os.path.join(".cache", "fonts", "coverage.json")
+CACHE_VERSION = 1
+
+class Coverage:
+    """폰트가 글리프를 가진 코드포인트 범위 (이진 탐색으로 조회)"""
+
+    def __init__(self, ranges):
+        self.starts = [start for start, _ in ranges]
+        self.ends = [end for _, end in ranges]
+
+    def __contains__(self, codepoint):
+        i = bisect.bisect_right(self.starts, codepoint) - 1
+        return i >= 0 and codepoint <= self.ends[i]
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+def _file_key(path, index):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{index}", [stat.st_mtime_ns, stat.st_size]
+
+def _font_id(font):
+    path = getattr(font, 'path', None)
+    return id(font) if path is None else (path, getattr(font, 'index', 0))
+
+class CoverageIndex:
+    """
+    폰트 파일별 cmap 범위를 한 번만 읽어서 디스크(.cache/fonts/coverage.json)에 보관하는 색인
+
+    글자별로 어떤 폰트가 글리프를 가졌는지는 폰트 목록마다 한 번만 계산해서 표로 기억하므로,
+    렌더링 중에는 글자마다 폰트를 확인하지 않고 표를 찾기만 합니다.
+    """
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self._entries = None   # 디스크 캐시 (파일 키 → {'version': [...], 'ranges': [...]})
+        self._coverages = {}   # (경로, 번호) → Coverage (None이면 범위를 알 수 없음)
+        self._masks = {}       # 폰트 목록 키 → {글자: 덮는 폰트 비트마스크}
+        self._lock = threading.Lock()
+
+    def _load_entries(self):
+        if self._entries is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._entries = data['entries'] if data.get('version') == CACHE_VERSION else {}
+            except (OSError, ValueError, KeyError):
+                self._entries = {}
+        return self._entries
+
+    def _save_entries(self):
+        # 저장 도중 중단되거나 다른 프로세스가 같이 써도 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"폰트 색인을 저장할 수 없습니다: {e}")
+
+    def coverage(self, font):
+        """폰트의 Coverage (기본 비트맵 폰트처럼 파일이 없거나 읽을 수 없으면 None)"""
+        path = getattr(font, 'path', None)
+        if path is None:
+            return None
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        index = getattr(font, 'index', 0)
+        key = (path, index)
+        with self._lock:
+            if key not in self._coverages:
+                self._coverages[key] = self._read_coverage(path, index)
+            return self._coverages[key]
+
+    def _read_coverage(self, path, index):
+        try:
+            file_key, version = _file_key(path, index)
+        except OSError:
+            return None
+
+        entries = self._load_entries()
+        entry = entries.get(file_key)
+        if entry is not None and entry['version'] == version:
+            ranges = entry['ranges']
+            return Coverage(list(zip(ranges[0::2], ranges[1::2])))
+
+        try:
+            ranges = read_cmap_ranges(path, index)
+        except (OSError, FontFormatError, IndexError, ValueError) as e:
+            print(f"폰트 글자 범위를 읽을 수 없습니다: {path} ({e})")
+            return None
+
+        entries[file_key] = {'version': version, 'ranges': [n for r in ranges for n in r]}
+        self._save_entries()
+        return Coverage(ranges)
+
+    def _char_masks(self, fonts):
+        # 같은 파일/번호의 폰트는 크기가 달라도 글자 범위가 같으므로 표를 공유
+        key = tuple(_font_id(font) for font in fonts)
+        masks = self._masks.get(key)
+        if masks is None:
+            masks = self._masks[key] = {}
+        return masks
+
+    def split_runs(self, text, fonts):
+        """
+        text를 같은 폰트로 그릴 수 있는 구간으로 나눠 [(구간 텍스트, 폰트), ...]를 반환
+
+        글자마다 글리프가 있는 가장 앞쪽 폰트를 사용하므로, 기본 폰트에 없는 글자만 대체됩니다.
+        공백이나 어느 폰트에도 없는 글자는 앞 구간의 폰트를 그대로 사용합니다.
+        """
+        if len(fonts) == 1:
+            return [(text, fonts[0])]
+
+        masks = self._char_masks(fonts)
+        coverages = None
+        runs = []
+        current = 0
+        start = 0
+        for i, char in enumerate(text):
+            mask = masks.get(char)
+            if mask is None:
+                if coverages is None:
+                    coverages = [self.coverage(font) for font in fonts]
+                mask = 0
+                if not char.isspace():
+                    codepoint = ord(char)
+                    for slot, coverage in enumerate(coverages):
+                        if coverage is None or codepoint in coverage:
+                            mask |= 1 << slot
+                masks[char] = mask
+
+            if mask == 0:
+                continue
+            slot = (mask & -mask).bit_length() - 1  # 글리프가 있는 첫 번째 폰트
+            if slot == current:
+                continue
+            if i > start:
+                runs.append((text[start:i], fonts[current]))
+            start, current = i, slot
+
+        runs.append((text[start:], fonts[current]))
+        return runs
+
+_default_index = CoverageIndex()
+
+def get_coverage_index():
+    return _default_index
+
+def split_runs(text, fonts):
+    """프로세스 공용 색인으로 text를 폰트별 구간으로 나눔"""
+    return _default_index.split_runs(text, fonts)
@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import argparse
+import threading
+from collections import namedtuple
+
+from font_tables import read_faces, FontFormatError
+
+INDEX_PATH = os.path.join(".cache", "fonts", "font_index.json")
+INDEX_VERSION = 1
+
+# 프로젝트에 함께 배포하는 폰트 폴더 (시스템 폰트보다 먼저 찾음)
+PROJECT_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts")
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+
+# 찾은 폰트 하나 (coverage: 언어별로 덮는 글자의 비율 0~1)
+FontFace = namedtuple('FontFace', ['path', 'index', 'family', 'style', 'weight', 'coverage'])
+
+# 언어 판별에 쓰는 대표 글자 범위 (한글 음절, 히라가나+가타카나, CJK 통합 한자)
+LANGUAGE_RANGES = {
+    'ko': [(0xAC00, 0xD7A3)],
+    'jp': [(0x3041, 0x3096), (0x30A1, 0x30FA)],
+    'cn': [(0x4E00, 0x9FFF)],
+}
+
+# 이 비율 이상 덮어야 그 언어 폰트로 인정
+MIN_COVERAGE = 0.9
+
+# 언어별로 먼저 고를 폰트 패밀리 (운영체제마다 기본 설치되는 폰트 순)
+PREFERRED_FAMILIES = {
+    'ko': ["Malgun Gothic", "Apple SD Gothic Neo", "Noto Sans CJK KR", "Noto Sans KR",
+           "Source Han Sans KR", "NanumGothic", "UnDotum", "Gulim"],
+    'jp': ["MS Gothic", "Yu Gothic", "Hiragino Sans", "Hiragino Kaku Gothic ProN", "Noto Sans CJK JP",
+           "Noto Sans JP", "Source Han Sans JP", "IPAGothic", "TakaoGothic"],
+    'cn': ["SimSun", "Microsoft YaHei", "PingFang SC", "Noto Sans CJK SC", "Noto Sans SC",
+           "Source Han Sans SC", "WenQuanYi Zen Hei", "WenQuanYi Micro Hei"],
+}
+
+def system_font_dirs():
+    """운영체제별 시스템/사용자 폰트 폴더 목록"""
+    home = os.path.expanduser("~")
+    if sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', r"C:\Windows")
+        dirs = [os.path.join(windir, "Fonts")]
+        local = os.environ.get('LOCALAPPDATA')
+        if local:
+            dirs.append(os.path.join(local, "Microsoft", "Windows", "Fonts"))
+        return dirs
+    if sys.platform == 'darwin':
+        return ["/System/Library/Fonts", "/Library/Fonts", os.path.join(home, "Library", "Fonts")]
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(home, ".local", "share")
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.join(data_home, "fonts"),
+            os.path.join(home, ".fonts")]
+
+def default_font_dirs():
+    return [PROJECT_FONT_DIR] + system_font_dirs()
+
+def _coverage_ratio(ranges, targets):
+    total = sum(end - start + 1 for start, end in targets)
+    covered = 0
+    for start, end in ranges:
+        for target_start, target_end in targets:
+            overlap = min(end, target_end) - max(start, target_start) + 1
+            if overlap > 0:
+                covered += overlap
+    return covered / total
+
+def _face_entry(face):
+    coverage = {language: round(_coverage_ratio(face.ranges, targets), 3)
+                for language, targets in LANGUAGE_RANGES.items()}
+    return [face.index, face.family, face.style, face.weight, coverage]
+
+class FontIndex:
+    """
+    폰트 폴더를 한 번 훑어서 (패밀리, 스타일, 굵기, 언어별 글자 범위, 경로) 색인을 만들고
+    디스크(.cache/fonts/font_index.json)에 보관
+
+    훑은 폴더들의 수정 시각이 그대로면 다시 훑지 않고 저장된 색인을 그대로 사용합니다.
+    폰트가 추가되거나 지워지면 폴더 수정 시각이 바뀌므로 바뀐 파일만 다시 읽습니다.
+    """
+
+    def __init__(self, font_dirs=None, index_path=INDEX_PATH):
+        self.font_dirs = font_dirs if font_dirs is not None else default_font_dirs()
+        self.index_path = index_path
+        self._faces = None
+        self._lock = threading.Lock()
+
+    def faces(self):
+        """색인된 모든 FontFace 목록 (처음 호출할 때 디스크에서 읽거나 새로 만듦)"""
+        with self._lock:
+            if self._faces is None:
+                self._faces = self._load_or_build()
+            return self._faces
+
+    def refresh(self, force=False):
+        """폴더를 다시 확인 (force면 저장된 색인을 무시하고 모든 파일을 다시 읽음)"""
+        with self._lock:
+            self._faces = self._load_or_build(force)
+            return self._faces
+
+    def find(self, language, weight='normal'):
+        """
+        language 글자를 충분히 덮는 폰트 중 가장 알맞은 FontFace (없으면 None)
+
+        선호 패밀리 순서를 먼저 따르고, weight가 'bold'면 굵은 스타일을 우선합니다.
+        """
+        target = 700 if weight == 'bold' else 400
+        candidates = [face for face in self.faces() if face.coverage.get(language, 0) >= MIN_COVERAGE]
+        if not candidates:
+            return None
+
+        preferred = [family.lower() for family in PREFERRED_FAMILIES.get(language, [])]
+
+        def rank(face):
+            family = face.family.lower()
+            family_rank = preferred.index(family) if family in preferred else len(preferred)
+            italic = 'italic' in face.style.lower() or 'oblique' in face.style.lower()
+            return (family_rank, italic, abs(face.weight - target), -face.coverage[language], face.path, face.index)
+
+        return min(candidates, key=rank)
+
+    def find_any(self, weight='normal'):
+        """언어와 관계없이 쓸 수 있는 폰트 (CJK 폰트가 하나도 없을 때 기본 비트맵 폰트 대신 사용)"""
+        target = 700 if weight == 'bold' else 400
+
+        def rank(face):
+            style = face.style.lower()
+            return ('italic' in style or 'oblique' in style, 'mono' in face.family.lower(),
+                    abs(face.weight - target), face.path, face.index)
+
+        faces = self.faces()
+        return min(faces, key=rank) if faces else None
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        return data
+
+    def _is_current(self, data):
+        # 훑을 폴더 목록이 같고, 기록해 둔 모든 폴더의 수정 시각이 그대로인지 확인
+        if data.get('roots') != [os.path.abspath(d) for d in self.font_dirs]:
+            return False
+        for directory, mtime in data['dirs'].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                # 없던 폴더는 여전히 없어야 함 (mtime이 None으로 기록됨)
+                if mtime is not None:
+                    return False
+        return True
+
+    def _load_or_build(self, force=False):
+        data = None if force else self._load_index()
+        if data is not None and self._is_current(data):
+            return self._to_faces(data['files'])
+
+        previous = data['files'] if data else {}
+        dirs, files = self._scan(previous)
+        data = {'version': INDEX_VERSION, 'roots': [os.path.abspath(d) for d in self.font_dirs],
+                'dirs': dirs, 'files': files}
+        self._save_index(data)
+        return self._to_faces(files)
+
+    def _scan(self, previous):
+        dirs = {}
+        files = {}
+        for root in self.font_dirs:
+            if not os.path.isdir(root):
+                # 나중에 폴더가 생기면 색인을 다시 만들도록 기록
+                dirs[os.path.abspath(root)] = None
+                continue
+            for directory, _, filenames in os.walk(root):
+                dirs[os.path.abspath(directory)] = os.stat(directory).st_mtime_ns
+                for filename in filenames:
+                    if not filename.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.abspath(os.path.join(directory, filename))
+                    if path in files:
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    version = [stat.st_mtime_ns, stat.st_size]
+                    entry = previous.get(path)
+                    if entry is None or entry['version'] != version:
+                        # 새로 생기거나 바뀐 파일만 읽음
+                        try:
+                            entry = {'version': version,
+                                     'faces': [_face_entry(face) for face in read_faces(path)]}
+                        except (OSError, FontFormatError, ValueError) as e:
+                            # 손상된 폰트 하나 때문에 색인 전체가 실패하지 않도록 기록하고 건너뜀
+                            # (잘리거나 위치 값이 잘못된 테이블도 font_tables에서 FontFormatError로 바뀜)
+                            print(f"폰트 파일을 읽을 수 없습니다: {path} ({e})")
+                            entry = {'version': version, 'faces': []}
+                    files[path] = entry
+        return dirs, files
+
+    def _save_index(self, data):
+        # 여러 프로세스가 동시에 저장해도 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"폰트 색인을 저장할 수 없습니다: {e}")
+
+    @staticmethod
+    def _to_faces(files):
+        return [FontFace(path, index, family, style, weight, coverage)
+                for path, entry in sorted(files.items())
+                for index, family, style, weight, coverage in entry['faces']]
+
+_default_index = FontIndex()
+
+def get_font_index():
+    return _default_index
+
+def main():
+    parser = argparse.ArgumentParser(description="시스템과 프로젝트 폰트 폴더를 훑어서 언어별로 사용할 폰트를 보여줍니다.")
+    parser.add_argument("--rebuild", action="store_true", help="저장된 색인을 무시하고 다시 만듦")
+    args = parser.parse_args()
+
+    index = get_font_index()
+    faces = index.refresh(force=True) if args.rebuild else index.faces()
+    print(f"폰트 {len(faces)}개 (폴더: {', '.join(index.font_dirs)})")
+    for language in LANGUAGE_RANGES:
+        for weight in ('normal', 'bold'):
+            face = index.find(language, weight)
+            found = f"{face.family} {face.style} ({face.path}#{face.index})" if face else "없음"
+            print(f"{language}/{weight}: {found}")
+
+if __name__ == '__main__':
+    main()
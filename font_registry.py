@@ -0,0 +1,139 @@
+import os
+import threading
+from collections import OrderedDict
+from PIL import ImageFont
+from font_discovery import get_font_index
+
+# 언어/굵기별 폰트 후보 경로 (앞에서부터 먼저 시도)
+# 후보가 모두 없으면 폰트 색인(font_discovery)에서 그 언어 글자를 덮는 폰트를 찾음
+FONT_PATHS = {
+    'ko': {
+        'normal': [r"C:\Windows\Fonts\malgun.ttf", r"C:\Windows\Fonts\gulim.ttc"],
+        'bold': [r"C:\Windows\Fonts\malgunbd.ttf", r"C:\Windows\Fonts\malgun.ttf",
+                 r"C:\Windows\Fonts\gulim.ttc"]
+    },
+    'jp': {
+        'normal': [r"C:\Windows\Fonts\msgothic.ttc"],
+        'bold': [r"C:\Windows\Fonts\msgothic.ttc"]
+    },
+    'cn': {
+        'normal': [r"C:\Windows\Fonts\simsun.ttc"],
+        'bold': [r"C:\Windows\Fonts\simsun.ttc"]
+    }
+}
+
+# 해당 언어 폰트가 없을 때 대체할 언어
+FALLBACK_LANGUAGE = 'ko'
+
+class FontRegistry:
+    """
+    (언어, 굵기, 크기) 단위로 폰트를 한 번만 로드해서 공유하는 레지스트리
+
+    폰트는 처음 요청될 때 로드되고, 최대 max_size개까지 LRU 방식으로 유지됩니다.
+    """
+
+    def __init__(self, font_paths=None, max_size=32, font_index=None):
+        self.font_paths = font_paths or FONT_PATHS
+        self.max_size = max_size
+        self.font_index = font_index or get_font_index()
+        self._fonts = OrderedDict()
+        self._resolved_faces = {}
+        self._lock = threading.Lock()
+
+    def get(self, language, weight='normal', size=14):
+        """폰트를 반환 (없으면 로드해서 캐시에 저장)"""
+        key = (language, weight, size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                return font
+
+            font = self._load(language, weight, size)
+            self._fonts[key] = font
+            if len(self._fonts) > self.max_size:
+                self._fonts.popitem(last=False)
+            return font
+
+    def get_chain(self, language, weight='normal', size=14):
+        """
+        language 폰트를 맨 앞에 두고 다른 언어의 폰트를 대체용으로 붙인 폰트 목록
+
+        기본 폰트에 없는 글자(한국어 가사 속 일본어, 한자 등)를 글자 단위로 대체할 때 사용합니다.
+        같은 파일을 가리키는 폰트는 한 번만 들어갑니다.
+        """
+        chain = [self.get(language, weight, size)]
+        faces = {self.resolve_face(language, weight)}
+        for other in self.font_paths:
+            face = self.resolve_face(other, weight)
+            if face is not None and face not in faces:
+                faces.add(face)
+                chain.append(self.get(other, weight, size))
+        return tuple(chain)
+
+    def preload(self, specs):
+        """(언어, 굵기, 크기) 목록의 폰트를 미리 로드"""
+        for language, weight, size in specs:
+            self.get(language, weight, size)
+
+    def resolve_face(self, language, weight='normal'):
+        """실제로 열 수 있는 폰트의 (경로, TTC 안의 번호)를 반환 (없으면 None)"""
+        key = (language, weight)
+        if key not in self._resolved_faces:
+            self._resolved_faces[key] = self._find_face(language, weight)
+        return self._resolved_faces[key]
+
+    def resolve_path(self, language, weight='normal'):
+        """실제로 열 수 있는 폰트 경로를 반환 (없으면 None)"""
+        face = self.resolve_face(language, weight)
+        return face[0] if face else None
+
+    def clear(self):
+        with self._lock:
+            self._fonts.clear()
+            self._resolved_faces.clear()
+
+    def _find_face(self, language, weight):
+        for path in self.font_paths.get(language, {}).get(weight, []):
+            if os.path.isfile(path):
+                return path, 0
+        # 지정한 후보가 없는 운영체제에서는 색인에서 그 언어 글자를 덮는 폰트를 찾음
+        found = self.font_index.find(language, weight)
+        if found is not None:
+            return found.path, found.index
+        if language != FALLBACK_LANGUAGE:
+            print(f"기본 {language} 폰트를 찾을 수 없습니다. 한글 폰트로 대체합니다.")
+            return self.resolve_face(FALLBACK_LANGUAGE, weight)
+        found = self.font_index.find_any(weight)
+        if found is not None:
+            print(f"한글 폰트를 찾을 수 없습니다. {found.family} {found.style} 폰트를 사용합니다.")
+            return found.path, found.index
+        return None
+
+    def _load(self, language, weight, size):
+        face = self.resolve_face(language, weight)
+        if face is None:
+            print("사용 가능한 폰트가 없습니다. 기본 폰트를 사용합니다.")
+            try:
+                return ImageFont.load_default(size)
+            except TypeError:
+                # Pillow 10.1 미만은 크기 지정을 지원하지 않음
+                return ImageFont.load_default()
+        path, index = face
+        return ImageFont.truetype(path, size, index=index)
+
+_default_registry = FontRegistry()
+
+def get_registry():
+    return _default_registry
+
+def get_font(language, weight='normal', size=14):
+    """프로세스 공용 레지스트리에서 폰트를 가져옴"""
+    return _default_registry.get(language, weight, size)
+
+def get_font_chain(language, weight='normal', size=14):
+    """프로세스 공용 레지스트리에서 대체 폰트 목록을 가져옴"""
+    return _default_registry.get_chain(language, weight, size)
+
+def preload_fonts(specs):
+    _default_registry.preload(specs)
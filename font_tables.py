@@ -0,0 +1,201 @@
+import struct
+from collections import namedtuple
+
+# 폰트 파일(TTF/OTF/TTC)에서 필요한 테이블만 직접 읽는 최소한의 파서
+# 글자 단위 폰트 대체에 쓰는 cmap(문자 → 글리프) 범위와 폰트 찾기에 쓰는 이름/굵기만 다룹니다.
+
+class FontFormatError(ValueError):
+    pass
+
+def _read(f, offset, size):
+    f.seek(offset)
+    data = f.read(size)
+    if len(data) != size:
+        raise FontFormatError("폰트 파일이 잘렸습니다")
+    return data
+
+def _unpack_from(fmt, data, offset):
+    # 테이블이 잘렸거나 위치 값이 잘못된 경우 struct.error 대신 FontFormatError
+    if offset < 0 or offset + struct.calcsize(fmt) > len(data):
+        raise FontFormatError("폰트 테이블이 잘렸거나 손상되었습니다")
+    return struct.unpack_from(fmt, data, offset)
+
+def face_offsets(f):
+    """폰트 파일 안의 각 폰트(face)의 테이블 디렉터리 위치 목록 (TTC면 여러 개)"""
+    tag = _read(f, 0, 4)
+    if tag == b'ttcf':
+        count = struct.unpack('>I', _read(f, 8, 4))[0]
+        return list(struct.unpack(f'>{count}I', _read(f, 12, 4 * count)))
+    if tag in (b'\x00\x01\x00\x00', b'OTTO', b'true'):
+        return [0]
+    raise FontFormatError(f"지원하지 않는 폰트 형식입니다: {tag!r}")
+
+def table_directory(f, face_offset=0):
+    """{테이블 태그: (위치, 길이)}"""
+    num_tables = struct.unpack('>H', _read(f, face_offset + 4, 2))[0]
+    data = _read(f, face_offset + 12, 16 * num_tables)
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, length = _unpack_from('>4sIII', data, i * 16)
+        tables[tag.decode('latin-1')] = (offset, length)
+    return tables
+
+def _merge(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+def _format4_ranges(data):
+    seg_count = _unpack_from('>H', data, 6)[0] // 2
+    end_codes = _unpack_from(f'>{seg_count}H', data, 14)
+    start_codes = _unpack_from(f'>{seg_count}H', data, 16 + 2 * seg_count)
+    id_deltas = _unpack_from(f'>{seg_count}h', data, 16 + 4 * seg_count)
+    range_offsets_pos = 16 + 6 * seg_count
+    id_range_offsets = _unpack_from(f'>{seg_count}H', data, range_offsets_pos)
+
+    ranges = []
+    for i in range(seg_count):
+        start, end = start_codes[i], end_codes[i]
+        if start == 0xFFFF:
+            continue
+        if id_range_offsets[i] == 0:
+            # 글리프 번호 = 코드 + delta, 0(.notdef)이 되는 코드만 제외
+            missing = (-id_deltas[i]) & 0xFFFF
+            if start <= missing <= end:
+                if start < missing:
+                    ranges.append((start, missing - 1))
+                if missing < end:
+                    ranges.append((missing + 1, end))
+            else:
+                ranges.append((start, end))
+            continue
+
+        # glyphIdArray를 참조하는 구간은 코드마다 글리프가 있는지 확인
+        base = range_offsets_pos + 2 * i + id_range_offsets[i]
+        run_start = None
+        for code in range(start, end + 1):
+            pos = base + 2 * (code - start)
+            glyph = struct.unpack_from('>H', data, pos)[0] if pos + 2 <= len(data) else 0
+            if glyph and (glyph + id_deltas[i]) & 0xFFFF:
+                if run_start is None:
+                    run_start = code
+            elif run_start is not None:
+                ranges.append((run_start, code - 1))
+                run_start = None
+        if run_start is not None:
+            ranges.append((run_start, end))
+    return ranges
+
+def _format12_ranges(data):
+    num_groups = _unpack_from('>I', data, 12)[0]
+    ranges = []
+    for i in range(num_groups):
+        start, end, start_glyph = _unpack_from('>III', data, 16 + 12 * i)
+        if start_glyph == 0:
+            start += 1  # 첫 코드가 .notdef에 연결된 경우
+        if start <= end:
+            ranges.append((start, min(end, 0x10FFFF)))
+    return ranges
+
+# (플랫폼, 인코딩) 우선순위 - 전체 유니코드(format 12)를 BMP(format 4)보다 먼저 사용
+CMAP_PREFERENCE = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)]
+
+def read_cmap_ranges(path, index=0):
+    """
+    폰트가 글리프를 가진 유니코드 코드포인트 범위 [(시작, 끝), ...]를 반환
+
+    TTC 파일은 index번째 폰트를 읽습니다. format 4, 12 cmap을 지원합니다.
+    """
+    with open(path, 'rb') as f:
+        offsets = face_offsets(f)
+        if not 0 <= index < len(offsets):
+            raise FontFormatError(f"폰트 번호가 범위를 벗어났습니다: {index}")
+        tables = table_directory(f, offsets[index])
+        if 'cmap' not in tables:
+            raise FontFormatError("cmap 테이블이 없습니다")
+
+        cmap_offset, cmap_length = tables['cmap']
+        cmap = _read(f, cmap_offset, cmap_length)
+
+    num_subtables = _unpack_from('>H', cmap, 2)[0]
+    subtables = {}
+    for i in range(num_subtables):
+        platform_id, encoding_id, offset = _unpack_from('>HHI', cmap, 4 + 8 * i)
+        fmt = _unpack_from('>H', cmap, offset)[0]
+        if fmt in (4, 12):
+            subtables.setdefault((platform_id, encoding_id), (fmt, offset))
+
+    for key in CMAP_PREFERENCE:
+        if key in subtables:
+            fmt, offset = subtables[key]
+            if fmt == 12:
+                length = _unpack_from('>I', cmap, offset + 4)[0]
+                return _merge(_format12_ranges(cmap[offset:offset + length]))
+            # format 4의 length 필드는 16비트라 큰 폰트에서 잘못 기록된 경우가 있어 끝까지 넘김
+            return _merge(_format4_ranges(cmap[offset:]))
+    raise FontFormatError("지원하는 유니코드 cmap이 없습니다")
+
+# 폰트(face) 하나의 정보 (weight: OS/2 굵기 100~900)
+FaceInfo = namedtuple('FaceInfo', ['index', 'family', 'style', 'weight', 'ranges'])
+
+# name 테이블 ID (16/17은 네 가지 이상 스타일을 가진 패밀리의 대표 이름)
+NAME_FAMILY, NAME_STYLE, NAME_TYPO_FAMILY, NAME_TYPO_STYLE = 1, 2, 16, 17
+
+def _decode_name(platform_id, data):
+    if platform_id in (0, 3):
+        return data.decode('utf-16-be', errors='replace')
+    return data.decode('mac_roman', errors='replace')
+
+def _read_names(f, tables):
+    if 'name' not in tables:
+        return {}
+    offset, length = tables['name']
+    data = _read(f, offset, length)
+    count, string_offset = _unpack_from('>HH', data, 2)
+
+    # 같은 ID가 여러 언어로 있으면 영어(Windows 0x409, Mac 0)를 우선
+    names = {}
+    for i in range(count):
+        platform_id, encoding_id, language_id, name_id, size, pos = _unpack_from('>HHHHHH', data, 6 + 12 * i)
+        if name_id not in (NAME_FAMILY, NAME_STYLE, NAME_TYPO_FAMILY, NAME_TYPO_STYLE):
+            continue
+        english = (platform_id == 3 and language_id == 0x409) or (platform_id == 1 and language_id == 0)
+        if name_id in names and not english:
+            continue
+        start = string_offset + pos
+        names[name_id] = _decode_name(platform_id, data[start:start + size])
+    return names
+
+def _read_weight(f, tables):
+    if 'OS/2' not in tables:
+        return 400
+    offset, length = tables['OS/2']
+    if length < 6:
+        return 400
+    return struct.unpack('>H', _read(f, offset + 4, 2))[0] or 400
+
+def read_faces(path):
+    """폰트 파일 안의 모든 폰트(face)의 FaceInfo 목록 (cmap을 읽을 수 없는 face는 ranges가 빈 목록)"""
+    faces = []
+    with open(path, 'rb') as f:
+        offsets = face_offsets(f)
+        for index, offset in enumerate(offsets):
+            tables = table_directory(f, offset)
+            names = _read_names(f, tables)
+            family = names.get(NAME_TYPO_FAMILY) or names.get(NAME_FAMILY) or ''
+            style = names.get(NAME_TYPO_STYLE) or names.get(NAME_STYLE) or 'Regular'
+            faces.append([index, family, style, _read_weight(f, tables)])
+
+    result = []
+    for index, family, style, weight in faces:
+        try:
+            ranges = read_cmap_ranges(path, index)
+        except FontFormatError:
+            ranges = []
+        result.append(FaceInfo(index, family, style, weight, ranges))
+    return result
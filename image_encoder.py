@@ -0,0 +1,162 @@
+import io
+import os
+import sys
+import time
+import zlib
+import struct
+from collections import namedtuple
+from PIL import Image
+
+# 인코더 설정 (mode: 저장 전에 변환할 색상 모드, None이면 그대로)
+EncoderProfile = namedtuple('EncoderProfile', ['name', 'format', 'extension', 'mode', 'options'])
+
+# 인코딩 결과 (bytes: 저장된 크기, seconds: 색상 변환을 포함한 인코딩 시간)
+EncodeStats = namedtuple('EncodeStats', ['profile', 'bytes', 'seconds'])
+
+# 악보 이미지는 흰 배경의 검은 글씨와 옅은 로고뿐이라 흑백/16색으로도 충분함
+PROFILES = {
+    'png': EncoderProfile('png', 'PNG', '.png', None, {}),  # 기존과 같은 RGB PNG
+    'gray': EncoderProfile('gray', 'PNG', '.png', 'L', {'compress_level': 9}),
+    'palette': EncoderProfile('palette', 'PNG', '.png', 'P', {'bits': 4, 'compress_level': 9}),
+    'webp': EncoderProfile('webp', 'WEBP', '.webp', None, {'lossless': True, 'quality': 100, 'method': 4}),
+    'fast': EncoderProfile('fast', 'PNG', '.png', 'L', {'compress_level': 1}),  # 미리보기용
+}
+
+DEFAULT_PROFILE = 'png'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 인코더 프로필입니다: {name} (사용 가능: {', '.join(PROFILES)})")
+
+def _convert(img, mode):
+    if mode is None or img.mode == mode:
+        return img
+    if mode == 'P':
+        # 16색 적응형 팔레트 (4비트 PNG)
+        return img.convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE, colors=16)
+    return img.convert(mode)
+
+def encode_image(img, sink, profile=DEFAULT_PROFILE):
+    """
+    이미지를 지정한 프로필로 인코딩해서 sink(파일 경로 또는 쓰기 가능한 파일 객체)에 저장
+
+    EncodeStats를 반환합니다.
+    """
+    profile = get_profile(profile) if isinstance(profile, str) else profile
+
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    _convert(img, profile.mode).save(buffer, format=profile.format, **profile.options)
+    seconds = time.perf_counter() - start
+
+    data = buffer.getbuffer()
+    if isinstance(sink, (str, os.PathLike)):
+        with open(sink, 'wb') as f:
+            f.write(data)
+    else:
+        sink.write(data)
+    return EncodeStats(profile.name, len(data), seconds)
+
+def can_stream(profile=DEFAULT_PROFILE):
+    """스트립 단위 스트리밍 인코딩을 지원하는 프로필인지 (팔레트/WebP는 전체 이미지가 필요)"""
+    profile = get_profile(profile) if isinstance(profile, str) else profile
+    return profile.format == 'PNG' and profile.mode in (None, 'L')
+
+def _png_chunk(chunk_type, data):
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+class StreamingPNGWriter:
+    """
+    위에서부터 가로 띠(strip) 단위로 받은 이미지를 바로 PNG로 압축해서 쓰는 인코더
+
+    전체 캔버스를 메모리에 만들지 않아도 되므로 곡 길이와 관계없이 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, sink, width, height, profile=DEFAULT_PROFILE):
+        self.profile = get_profile(profile) if isinstance(profile, str) else profile
+        if not can_stream(self.profile):
+            raise ValueError(f"스트리밍 인코딩을 지원하지 않는 프로필입니다: {self.profile.name}")
+
+        self.mode = self.profile.mode or 'RGB'
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+
+        self._own_file = isinstance(sink, (str, os.PathLike))
+        self._file = open(sink, 'wb') if self._own_file else sink
+        self._compressor = zlib.compressobj(self.profile.options.get('compress_level', 6))
+
+        color_type = 0 if self.mode == 'L' else 2
+        self._write(PNG_SIGNATURE)
+        self._write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)))
+
+    def _write(self, data):
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def write_strip(self, strip):
+        """strip의 모든 줄을 씀 (너비는 캔버스와 같아야 함)"""
+        start = time.perf_counter()
+        if strip.mode != self.mode:
+            strip = strip.convert(self.mode)
+        raw = strip.tobytes()
+        stride = len(raw) // strip.height
+        # 각 줄 앞에 필터 종류(0: 없음) 바이트를 붙임
+        rows = bytearray()
+        for y in range(strip.height):
+            rows.append(0)
+            rows += raw[y * stride:(y + 1) * stride]
+        compressed = self._compressor.compress(bytes(rows))
+        if compressed:
+            self._write(_png_chunk(b'IDAT', compressed))
+        self.rows_written += strip.height
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG 높이가 맞지 않습니다: {self.rows_written}/{self.height}")
+        start = time.perf_counter()
+        self._write(_png_chunk(b'IDAT', self._compressor.flush()))
+        self._write(_png_chunk(b'IEND', b''))
+        if self._own_file:
+            self._file.close()
+        self.seconds += time.perf_counter() - start
+        return EncodeStats(self.profile.name, self.bytes_written, self.seconds)
+
+def output_path(base_path, profile=DEFAULT_PROFILE):
+    """확장자 없는 경로에 프로필의 확장자를 붙임"""
+    profile = get_profile(profile) if isinstance(profile, str) else profile
+    return base_path + profile.extension
+
+def compare_profiles(img):
+    """모든 프로필로 인코딩해 보고 결과 목록을 반환 (저장하지 않음)"""
+    return [encode_image(img, io.BytesIO(), name) for name in PROFILES]
+
+def main():
+    # 사용법: python image_encoder.py <이미지 파일> [...]
+    if len(sys.argv) < 2:
+        print("Usage: python image_encoder.py <image_file> [<image_file> ...]")
+        sys.exit(1)
+
+    totals = {name: [0, 0.0] for name in PROFILES}
+    for path in sys.argv[1:]:
+        with Image.open(path) as img:
+            img = img.convert('RGB')
+            for stats in compare_profiles(img):
+                totals[stats.profile][0] += stats.bytes
+                totals[stats.profile][1] += stats.seconds
+
+    baseline = totals[DEFAULT_PROFILE][0] or 1
+    print(f"{'프로필':<10}{'크기(bytes)':>14}{'비율':>8}{'인코딩(ms)':>12}")
+    for name, (size, seconds) in totals.items():
+        print(f"{name:<10}{size:>14,}{size / baseline:>8.0%}{seconds * 1000:>12.1f}")
+
+if __name__ == '__main__':
+    main()
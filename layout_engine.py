@@ -0,0 +1,258 @@
+import threading
+from collections import OrderedDict, namedtuple
+from PIL import ImageDraw
+from font_coverage import split_runs
+
+# 레이아웃 간격 설정 (픽셀 단위)
+LayoutStyle = namedtuple('LayoutStyle', [
+    'width', 'line_spacing', 'title_spacing', 'section_spacing',
+    'padding', 'top_padding', 'bottom_padding', 'bg_color', 'text_color'
+])
+
+DEFAULT_STYLE = LayoutStyle(
+    width=595,           # A4 너비 (72dpi 기준)
+    line_spacing=6,
+    title_spacing=14,
+    section_spacing=28,
+    padding=40,
+    top_padding=40,
+    bottom_padding=60,   # A4 문서 하단 여백
+    bg_color="#f8f8f8",
+    text_color="black"
+)
+
+# 그릴 텍스트 하나 (좌표는 캔버스 기준)
+TextItem = namedtuple('TextItem', ['x', 'y', 'text', 'font'])
+
+# 한 번의 측정으로 만든 배치 결과 - 그리기는 이 계획을 그대로 재생하기만 함
+# title과 lines는 TextItem 목록 (대체 폰트를 쓰는 줄은 폰트별 구간으로 나뉨)
+LayoutPlan = namedtuple('LayoutPlan', ['width', 'height', 'title', 'lines', 'style'])
+
+class MeasureCache:
+    """(폰트, 텍스트) → bbox 캐시 - 파일 사이에서도 공유됨"""
+
+    def __init__(self, max_size=65536):
+        self.max_size = max_size
+        self._bboxes = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bbox(self, font, text):
+        key = (_font_key(font), text)
+        with self._lock:
+            bbox = self._bboxes.get(key)
+            if bbox is not None:
+                self._bboxes.move_to_end(key)
+                self.hits += 1
+                return bbox
+
+        bbox = font.getbbox(text)
+        with self._lock:
+            self.misses += 1
+            self._bboxes[key] = bbox
+            if len(self._bboxes) > self.max_size:
+                self._bboxes.popitem(last=False)
+        return bbox
+
+    def clear(self):
+        with self._lock:
+            self._bboxes.clear()
+            self.hits = 0
+            self.misses = 0
+
+def _font_key(font):
+    # 같은 파일/크기의 폰트는 객체가 달라도 같은 측정 결과를 공유
+    path = getattr(font, 'path', None)
+    if path is None:
+        return id(font)
+    return (path, getattr(font, 'size', None), getattr(font, 'index', 0))
+
+_measure_cache = MeasureCache()
+
+def get_measure_cache():
+    return _measure_cache
+
+def measure(font, text):
+    """텍스트의 (너비, 높이)를 반환"""
+    bbox = _measure_cache.bbox(font, text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+def _chain(fonts):
+    # 폰트 하나 또는 (기본 폰트, 대체 폰트, ...) 목록
+    return tuple(fonts) if isinstance(fonts, (tuple, list)) else (fonts,)
+
+def measure_runs(fonts, text):
+    """
+    글자별 대체 폰트를 적용한 텍스트의 (너비, 높이, [(구간 텍스트, 폰트), ...])를 반환
+
+    기본 폰트로 모두 그릴 수 있으면 measure와 같은 값입니다.
+    """
+    runs = split_runs(text, _chain(fonts))
+    if len(runs) == 1:
+        width, height = measure(runs[0][1], text)
+        return width, height, runs
+
+    # 구간마다 다음 구간의 시작 위치만큼 이동하고, 높이는 모든 구간을 감싸는 범위
+    # 너비는 measure와 같이 첫 글자의 왼쪽 여백(bbox[0])을 뺀 값
+    advance = 0
+    left = None
+    top, bottom = None, None
+    for run, font in runs[:-1]:
+        bbox = _measure_cache.bbox(font, run)
+        left = bbox[0] if left is None else left
+        top = bbox[1] if top is None else min(top, bbox[1])
+        bottom = bbox[3] if bottom is None else max(bottom, bbox[3])
+        advance += round(font.getlength(run))
+    last_run, last_font = runs[-1]
+    bbox = _measure_cache.bbox(last_font, last_run)
+    return advance + bbox[2] - left, max(bottom, bbox[3]) - min(top, bbox[1]), runs
+
+def _text_items(x, y, runs):
+    items = []
+    for run, font in runs:
+        items.append(TextItem(x, y, run, font))
+        x += round(font.getlength(run))
+    return items
+
+def _line_advance(text, is_section, fonts, style):
+    # 줄 하나가 전체 높이에 더하는 값 (build_layout의 높이 계산과 같음)
+    normal_font, _, section_font = fonts
+    if is_section:
+        return measure_runs(section_font, text)[1] + style.section_spacing
+    return measure_runs(normal_font, text)[1] + style.line_spacing
+
+def split_pages(title, lines, fonts, max_height, style=DEFAULT_STYLE):
+    """
+    각 페이지 높이가 max_height를 넘지 않도록 줄 목록을 페이지별로 나눔
+
+    가능하면 섹션 경계에서 나누고, 한 섹션이 한 페이지보다 길 때만 섹션 중간에서 나눕니다.
+    모든 페이지에 타이틀이 들어간다고 보고 계산합니다.
+    """
+    _, title_font, _ = fonts
+    title_height = measure_runs(title_font, title)[1]
+    budget = (max_height - style.top_padding - title_height - style.title_spacing
+              - style.padding - style.bottom_padding)
+
+    # 섹션 헤더마다 블록을 나눔
+    blocks = []
+    for line in lines:
+        if line[1] or not blocks:
+            blocks.append([])
+        blocks[-1].append(line)
+
+    pages = []
+    page = []
+    used = 0
+    for block in blocks:
+        heights = [_line_advance(text, is_section, fonts, style) for text, is_section in block]
+        block_height = sum(heights)
+        if page and used + block_height > budget:
+            pages.append(page)
+            page, used = [], 0
+        if block_height <= budget:
+            page += block
+            used += block_height
+            continue
+
+        # 한 섹션이 한 페이지보다 긴 경우 줄 단위로 나눔
+        for line, height in zip(block, heights):
+            if page and used + height > budget:
+                pages.append(page)
+                page, used = [], 0
+            page.append(line)
+            used += height
+
+    if page:
+        pages.append(page)
+    return pages
+
+def build_layout(title, lines, fonts, style=DEFAULT_STYLE):
+    """
+    타이틀과 본문 줄을 한 번에 측정해서 LayoutPlan을 만듦
+
+    lines는 (텍스트, 섹션 헤더 여부) 목록이고, fonts는 (본문, 타이틀, 섹션) 폰트입니다.
+    각 폰트 대신 (기본 폰트, 대체 폰트, ...) 목록을 주면 기본 폰트에 없는 글자를 대체 폰트로 그립니다.
+    이 경우 한 줄이 폰트별 구간으로 나뉘어 여러 TextItem이 됩니다.
+    """
+    normal_font, title_font, section_font = fonts
+
+    # 타이틀 (중앙 정렬)
+    title_width, title_height, runs = measure_runs(title_font, title)
+    current_y = style.top_padding
+    title_items = _text_items((style.width - title_width) // 2, current_y, runs)
+    current_y += title_height + style.title_spacing
+
+    # 본문 - 위치 계산과 전체 높이 계산을 같은 루프에서 처리
+    items = []
+    content_height = 0
+    for i, (text, is_section) in enumerate(lines):
+        if is_section:
+            # 섹션 헤더는 추가 간격을 두고 중앙 정렬
+            current_y += style.section_spacing
+            text_width, text_height, runs = measure_runs(section_font, text)
+            items += _text_items((style.width - text_width) // 2, current_y, runs)
+            content_height += text_height + style.section_spacing
+        else:
+            # 일반 텍스트는 좌측 정렬
+            text_width, text_height, runs = measure_runs(normal_font, text)
+            items += _text_items(style.padding, current_y, runs)
+            content_height += text_height + style.line_spacing
+
+        # 마지막 줄이 아닐 경우에만 줄 간격 추가
+        current_y += text_height
+        if i < len(lines) - 1:
+            current_y += style.line_spacing
+
+    total_height = (style.top_padding + title_height + style.title_spacing + content_height
+                    + style.padding + style.bottom_padding)
+    return LayoutPlan(style.width, total_height, title_items, items, style)
+
+def draw_layout(img, plan, watermark_layer=None):
+    """LayoutPlan을 이미지에 그림"""
+    draw = ImageDraw.Draw(img)
+    fill = plan.style.text_color
+
+    for item in plan.title:
+        draw.text((item.x, item.y), item.text, fill=fill, font=item.font)
+
+    # 워터마크는 타이틀 위, 본문 아래에 합성
+    if watermark_layer:
+        img.paste(watermark_layer, (0, 0), watermark_layer)
+
+    for item in plan.lines:
+        draw.text((item.x, item.y), item.text, fill=fill, font=item.font)
+
+def draw_text(draw, xy, text, fonts, fill):
+    """글자별 대체 폰트를 적용해서 text를 그림 (fonts는 폰트 또는 (기본 폰트, 대체 폰트, ...) 목록)"""
+    x, y = xy
+    for item in _text_items(x, y, split_runs(text, _chain(fonts))):
+        draw.text((item.x, item.y), item.text, font=item.font, fill=fill)
+
+def _is_visible(item, top, bottom):
+    # 글자가 기준 위치에서 위아래로 조금 벗어날 수 있으므로 폰트 크기만큼 여유를 둠
+    size = getattr(item.font, 'size', 20)
+    return item.y - size < bottom and item.y + size * 2 > top
+
+def draw_layout_strip(img, plan, top, watermark_tile=None, watermark_positions=()):
+    """
+    LayoutPlan 중 캔버스의 [top, top + img.height) 구간만 img에 그림
+
+    모든 띠를 위에서부터 이어 붙이면 draw_layout으로 한 번에 그린 것과 같은 이미지가 됩니다.
+    """
+    bottom = top + img.height
+    draw = ImageDraw.Draw(img)
+    fill = plan.style.text_color
+
+    for item in plan.title:
+        if _is_visible(item, top, bottom):
+            draw.text((item.x, item.y - top), item.text, fill=fill, font=item.font)
+
+    if watermark_tile is not None:
+        for x, y in watermark_positions:
+            if y < bottom and y + watermark_tile.height > top:
+                img.paste(watermark_tile, (x, y - top), watermark_tile)
+
+    for item in plan.lines:
+        if _is_visible(item, top, bottom):
+            draw.text((item.x, item.y - top), item.text, fill=fill, font=item.font)
@@ -0,0 +1,131 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# 요약 표에 표시할 단계 순서 (기록에 없는 단계는 뒤에 붙음)
+STAGES = ['decode', 'clean', 'language', 'fonts', 'layout', 'watermark', 'draw', 'encode', 'move']
+
+class RenderProfiler:
+    """
+    파일 하나를 변환하는 동안 단계별 시간, 읽고 쓴 바이트 수, 최대 메모리 할당량을 기록
+
+    기록(records)은 JSON으로 바로 저장할 수 있는 dict 목록이라 워커 프로세스에서
+    만들어서 결과와 함께 돌려줄 수 있습니다.
+    trace_memory면 tracemalloc으로 최대 할당량을 측정합니다. 파이썬 객체 할당만 집계되고
+    Pillow 이미지 버퍼는 포함되지 않으며, 측정하는 동안 변환이 느려집니다.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._current = None
+
+    @contextmanager
+    def file(self, name):
+        # 이미 다른 파일을 기록 중이면 그 기록에 합침 (convert_and_move → convert_file)
+        if self._current is not None:
+            yield self._current
+            return
+
+        record = {'file': name, 'seconds': 0.0, 'stages': {},
+                  'bytes_read': 0, 'bytes_written': 0, 'peak_alloc': None}
+        started_tracing = False
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        self._current = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if self.trace_memory:
+                record['peak_alloc'] = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self._current = None
+            self.records.append(record)
+
+    @contextmanager
+    def stage(self, name):
+        # 같은 단계가 여러 번 실행되면 (띠 단위 렌더링, 여러 페이지) 시간을 합산
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                stages = self._current['stages']
+                stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+    def add_read(self, size):
+        if self._current is not None:
+            self._current['bytes_read'] += size
+
+    def add_written(self, size):
+        if self._current is not None:
+            self._current['bytes_written'] += size
+
+class NullProfiler:
+    """아무것도 기록하지 않는 프로파일러 (profiler를 넘기지 않았을 때 사용)"""
+
+    records = ()
+
+    def file(self, name):
+        return nullcontext()
+
+    def stage(self, name):
+        return nullcontext()
+
+    def add_read(self, size):
+        pass
+
+    def add_written(self, size):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def write_record(f, record):
+    """기록 하나를 JSON 한 줄로 씀"""
+    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+def summarize(records):
+    """단계별 (단계, 합계 초, 평균 ms, p95 ms, 비율) 목록을 반환"""
+    stage_times = {}
+    for record in records:
+        for name, seconds in record['stages'].items():
+            stage_times.setdefault(name, []).append(seconds)
+
+    total = sum(record['seconds'] for record in records) or 1
+    order = STAGES + sorted(name for name in stage_times if name not in STAGES)
+    rows = []
+    for name in order:
+        times = stage_times.get(name)
+        if times:
+            rows.append((name, sum(times), sum(times) / len(times) * 1000,
+                         _percentile(times, 95) * 1000, sum(times) / total))
+    return rows
+
+def print_summary(records):
+    if not records:
+        print("프로파일 기록이 없습니다.")
+        return
+
+    print(f"\n{'단계':<12}{'합계(s)':>10}{'평균(ms)':>10}{'p95(ms)':>10}{'비율':>8}")
+    for name, total, mean, p95, share in summarize(records):
+        print(f"{name:<12}{total:>10.3f}{mean:>10.1f}{p95:>10.1f}{share:>8.0%}")
+
+    bytes_read = sum(record['bytes_read'] for record in records)
+    bytes_written = sum(record['bytes_written'] for record in records)
+    peaks = [record['peak_alloc'] for record in records if record['peak_alloc'] is not None]
+    print(f"\n파일 {len(records)}개, 읽기 {bytes_read:,} bytes, 쓰기 {bytes_written:,} bytes")
+    if peaks:
+        print(f"최대 메모리 할당: {max(peaks) / (1024 * 1024):.1f} MB (파일당 평균 {sum(peaks) / len(peaks) / (1024 * 1024):.1f} MB)")
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from batch_converter import warm_up, default_jobs
+from font_discovery import get_font_index
+from convert_text_to_image import render_sheet_bytes, RenderOptions, EmptySheetError
+from image_encoder import get_profile, DEFAULT_PROFILE
+from text_decoder import decode_bytes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_SIZE = 1024 * 1024  # 악보 텍스트 최대 크기 (1 MiB)
+MAX_HEADER_SIZE = 16 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 422: 'Unprocessable Entity', 429: 'Too Many Requests',
+           500: 'Internal Server Error'}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def content_length(value):
+    """Content-Length 헤더 값을 검사해서 본문 크기를 반환 (없으면 0, 잘못되었으면 400, 너무 크면 413)"""
+    if value is None or value == '':
+        return 0
+    if not value.isascii() or not value.isdigit():
+        raise HTTPError(400, "Content-Length가 올바르지 않습니다")
+    length = int(value)
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, "악보 텍스트가 너무 큽니다")
+    return length
+
+def _render_job(text, title, encoder):
+    # 워커 프로세스에서 실행 (폰트와 워터마크는 warm_up에서 이미 로드됨)
+    return render_sheet_bytes(text, title, RenderOptions(encoder))
+
+def _ping():
+    return True
+
+class RenderServer:
+    """
+    악보 텍스트를 받아 이미지 바이트를 돌려주는 로컬 HTTP 렌더 서버
+
+    POST /render?title=...&encoder=png  본문: 악보 텍스트 → 이미지
+    GET  /stats                          처리량, 대기열, 지연 시간 (JSON)
+    GET  /health                         상태 확인
+
+    렌더링은 미리 폰트와 워터마크를 로드해 둔 워커 프로세스 풀에서 실행됩니다.
+    실행 중이거나 대기 중인 요청이 max_pending을 넘으면 429로 바로 거절합니다.
+    """
+
+    def __init__(self, jobs=None, max_pending=None):
+        self.jobs = jobs or default_jobs()
+        self.max_pending = max_pending or self.jobs * 4
+        self.executor = None
+        self.started_at = time.monotonic()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=1000)
+
+    async def start_pool(self):
+        # 첫 요청이 워커 시작 비용을 내지 않도록 모든 워커를 미리 띄움
+        # (폰트 색인은 워커마다 만들지 않도록 먼저 만들어 둠)
+        get_font_index().faces()
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=warm_up)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, _ping) for _ in range(self.jobs)])
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(percent):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(round(percent / 100 * (len(latencies) - 1))))] * 1000, 2)
+
+        return {
+            'workers': self.jobs,
+            'max_pending': self.max_pending,
+            'in_flight': min(self.pending, self.jobs),
+            'queued': max(0, self.pending - self.jobs),
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'uptime_seconds': round(time.monotonic() - self.started_at, 1),
+        }
+
+    async def render(self, text, title, encoder):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPError(429, "렌더 대기열이 가득 찼습니다")
+
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(self.executor, _render_job, text, title, encoder)
+        except EmptySheetError as e:
+            self.failed += 1
+            raise HTTPError(422, str(e))
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.latencies.append(time.perf_counter() - start)
+        return data
+
+    async def handle_request(self, method, target, body):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == '/stats':
+            return 200, 'application/json', json.dumps(self.stats()).encode('utf-8')
+        if url.path == '/health':
+            return 200, 'text/plain; charset=utf-8', b'ok'
+        if url.path != '/render':
+            raise HTTPError(404, f"알 수 없는 경로입니다: {url.path}")
+        if method != 'POST':
+            raise HTTPError(405, "POST로 요청해야 합니다")
+
+        encoder = query.get('encoder', DEFAULT_PROFILE)
+        try:
+            profile = get_profile(encoder)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        decoded = decode_bytes(body)
+        if decoded.encoding is None:
+            raise HTTPError(400, "본문의 인코딩을 판별할 수 없습니다")
+
+        data = await self.render(decoded.text, query.get('title', ''), encoder)
+        return 200, f"image/{profile.format.lower()}", data
+
+    async def handle_connection(self, reader, writer):
+        # HTTP/1.1 keep-alive: 연결 하나로 여러 요청을 순서대로 처리
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, "요청 헤더가 너무 큽니다", keep_alive=False)
+                    break
+
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, "잘못된 요청입니다", keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+
+                try:
+                    length = content_length(headers.get('content-length'))
+                except HTTPError as e:
+                    # 본문이 어디서 끝나는지 알 수 없으므로 응답하고 연결을 닫음
+                    await self._respond(writer, e.status, str(e), keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, content_type, data = await self.handle_request(method, target, body)
+                except HTTPError as e:
+                    extra = {'Retry-After': '1'} if e.status == 429 else {}
+                    await self._respond(writer, e.status, str(e), keep_alive, extra)
+                except Exception as e:
+                    print(f"렌더링 중 오류 발생: {e}")
+                    await self._respond(writer, 500, str(e), keep_alive)
+                else:
+                    await self._send(writer, status, content_type, data, keep_alive, {})
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, message, keep_alive=True, extra=None):
+        data = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        await self._send(writer, status, 'application/json', data, keep_alive, extra or {})
+
+    async def _send(self, writer, status, content_type, data, keep_alive, extra):
+        headers = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                   f"Content-Type: {content_type}",
+                   f"Content-Length: {len(data)}",
+                   f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        headers += [f"{name}: {value}" for name, value in extra.items()]
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + data)
+        await writer.drain()
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, jobs=None, max_pending=None):
+    """렌더 서버를 시작하고 종료될 때까지 실행 (unix_path를 주면 UNIX 소켓 사용)"""
+    server = RenderServer(jobs, max_pending)
+    print(f"렌더 워커 {server.jobs}개를 준비하는 중...")
+    await server.start_pool()
+
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix_path,
+                                                   limit=MAX_HEADER_SIZE)
+        print(f"렌더 서버 시작: unix:{unix_path}")
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+        print(f"렌더 서버 시작: http://{host}:{port}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows는 Ctrl+C가 KeyboardInterrupt로 전달됨
+
+    try:
+        async with listener:
+            await stop.wait()
+    finally:
+        server.close()
+        if unix_path and os.path.exists(unix_path):
+            os.remove(unix_path)
+        print("렌더 서버를 종료합니다.")
+
+def main():
+    parser = argparse.ArgumentParser(description="악보 텍스트를 이미지로 렌더링하는 로컬 HTTP 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="바인딩할 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="포트 (기본값: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="TCP 대신 이 경로의 UNIX 소켓 사용")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="렌더 워커 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="동시에 처리하거나 기다릴 수 있는 요청 수, 넘으면 429 (기본값: 워커 수 x 4)")
+    args = parser.parse_args()
+
+    if args.unix and not hasattr(asyncio, 'start_unix_server'):
+        print("이 운영체제에서는 UNIX 소켓을 사용할 수 없습니다.")
+        sys.exit(1)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.jobs, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
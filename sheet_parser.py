@@ -0,0 +1,106 @@
+import re
+from collections import namedtuple
+
+# 줄 종류
+BLANK = 'blank'
+SECTION = 'section'
+CAPO = 'capo'
+CHORDS = 'chords'            # 코드만 있는 줄 (예: Am  G  F)
+CHORD_LYRIC = 'chord_lyric'  # 코드로 시작하고 가사가 이어지는 줄
+LYRIC = 'lyric'
+METADATA = 'metadata'        # 작곡가, 저작권, URL 등 악보가 아닌 정보
+
+# 줄 하나 (chords: 코드만 있는 줄의 (열 위치, 코드) 목록, section: 속한 섹션 번호)
+SheetLine = namedtuple('SheetLine', ['kind', 'text', 'chords', 'section'])
+
+# 섹션 하나 (start 이상 end 미만의 줄 번호, 헤더 줄 포함)
+Section = namedtuple('Section', ['name', 'start', 'end'])
+
+# 파싱된 악보 - 정리, 렌더링, 생성 도구가 모두 이 구조를 사용
+SheetDocument = namedtuple('SheetDocument', ['lines', 'sections'])
+
+SECTION_NAMES = (
+    'intro|verse|bridge|chorus|outro|pre-chorus|hook|refrain|interlude|instrumental|solo|'
+    '간주|후렴|브릿지'
+)
+
+# 섹션 헤더 (예: [Chorus], (Verse 2), Bridge)
+SECTION_RE = re.compile(
+    r'^\s*[\[\(]*(' + SECTION_NAMES + r')\s*\d*[\]\)]*\s*\d*\s*$', re.IGNORECASE)
+
+CAPO_RE = re.compile(r'^\s*capo\s*\d+\s*$')
+
+CHORD = r'[A-G][#mb]?(?:maj|min|aug|dim|sus|add)?[0-9]?'
+CHORD_RE = re.compile(CHORD)
+CHORD_LINE_RE = re.compile(r'^[\s]*(' + CHORD + r'\s*)+$')
+CHORD_LYRIC_RE = re.compile(r'^[\s]*' + CHORD + r'.*[a-zA-Z가-힣]+.*$')
+
+METADATA_PATTERNS = [
+    r'written by', r'performed by', r'produced by', r'recorded by',
+    r'mixed by', r'mastered by', r'published by', r'lyrics by',
+    r'music by', r'arranged by', r'composed by', r'original by',
+    r'cover by', r'tab by', r'chords by', r'@', r'©', r'=',
+    r'artist:', r'album:', r'year:', r'genre:', r'key:',
+    r'tempo:', r'difficulty:', r'tuning:', r'note:',
+    r'transcribed by', r'tabbed by', r'created by',
+    r'copyright', r'all rights reserved', r'source:',
+    r'duration:', r'length:', r'release:', r'label:',
+    r'http[s]?://', r'www\.', r'youtube\.com', r'spotify\.com',
+    r'ultimate-guitar\.com', r'credits:', r'original version',
+    r'version:', r'original artist', r'original song'
+]
+METADATA_RE = re.compile('|'.join(pattern.lower() for pattern in METADATA_PATTERNS))
+
+def is_section_header(line):
+    return SECTION_RE.match(line) is not None
+
+def is_metadata_line(line):
+    return METADATA_RE.search(line.lower()) is not None
+
+def classify_line(line):
+    """줄 하나의 종류를 판별"""
+    stripped = line.strip()
+    if not stripped:
+        return BLANK
+    if SECTION_RE.match(stripped):
+        return SECTION
+    if CAPO_RE.match(stripped.lower()):
+        return CAPO
+    if CHORD_LINE_RE.match(stripped):
+        return CHORDS
+    # 코드로 시작하는 줄은 메타데이터 검사 없이 악보 내용으로 취급
+    if CHORD_LYRIC_RE.match(stripped):
+        return CHORD_LYRIC
+    if METADATA_RE.search(stripped.lower()):
+        return METADATA
+    return LYRIC
+
+def parse_sheet(text):
+    """악보 텍스트를 한 번 훑어서 SheetDocument로 변환"""
+    lines = []
+    sections = []
+    section_index = None
+    section_name = None
+    section_start = 0
+
+    # 텍스트 모드로 파일을 읽을 때처럼 \r\n, \r 줄바꿈도 \n으로 취급
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    for i, line in enumerate(text.split('\n')):
+        kind = classify_line(line)
+        if kind == SECTION:
+            if section_index is not None:
+                sections.append(Section(section_name, section_start, i))
+            section_index = len(sections)
+            section_name = line.strip()
+            section_start = i
+
+        chords = ()
+        if kind == CHORDS:
+            chords = tuple((m.start(), m.group()) for m in CHORD_RE.finditer(line))
+
+        lines.append(SheetLine(kind, line, chords, section_index))
+
+    if section_index is not None:
+        sections.append(Section(section_name, section_start, len(lines)))
+
+    return SheetDocument(lines, sections)
@@ -0,0 +1,88 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 초안은 캔버스 위쪽 DRAFT_HEIGHT 픽셀만 워터마크 없이 그린 뒤 1/DRAFT_SCALE로 줄여서 보여줌
+# (글리프 래스터화가 그리기 시간의 대부분이라 그리는 줄 수를 줄여야 빨라짐)
+DRAFT_HEIGHT = 1200
+DRAFT_SCALE = 2
+
+# 미리보기 캐시에 보관할 이미지 크기의 합계 상한
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def content_key(text, title):
+    """미리보기 캐시 키 (제목과 본문이 같으면 같은 키)"""
+    digest = hashlib.sha256()
+    digest.update(title.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+def draw_preview(plan, draft=False, profiler=None):
+    """
+    배치 계획을 미리보기 이미지로 그림
+
+    draft면 첫 화면에 보이는 위쪽 부분만 워터마크 없이 그려서 1/DRAFT_SCALE 크기로 줄인 초안을 반환합니다.
+    draft가 아니면 저장되는 이미지와 같은 완성본입니다.
+    """
+    # 렌더러(PIL)는 처음 그릴 때 불러옴 (GUI가 이 모듈을 import할 때 시작이 느려지지 않도록)
+    from PIL import Image
+    from convert_text_to_image import draw_plan
+    from layout_engine import draw_layout_strip
+
+    if not draft:
+        return draw_plan(plan, profiler)
+    img = Image.new("RGB", (plan.width, min(plan.height, DRAFT_HEIGHT)), color=plan.style.bg_color)
+    draw_layout_strip(img, plan, 0)
+    return img.reduce(DRAFT_SCALE)
+
+class PreviewCache:
+    """
+    content_key별 미리보기(초안, 완성본)를 최근에 본 순서로 보관하는 캐시
+
+    보관한 크기의 합이 max_bytes를 넘으면 가장 오래전에 본 것부터 버립니다.
+    값은 무엇이든 될 수 있으므로(PIL 이미지, QImage 등) 크기는 put할 때 함께 넘깁니다.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # (키, 초안 여부) → (값, 크기)
+        self._lock = threading.Lock()
+
+    def get(self, key, draft=False):
+        with self._lock:
+            entry = self._entries.get((key, draft))
+            if entry is None:
+                return None
+            self._entries.move_to_end((key, draft))
+            return entry[0]
+
+    def best(self, key):
+        """완성본이 있으면 (완성본, False), 초안만 있으면 (초안, True), 없으면 None"""
+        for draft in (False, True):
+            value = self.get(key, draft)
+            if value is not None:
+                return value, draft
+        return None
+
+    def put(self, key, draft, value, size):
+        with self._lock:
+            old = self._entries.pop((key, draft), None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[(key, draft)] = (value, size)
+            self.size += size
+            # 완성본이 생기면 초안은 더 이상 필요 없음
+            if not draft:
+                old = self._entries.pop((key, True), None)
+                if old is not None:
+                    self.size -= old[1]
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
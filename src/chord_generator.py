@@ -1,9 +1,15 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 import math
+from font_registry import get_font_chain
+from sheet_parser import parse_sheet, BLANK
+from layout_engine import draw_text
+from image_encoder import encode_image, get_profile, DEFAULT_PROFILE
+from render_profiler import NULL_PROFILER
 
 class ChordGenerator:
-    def __init__(self):
+    def __init__(self, encoder=DEFAULT_PROFILE):
+        self.encoder = get_profile(encoder)
         self.title_font_size = 48
         self.font_size = 40
         self.padding = 20
@@ -13,35 +19,28 @@ class ChordGenerator:
         self.a4_width = 2480  # 210mm * 300DPI / 25.4
         self.a4_height = 3508  # 297mm * 300DPI / 25.4
         
-        # 한글 폰트 설정
-        font_paths = [
-            "C:/Windows/Fonts/malgunbd.ttf",  # 맑은 고딕 Bold
-            "C:/Windows/Fonts/malgun.ttf",    # 맑은 고딕
-            "C:/Windows/Fonts/gulim.ttc",     # 굴림
-        ]
-        
-        self.title_font = None
-        self.font = None
-        
-        # 제목용 볼드 폰트
-        for font_path in font_paths:
-            try:
-                self.title_font = ImageFont.truetype(font_path, self.title_font_size)
-                self.font = ImageFont.truetype(font_path, self.font_size)
-                break
-            except:
-                continue
-                
-        if self.title_font is None:
-            self.title_font = ImageFont.load_default()
-            self.font = ImageFont.load_default()
+        # 한글 폰트 설정 (프로세스 공용 레지스트리에서 한 번만 로드됨)
+        # 한글 폰트에 없는 글자는 다른 언어 폰트로 글자 단위 대체
+        self.title_font = get_font_chain('ko', 'bold', self.title_font_size)
+        self.font = get_font_chain('ko', 'bold', self.font_size)
             
-    def create_chord_image(self, chord_progression, output_path):
-        """코드 진행을 이미지로 변환"""
-        lines = chord_progression.split('\n')
+    def create_chord_image(self, chord_progression, output_path, profiler=None):
+        """
+        코드 진행을 이미지로 변환하고 저장한 파일 경로 목록을 반환 (여러 페이지면 _page{n} 파일들)
+
+        profiler를 넘기면 단계별 시간과 메모리를 기록합니다.
+        """
+        profiler = profiler or NULL_PROFILER
+        with profiler.file(output_path):
+            return self._create_chord_image(chord_progression, output_path, profiler)
+
+    def _create_chord_image(self, chord_progression, output_path, profiler):
+        with profiler.stage('clean'):
+            lines = parse_sheet(chord_progression).lines
+        profiler.add_read(len(chord_progression.encode('utf-8')))
         
         # 제목 추출 (첫 번째 줄)
-        title = lines[0] if lines else ""
+        title = lines[0].text if lines else ""
         content_lines = lines[1:] if lines else []
         
         # 실제 사용 가능한 영역 계산 (여백 제외)
@@ -58,45 +57,49 @@ class ChordGenerator:
         # 총 필요한 페이지 수 계산
         total_pages = math.ceil(len(content_lines) / lines_per_page)
         
+        output_files = []
         for page in range(total_pages):
             # 현재 페이지의 라인들
             start_idx = page * lines_per_page
             end_idx = min((page + 1) * lines_per_page, len(content_lines))
             current_lines = content_lines[start_idx:end_idx]
             
-            # 이미지 생성
-            image = Image.new('RGB', (self.a4_width, self.a4_height), 'white')
-            draw = ImageDraw.Draw(image)
+            with profiler.stage('draw'):
+                # 이미지 생성
+                image = Image.new('RGB', (self.a4_width, self.a4_height), 'white')
+                draw = ImageDraw.Draw(image)
             
-            # 제목 그리기 (첫 페이지에만)
-            if page == 0:
-                draw.text((self.padding, self.padding), title, 
-                         font=self.title_font, fill='black')
+                # 제목 그리기 (첫 페이지에만)
+                if page == 0:
+                    draw_text(draw, (self.padding, self.padding), title, self.title_font, 'black')
             
-            # 내용 그리기
-            y = title_height + self.padding if page == 0 else self.padding
-            for line in current_lines:
-                if not line.strip():
-                    continue
+                # 내용 그리기
+                y = title_height + self.padding if page == 0 else self.padding
+                for line in current_lines:
+                    if line.kind == BLANK:
+                        continue
                     
-                draw.text((self.padding, y), line, font=self.font, fill='black')
-                y += self.font_size + self.padding
+                    draw_text(draw, (self.padding, y), line.text, self.font, 'black')
+                    y += self.font_size + self.padding
                 
-            # 페이지 번호 추가
-            if total_pages > 1:
-                page_num_text = f"Page {page + 1}/{total_pages}"
-                draw.text((self.a4_width - 200, self.a4_height - 50), 
-                         page_num_text, font=self.font, fill='black')
+                # 페이지 번호 추가
+                if total_pages > 1:
+                    page_num_text = f"Page {page + 1}/{total_pages}"
+                    draw_text(draw, (self.a4_width - 200, self.a4_height - 50), page_num_text, self.font, 'black')
             
-            # 파일 저장
+            # 파일 저장 (확장자는 인코더 프로필에 맞춤)
+            base_name, ext = os.path.splitext(output_path)
             if total_pages > 1:
-                base_name, ext = os.path.splitext(output_path)
-                current_output = f"{base_name}_page{page + 1}{ext}"
+                current_output = f"{base_name}_page{page + 1}{self.encoder.extension}"
             else:
-                current_output = output_path
+                current_output = base_name + self.encoder.extension
                 
             # 디렉토리가 없으면 생성
             os.makedirs(os.path.dirname(current_output), exist_ok=True)
             
             # 이미지 저장
-            image.save(current_output) 
\ No newline at end of file
+            with profiler.stage('encode'):
+                stats = encode_image(image, current_output, self.encoder)
+            profiler.add_written(stats.bytes)
+            output_files.append(current_output)
+        return output_files 
\ No newline at end of file
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import threading
+from collections import namedtuple
+
+STORE_PATH = os.path.join("data", "jobs.sqlite3")
+
+# 곡 하나의 처리 상태
+PENDING = 'pending'         # 아직 시작하지 않음
+GENERATING = 'generating'   # 코드 진행/설명 생성 중 (이미지는 아직 없음)
+RENDERED = 'rendered'       # 이미지 저장됨, 설명문은 아직 없음
+DESCRIBED = 'described'     # 이미지와 설명문 모두 저장됨 (완료)
+FAILED = 'failed'           # 실패, next_attempt_at 이후 다시 시도
+STATUSES = [PENDING, GENERATING, RENDERED, DESCRIBED, FAILED]
+
+MAX_ATTEMPTS = 5
+RETRY_BASE = 10 * 60        # 첫 재시도까지 대기 시간 (초, 실패할 때마다 두 배)
+RETRY_MAX = 24 * 60 * 60
+
+# 곡 하나의 작업 기록 (timings: 단계 → 초, tokens: LLM 요청 → 새로 평가한 프롬프트 토큰 수, 마지막 시도 기준)
+Job = namedtuple('Job', ['song', 'artist', 'title', 'status', 'attempts', 'chord_path', 'image_path',
+                         'description_path', 'timings', 'error', 'next_attempt_at', 'updated_at', 'tokens'])
+
+# update로 바꿀 수 있는 열
+_FIELDS = {'status', 'chord_path', 'image_path', 'description_path', 'timings', 'error', 'tokens'}
+
+# JSON으로 저장하는 열
+_JSON_FIELDS = ('timings', 'tokens')
+
+def parse_song(line):
+    """
+    "아티스트 - 제목" 한 줄을 (아티스트, 제목)으로 나눔 (형식이 아니면 None)
+
+    제목에 " - "가 들어 있어도 첫 번째 " - "에서만 나눕니다.
+    """
+    parts = line.split(' - ', 1)
+    if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+def retry_delay(attempts):
+    """attempts번 실패한 작업을 다시 시도하기까지 기다릴 시간 (초, jitter 포함)"""
+    return min(RETRY_MAX, RETRY_BASE * 2 ** max(0, attempts - 1)) * random.uniform(0.5, 1.0)
+
+class JobStore:
+    """
+    곡별 처리 상태를 SQLite 파일(data/jobs.sqlite3)에 기록하는 작업 저장소
+
+    곡마다 상태, 시도 횟수, 단계별 소요 시간, 결과 파일 경로를 남기므로 중간에 중단되어도
+    다음 실행에서 끝나지 않은 곡만, 끝난 단계는 건너뛰고 이어서 처리할 수 있습니다.
+    실패한 곡은 retry_delay만큼 기다린 뒤 다시 시도하고, MAX_ATTEMPTS번 실패하면 포기합니다.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    song TEXT PRIMARY KEY,
+                    artist TEXT,
+                    title TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    chord_path TEXT,
+                    image_path TEXT,
+                    description_path TEXT,
+                    timings TEXT NOT NULL DEFAULT '{}',
+                    error TEXT,
+                    next_attempt_at REAL,
+                    updated_at REAL NOT NULL,
+                    tokens TEXT NOT NULL DEFAULT '{}'
+                )""")
+            # tokens 열이 없던 이전 저장소에 열 추가
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if 'tokens' not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN tokens TEXT NOT NULL DEFAULT '{}'")
+
+    def sync(self, songs):
+        """곡 목록 중 처음 보는 곡을 pending으로 추가 (형식이 잘못된 줄은 다시 시도하지 않는 failed)"""
+        now = time.time()
+        with self._lock, self._db:
+            for song in songs:
+                parsed = parse_song(song)
+                if parsed is None:
+                    self._db.execute("INSERT OR IGNORE INTO jobs (song, status, error, updated_at) VALUES (?, ?, ?, ?)",
+                                     (song, FAILED, "'아티스트 - 제목' 형식이 아닙니다", now))
+                else:
+                    self._db.execute("INSERT OR IGNORE INTO jobs (song, artist, title, status, updated_at) "
+                                     "VALUES (?, ?, ?, ?, ?)", (song, *parsed, PENDING, now))
+
+    def runnable(self, songs, now=None):
+        """songs 중 지금 처리할 작업 목록 (완료, 재시도 대기 중, 포기한 작업 제외, songs 순서)"""
+        now = time.time() if now is None else now
+        jobs = {job.song: job for job in self.jobs()}
+        result = []
+        for song in dict.fromkeys(songs):
+            job = jobs.get(song)
+            if job is None or job.status == DESCRIBED or job.attempts >= MAX_ATTEMPTS:
+                continue
+            if job.status == FAILED and (job.next_attempt_at is None or job.next_attempt_at > now):
+                continue
+            result.append(job)
+        return result
+
+    def jobs(self):
+        with self._lock:
+            rows = self._db.execute(f"SELECT {', '.join(Job._fields)} FROM jobs ORDER BY rowid").fetchall()
+        jobs = [Job(*row) for row in rows]
+        return [job._replace(**{name: json.loads(getattr(job, name)) for name in _JSON_FIELDS}) for job in jobs]
+
+    def start(self, song):
+        """시도 횟수를 늘리고 generating으로 표시"""
+        with self._lock, self._db:
+            self._db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, error = NULL, "
+                             "next_attempt_at = NULL, updated_at = ? WHERE song = ?", (GENERATING, time.time(), song))
+
+    def update(self, song, **fields):
+        """상태, 결과 파일 경로, 단계별 시간(timings dict), 토큰 수(tokens dict) 등을 기록"""
+        unknown = set(fields) - _FIELDS
+        if unknown:
+            raise ValueError(f"알 수 없는 항목입니다: {', '.join(sorted(unknown))}")
+        for name in _JSON_FIELDS:
+            if name in fields:
+                fields[name] = json.dumps(fields[name])
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE jobs SET {columns}, updated_at = ? WHERE song = ?",
+                             (*fields.values(), time.time(), song))
+
+    def fail(self, song, error):
+        """실패로 표시하고 다음 시도 시각을 정함 (MAX_ATTEMPTS번 실패했으면 더 시도하지 않음)"""
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute("SELECT attempts FROM jobs WHERE song = ?", (song,)).fetchone()
+            attempts = row[0] if row else 0
+            next_attempt_at = now + retry_delay(attempts) if attempts < MAX_ATTEMPTS else None
+            self._db.execute("UPDATE jobs SET status = ?, error = ?, next_attempt_at = ?, updated_at = ? "
+                             "WHERE song = ?", (FAILED, error, next_attempt_at, now, song))
+
+    def counts(self):
+        """상태별 곡 수"""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._db.close()
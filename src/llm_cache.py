@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+CACHE_PATH = os.path.join(".cache", "llm", "responses.sqlite3")
+DEFAULT_TTL = 30 * 24 * 60 * 60   # 30일
+DEFAULT_MAX_ENTRIES = 20000
+
+def cache_key(payload):
+    """
+    요청의 (모델, 프롬프트 해시, 옵션)으로 만든 캐시 키 (stream 여부 등 결과와 무관한 값은 제외)
+
+    이어서 생성하는 요청이면 앞 대화(context)도 키에 포함합니다.
+    """
+    prompt_hash = hashlib.sha256(payload['prompt'].encode('utf-8')).hexdigest()
+    key = {'model': payload['model'], 'prompt': prompt_hash, 'options': payload.get('options', {})}
+    if payload.get('context'):
+        key['context'] = hashlib.sha256(json.dumps(payload['context']).encode('utf-8')).hexdigest()
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """
+    Ollama 응답을 SQLite 파일(.cache/llm/responses.sqlite3)에 보관하는 캐시
+
+    저장한 지 ttl초가 지난 응답은 사용하지 않고 지웁니다. 응답이 max_entries개를 넘으면
+    가장 오래전에 사용한 것부터 지웁니다 (LRU). hits/misses는 이번 실행의 조회 결과입니다.
+    여러 스레드에서 같이 사용할 수 있습니다. clock은 현재 시각(초)을 돌려주는 함수입니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def get(self, key):
+        """저장된 응답(dict), 없거나 만료되었으면 None"""
+        now = self.clock()
+        with self._lock, self._db:
+            row = self._db.execute("SELECT data, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, model, data):
+        now = self.clock()
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses (key, model, data, created_at, accessed_at) "
+                             "VALUES (?, ?, ?, ?, ?)", (key, model, json.dumps(data, ensure_ascii=False), now, now))
+            count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._db.execute("DELETE FROM responses WHERE key IN "
+                                 "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                                 (count - self.max_entries,))
+
+    def purge_expired(self):
+        """만료된 응답을 모두 지우고 지운 개수를 반환"""
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM responses WHERE created_at < ?", (self.clock() - self.ttl,)).rowcount
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,32 +1,100 @@
-import requests
-import json
+from collections import namedtuple
+
+from ollama_client import OllamaClient, DEFAULT_API_BASE
+from llm_cache import ResponseCache, cache_key
+
+# 생성 결과
+# context: 다음 요청에 넘기면 이 대화를 이어서 생성하는 Ollama 상태 (토큰 목록)
+# prompt_eval_count, eval_count: 이번 요청에서 새로 평가한 프롬프트 토큰 수, 생성한 토큰 수 (캐시 적중이면 0)
+Generation = namedtuple('Generation', ['text', 'context', 'prompt_eval_count', 'eval_count', 'cached'])
+
+# 캐시에 저장하는 응답 항목 (context는 이어서 요청할 응답에만 저장 - 토큰 목록이라 큼)
+CACHED_FIELDS = ("response", "done", "prompt_eval_count", "eval_count")
 
 class LLMHandler:
-    def __init__(self):
-        self.api_base = "http://localhost:11434/api"
+    def __init__(self, client=None, cache=None, bypass_cache=False):
+        self.api_base = DEFAULT_API_BASE
         self.model = "deepseek-coder:6.7b"
-        
-    def _generate(self, prompt):
-        """Ollama API를 사용하여 텍스트 생성"""
-        response = requests.post(
-            f"{self.api_base}/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,  # 더 정확한 결과를 위해 낮춤
-                    "top_p": 0.8,
-                    "top_k": 40,
-                    "num_ctx": 4096
-                }
+        # 모든 요청이 연결 풀과 동시 요청 한도를 공유
+        self.client = client or OllamaClient(self.api_base)
+        # 같은 모델, 프롬프트, 옵션의 응답은 캐시에서 가져옴
+        # bypass_cache면 캐시를 읽지 않고 새로 생성한 응답으로 캐시를 갱신
+        self.cache = cache if cache is not None else ResponseCache()
+        self.bypass_cache = bypass_cache
+
+    def _payload(self, prompt, context=None):
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,  # 응답을 조각 단위로 받아서 생성이 끝나는 즉시 다음 단계로 넘김
+            "options": {
+                "temperature": 0.1,  # 더 정확한 결과를 위해 낮춤
+                "top_p": 0.8,
+                "top_k": 40,
+                "num_ctx": 4096
             }
-        )
-        return response.json()["response"]
+        }
+        if context:
+            # 앞 요청의 프롬프트와 응답은 다시 평가하지 않고 이어서 생성
+            payload["context"] = context
+        return payload
+        
+    def _cached(self, payload, on_chunk):
+        if self.bypass_cache:
+            return None
+        data = self.cache.get(cache_key(payload))
+        if data is not None and on_chunk is not None:
+            on_chunk(data["response"])
+        return data
+
+    def _store(self, payload, data, keep_context):
+        # 끝까지 생성된 응답만 저장
+        if data.get("done", True) and data.get("response"):
+            fields = CACHED_FIELDS + ("context",) if keep_context else CACHED_FIELDS
+            self.cache.put(cache_key(payload), payload["model"],
+                           {name: data[name] for name in fields if name in data})
+        
+    @staticmethod
+    def _result(data, cached):
+        if cached:
+            return Generation(data["response"], data.get("context"), 0, 0, True)
+        return Generation(data["response"], data.get("context"), data.get("prompt_eval_count", 0),
+                          data.get("eval_count", 0), False)
+        
+    def _generate(self, prompt, on_chunk=None, context=None, keep_context=False):
+        """
+        Ollama API를 사용하여 텍스트 생성 (on_chunk를 넘기면 생성되는 조각마다 호출), Generation 반환
+
+        keep_context면 이 응답을 이어서 요청할 수 있도록 캐시에도 context를 저장합니다.
+        """
+        payload = self._payload(prompt, context)
+        data = self._cached(payload, on_chunk)
+        if data is not None:
+            return self._result(data, True)
+        data = self.client.generate(payload, on_chunk)
+        self._store(payload, data, keep_context)
+        return self._result(data, False)
+
+    async def _agenerate(self, prompt, on_chunk=None, context=None, keep_context=False):
+        """_generate의 asyncio 버전 (여러 곡을 동시에 처리할 때 사용)"""
+        payload = self._payload(prompt, context)
+        data = self._cached(payload, on_chunk)
+        if data is not None:
+            return self._result(data, True)
+        data = await self.client.agenerate(payload, on_chunk)
+        self._store(payload, data, keep_context)
+        return self._result(data, False)
         
     def generate_chord_progression(self, artist, title):
         """코드 진행 생성"""
-        prompt = f"""당신은 전문 기타리스트이자 음악 전문가입니다. 
+        return self._generate(self._chord_prompt(artist, title), keep_context=True).text
+
+    async def agenerate_chord_progression(self, artist, title, on_chunk=None):
+        """코드 진행 생성 (설명 요청에 넘길 context와 토큰 수를 담은 Generation 반환)"""
+        return await self._agenerate(self._chord_prompt(artist, title), on_chunk, keep_context=True)
+
+    def _chord_prompt(self, artist, title):
+        return f"""당신은 전문 기타리스트이자 음악 전문가입니다. 
 다음 곡의 실제 기타 코드와 가사를 정확하게 알려주세요.
 실제 곡의 정보만을 제공하고, 없는 정보는 제공하지 마세요.
 
@@ -61,11 +129,34 @@ Am             Em
 
 실제 곡의 코드와 가사 정보만을 제공해주세요."""
         
-        return self._generate(prompt)
-        
-    def generate_song_description(self, artist, title, chord_progression):
-        """곡 설명 생성"""
-        prompt = f"""당신은 음악 블로거이자 기타리스트입니다. 
+    def generate_song_description(self, artist, title, chord_progression, context=None):
+        """
+        곡 설명 생성
+
+        코드 진행을 생성한 요청의 context를 넘기면 코드 진행을 프롬프트에 다시 넣지 않고 그 대화를
+        이어서 요청하므로, 모델이 방금 생성한 코드 진행을 다시 평가하지 않습니다.
+        이 경우 코드 진행 부분은 모델이 다시 쓰지 않고 생성된 설명 뒤에 그대로 붙입니다.
+        """
+        result = self._generate(self._description_prompt(artist, title, chord_progression, context),
+                                context=context)
+        return self._with_chords(result, chord_progression, context).text
+
+    async def agenerate_song_description(self, artist, title, chord_progression, context=None, on_chunk=None):
+        """generate_song_description의 asyncio 버전 (토큰 수를 담은 Generation 반환)"""
+        result = await self._agenerate(self._description_prompt(artist, title, chord_progression, context),
+                                       on_chunk, context)
+        return self._with_chords(result, chord_progression, context)
+
+    @staticmethod
+    def _with_chords(result, chord_progression, context):
+        if not context:
+            return result
+        return result._replace(text=f"{result.text.rstrip()}\n\n📝 코드 진행\n{chord_progression}")
+
+    def _description_prompt(self, artist, title, chord_progression, context=None):
+        if context:
+            return self._followup_description_prompt(artist, title)
+        return f"""당신은 음악 블로거이자 기타리스트입니다. 
 다음 곡에 대한 실제 정보를 바탕으로 블로그 글을 작성해주세요.
 추측성 내용이나 불확실한 정보는 제외하고, 실제 사실만을 포함해주세요.
 
@@ -104,5 +195,47 @@ Am             Em
 - 친근한 어조 사용
 - 이모지 활용
 - 명확한 정보만 전달"""
-        
-        return self._generate(prompt) 
\ No newline at end of file
+
+    def _followup_description_prompt(self, artist, title):
+        # 코드 진행은 이미 대화(context)에 있으므로 다시 넣지 않음
+        return f"""이제 당신은 음악 블로거이자 기타리스트입니다.
+위에서 정리한 곡에 대한 실제 정보를 바탕으로 블로그 글을 작성해주세요.
+추측성 내용이나 불확실한 정보는 제외하고, 실제 사실만을 포함해주세요.
+
+아티스트: {artist}
+제목: {title}
+
+작성할 내용:
+
+🎸 안녕하세요!
+- 방문자 인사
+- 오늘 소개할 곡 간단 소개
+
+🎵 곡 정보
+- 발매 연도
+- 수록 앨범
+- 작사, 작곡가
+- 장르
+- 대중적 인기도
+
+✨ 연주 정보
+- 기본 연주 난이도
+- 위 코드 진행 중 주요 코드 진행
+- 주의할 부분
+- 초보자를 위한 팁
+
+💝 마무리
+- 곡의 특징 요약
+- 응원 메시지
+
+주의사항:
+- 실제 사실만 포함
+- 한글로 작성
+- 친근한 어조 사용
+- 이모지 활용
+- 명확한 정보만 전달
+- 코드 진행 전체는 다시 쓰지 않음 (글 뒤에 따로 붙입니다)"""
+
+    def close(self):
+        self.client.close()
+        self.cache.close()
@@ -1,65 +1,82 @@
 import os
+import sys
+import argparse
 import schedule
 import time
+import asyncio
 from datetime import datetime
+
+# 프로젝트 루트의 공용 모듈(font_registry 등)을 불러오기 위해 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from llm_handler import LLMHandler
 from chord_generator import ChordGenerator
 from text_generator import TextGenerator
+from pipeline import SongPipeline, print_summary
+from job_store import JobStore
+
+def read_songs(input_file):
+    with open(input_file, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
 
-def process_song():
-    """곡 처리 메인 함수"""
+def process_song(bypass_cache=False):
+    """곡 처리 메인 함수 (bypass_cache면 캐시된 응답을 쓰지 않고 모두 새로 생성)"""
     input_file = "data/input/song_list.txt"
     
     if not os.path.exists(input_file):
         print(f"입력 파일이 없습니다: {input_file}")
         return
         
-    with open(input_file, 'r', encoding='utf-8') as f:
-        songs = f.readlines()
+    songs = read_songs(input_file)
+
+    # 끝난 곡과 재시도를 기다리는 곡은 건너뛰고, 중단된 곡은 끝난 단계 다음부터 이어서 처리
+    store = JobStore()
+    store.sync(songs)
+    jobs = store.runnable(songs)
+    print(f"전체 {len(songs)}곡 중 처리할 곡 {len(jobs)}곡")
+    if not jobs:
+        store.close()
+        return
     
-    llm = LLMHandler()
+    llm = LLMHandler(bypass_cache=bypass_cache)
     chord_gen = ChordGenerator()
     text_gen = TextGenerator()
-    
-    for song in songs:
-        song = song.strip()
-        if not song:
-            continue
-            
-        try:
-            artist, title = song.split(' - ')
-            
-            # 파일명 형식 생성
-            file_name = f"{artist} - {title} 기타 코드 피아노 악보 가사"
-            
-            # 코드 진행 생성
-            chord_progression = llm.generate_chord_progression(artist, title)
-            
-            # 이미지 생성
-            image_path = f"data/output/images/{file_name}.png"
-            chord_gen.create_chord_image(chord_progression, image_path)
-            
-            # 설명문 생성
-            description = llm.generate_song_description(artist, title, chord_progression)
-            text_path = f"data/output/descriptions/{file_name}.txt"
-            text_gen.save_description(description, text_path)
-            
-            print(f"처리 완료: {artist} - {title}")
-            
-        except Exception as e:
-            print(f"에러 발생 ({artist} - {title}): {str(e)}")
-        
-        time.sleep(5)  # API 호출 간 딜레이
+
+    start = time.perf_counter()
+    try:
+        tasks = asyncio.run(SongPipeline(llm, chord_gen, text_gen, store=store).run(jobs))
+        print_summary(tasks, time.perf_counter() - start)
+        counts = store.counts()
+        print("작업 상태: " + ", ".join(f"{status} {count}" for status, count in counts.items()))
+        stats = llm.client.stats
+        cache = llm.cache.stats()
+        print(f"Ollama 요청 {stats['requests']}회, 재시도 {stats['retries']}회, 동시 요청 한도 {llm.client.limiter.limit}")
+        print(f"응답 캐시: 적중 {cache['hits']}회, 실패 {cache['misses']}회 (저장된 응답 {cache['entries']}개)")
+    finally:
+        llm.close()
+        store.close()
+
+def run_scheduled(bypass_cache=False):
+    """스케줄러에서 실행 - 한 번 실패해도 (예: 작업 저장소가 잠김) 다음 실행은 계속되도록 오류만 출력"""
+    try:
+        process_song(bypass_cache)
+    except Exception as e:
+        print(f"곡 처리 중 오류 발생: {e}")
 
 def main():
     """메인 스케줄러 함수"""
+    parser = argparse.ArgumentParser(description="곡 목록의 코드 악보 이미지와 설명문을 매일 생성합니다.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="캐시된 LLM 응답을 쓰지 않고 모두 새로 생성 (새 응답은 캐시에 저장됨)")
+    args = parser.parse_args()
+
     print("GenChord 시작...")
     
     # 매일 오전 9시에 실행
-    schedule.every().day.at("09:00").do(process_song)
+    schedule.every().day.at("09:00").do(run_scheduled, args.no_cache)
     
     # 시작 시 한 번 실행
-    process_song()
+    run_scheduled(args.no_cache)
     
     while True:
         schedule.run_pending()
@@ -0,0 +1,213 @@
+import json
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_API_BASE = "http://localhost:11434/api"
+
+# (연결, 응답) 제한 시간 - 스트리밍 요청은 조각 사이의 최대 간격,
+# 스트리밍하지 않는 요청은 전체 생성 시간이라 긴 악보는 몇 분 걸릴 수 있음
+DEFAULT_TIMEOUT = (5, 300)
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0   # 재시도 대기 시간 (초, 시도마다 두 배)
+BACKOFF_MAX = 30.0
+
+# 잠시 후 다시 보내면 성공할 수 있는 응답
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Ollama 안에서 순서를 기다린 시간이 이보다 길면 동시에 너무 많이 보내고 있는 것
+QUEUE_TARGET = 1.0
+
+class OllamaError(Exception):
+    pass
+
+def backoff_delay(attempt, retry_after=None):
+    """attempt번째 재시도 전에 기다릴 시간 (full jitter, Retry-After가 있으면 그 이상)"""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+def queue_delay(data, wall_seconds):
+    """
+    요청이 Ollama 안에서 처리되기를 기다린 시간 (초)
+
+    Ollama가 알려주는 처리 시간(total_duration, ns)을 실제로 걸린 시간에서 뺀 값입니다.
+    처리 시간을 알 수 없으면 None입니다.
+    """
+    total = data.get('total_duration') if isinstance(data, dict) else None
+    if not total:
+        return None
+    return max(0.0, wall_seconds - total / 1e9)
+
+def _read_stream(response, on_chunk=None):
+    # 줄 단위 JSON 조각을 이어 붙여서 stream=False 응답과 같은 모양으로 만듦
+    parts = []
+    last = {}
+    with response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                chunk = json.loads(line)
+            except ValueError as e:
+                # 잘리거나 깨진 조각은 연결이 끊긴 것과 같이 처음부터 다시 받음
+                raise requests.ConnectionError(f"응답 조각을 읽을 수 없습니다: {e}") from e
+            if 'error' in chunk:
+                raise OllamaError(f"Ollama 생성 오류: {chunk['error']}")
+            text = chunk.get('response', '')
+            if text:
+                parts.append(text)
+                if on_chunk is not None:
+                    on_chunk(text)
+            last = chunk
+    if not last.get('done'):
+        raise requests.ConnectionError("응답이 끝나기 전에 연결이 끊겼습니다")
+    return dict(last, response=''.join(parts))
+
+class AdaptiveLimiter:
+    """
+    Ollama에 동시에 보내는 요청 수를 관측한 지연 시간에 맞춰 조절 (AIMD)
+
+    한도 1에서 시작해서 요청이 한도만큼 제때 끝날 때마다 1씩 늘리고(max_limit까지),
+    요청이 Ollama 안에서 QUEUE_TARGET보다 오래 기다렸거나 과부하로 실패하면 절반으로 줄입니다.
+    고정된 sleep 대신 서버가 실제로 처리할 수 있는 만큼만 보내게 됩니다.
+    """
+
+    def __init__(self, max_limit, queue_target=QUEUE_TARGET):
+        self.max_limit = max(1, max_limit)
+        self.queue_target = queue_target
+        self.limit = 1
+        self.in_flight = 0
+        self._on_time = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, delay=None, overloaded=False):
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded or (delay is not None and delay > self.queue_target):
+                self.limit = max(1, self.limit // 2)
+                self._on_time = 0
+            elif delay is not None:
+                self._on_time += 1
+                if self._on_time >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._on_time = 0
+            self._condition.notify_all()
+
+class OllamaClient:
+    """
+    연결을 재사용하는 Ollama API 클라이언트
+
+    하나의 requests.Session(keep-alive 연결 풀)을 모든 요청이 공유하고, 요청마다 제한 시간을 둡니다.
+    연결 실패, 시간 초과, 429/5xx 응답은 jitter를 준 지수 백오프로 max_retries번까지 다시 보냅니다.
+    동시에 보내는 요청 수는 AdaptiveLimiter가 max_concurrency 안에서 조절합니다.
+    asyncio 코드에서는 agenerate를 사용합니다 (전용 스레드 풀에서 실행).
+    payload의 stream이 True면 응답을 조각 단위로 받아서 on_chunk(텍스트 조각)를 호출하고,
+    다 받으면 합친 응답(마지막 조각의 통계 + 전체 response)을 반환합니다.
+    스트리밍 도중 끊겨서 다시 보내면 on_chunk도 처음부터 다시 호출됩니다.
+    """
+
+    def __init__(self, api_base=DEFAULT_API_BASE, max_concurrency=4, timeout=DEFAULT_TIMEOUT,
+                 max_retries=MAX_RETRIES):
+        self.api_base = api_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def generate(self, payload, on_chunk=None):
+        """/api/generate 요청을 보내고 응답 JSON을 반환"""
+        return self._post('generate', payload, on_chunk)
+
+    async def agenerate(self, payload, on_chunk=None):
+        """generate의 asyncio 버전 (on_chunk는 요청 스레드에서 호출됨)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.generate, payload, on_chunk)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='ollama')
+            return self._executor
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _post(self, endpoint, payload, on_chunk=None):
+        url = f"{self.api_base}/{endpoint}"
+        stream = payload.get('stream', True)
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            delay = None
+            overloaded = True
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                self._count('requests')
+                response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = _retry_after(response)
+                    error = OllamaError(f"Ollama 응답 오류 {response.status_code}: {response.text[:200]}")
+                else:
+                    overloaded = False
+                    if not response.ok:
+                        # 모델이 없는 등 다시 보내도 소용없는 오류
+                        raise OllamaError(f"Ollama 응답 오류 {response.status_code}: {response.text[:200]}")
+                    data = _read_stream(response, on_chunk) if stream else response.json()
+                    delay = queue_delay(data, time.perf_counter() - start)
+                    return data
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # 스트리밍 도중 끊겨도 처음부터 다시 받음
+                error = e
+            finally:
+                self.limiter.release(delay, overloaded)
+
+            if attempt == self.max_retries:
+                self._count('failures')
+                raise OllamaError(f"Ollama 요청이 {attempt + 1}번 모두 실패했습니다: {error}") from error
+            self._count('retries')
+            wait = backoff_delay(attempt, retry_after)
+            print(f"Ollama 요청 실패, {wait:.1f}초 후 다시 시도합니다 ({attempt + 1}/{self.max_retries}): {error}")
+            time.sleep(wait)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
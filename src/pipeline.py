@@ -0,0 +1,280 @@
+import os
+import time
+import asyncio
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from job_store import GENERATING, RENDERED, DESCRIBED
+
+# 단계 사이 대기열 크기 (앞 단계가 너무 앞서 나가서 결과가 메모리에 쌓이지 않도록)
+QUEUE_SIZE = 4
+
+OUTPUT_DIR = "data/output"
+
+_DONE = object()  # 작업자 종료 신호
+
+def _exists(path):
+    return bool(path) and os.path.exists(path)
+
+def _write_text(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def _read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+class SongTask:
+    """곡 하나의 진행 상황, 결과 파일 경로, 단계별 소요 시간(초) - 작업 기록(Job)에서 이어서 시작"""
+
+    def __init__(self, job):
+        self.song = job.song
+        self.artist = job.artist
+        self.title = job.title
+        self.file_name = f"{job.artist} - {job.title} 기타 코드 피아노 악보 가사"
+        self.chord_progression = None
+        self.context = None   # 코드 진행 요청의 Ollama context (설명 요청에서 이어서 생성)
+        self.description = None
+        self.chord_path = job.chord_path
+        self.image_path = job.image_path
+        self.description_path = job.description_path
+        self.error = None
+        self.timings = dict(job.timings)
+        # 요청별로 새로 평가한 프롬프트 토큰 수 (context: 설명 요청에서 다시 평가하지 않은 대화 토큰 수)
+        self.tokens = dict(job.tokens)
+        self.started = None   # 코드 진행 생성을 시작한 시각
+        self.finished = None
+        self._branches = 2  # 이미지, 설명문
+
+    @property
+    def seconds(self):
+        return None if self.finished is None else self.finished - self.started
+
+    @property
+    def status(self):
+        if _exists(self.image_path):
+            return DESCRIBED if _exists(self.description_path) else RENDERED
+        return GENERATING
+
+@contextmanager
+def _timed(task, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        task.timings[stage] = time.perf_counter() - start
+
+class SongPipeline:
+    """
+    곡 목록을 단계별 작업자로 나눠 처리하는 파이프라인
+
+        코드 진행 생성(LLM) ─┬─> 이미지 렌더링 ─────────────────> 완료
+                             └─> 설명 생성(LLM) ─> 설명 저장 ───> 완료
+
+    단계 사이는 크기가 제한된 asyncio.Queue로 연결됩니다. 한 곡의 이미지를 그리는 동안 다음 곡의
+    코드 진행을 생성하고, 코드 진행이 다 생성되면 렌더링을 기다리지 않고 바로 설명 요청을 보냅니다.
+    LLM 단계의 동시 요청 수는 OllamaClient가 조절하고, 렌더링은 폰트 객체를 공유하므로
+    전용 스레드 하나에서 차례로 실행합니다.
+
+    store(JobStore)를 넘기면 단계가 끝날 때마다 결과 파일 경로와 상태를 기록하고,
+    이미 결과 파일이 있는 단계(코드 진행 텍스트, 이미지, 설명문)는 건너뜁니다.
+    """
+
+    def __init__(self, llm, chord_gen, text_gen, generators=None, queue_size=QUEUE_SIZE, output_dir=OUTPUT_DIR,
+                 store=None):
+        self.llm = llm
+        self.chord_gen = chord_gen
+        self.text_gen = text_gen
+        self.generators = generators or llm.client.max_concurrency
+        self.queue_size = queue_size
+        self.output_dir = output_dir
+        self.store = store
+
+    async def run(self, jobs):
+        """작업 기록(Job) 목록을 처리하고 SongTask 목록을 입력 순서대로 반환"""
+        tasks = [SongTask(job) for job in jobs]
+        inbox = asyncio.Queue(self.queue_size)
+        render_queue = asyncio.Queue(self.queue_size)
+        describe_queue = asyncio.Queue(self.queue_size)
+        save_queue = asyncio.Queue(self.queue_size)
+        render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='render')
+
+        try:
+            generators = [asyncio.create_task(self._generate_chords(inbox, render_queue, describe_queue))
+                          for _ in range(self.generators)]
+            describers = [asyncio.create_task(self._describe(describe_queue, save_queue))
+                          for _ in range(self.generators)]
+            renderer = asyncio.create_task(self._render(render_queue, render_executor))
+            saver = asyncio.create_task(self._save(save_queue))
+            workers = [*generators, *describers, renderer, saver]
+            feeder = asyncio.create_task(self._feed(tasks, inbox, render_queue, describe_queue, save_queue,
+                                                    generators, describers, renderer, saver))
+
+            # 작업자가 예외로 끝나면 앞 단계가 그 대기열에 넣지 못하고 계속 기다리게 되므로
+            # 나머지를 모두 취소하고 그 예외를 전달
+            done, _ = await asyncio.wait([feeder, *workers], return_when=asyncio.FIRST_EXCEPTION)
+            failed = [worker for worker in done if not worker.cancelled() and worker.exception() is not None]
+            if failed:
+                for worker in (feeder, *workers):
+                    worker.cancel()
+                await asyncio.gather(feeder, *workers, return_exceptions=True)
+                raise failed[0].exception()
+        finally:
+            render_executor.shutdown()
+        return tasks
+
+    async def _feed(self, tasks, inbox, render_queue, describe_queue, save_queue,
+                    generators, describers, renderer, saver):
+        # 곡을 넣고, 앞 단계가 모두 끝나면 다음 단계 작업자들에게 종료 신호를 보냄
+        for task in tasks:
+            await inbox.put(task)
+        for _ in generators:
+            await inbox.put(_DONE)
+        await asyncio.gather(*generators)
+
+        await render_queue.put(_DONE)
+        for _ in describers:
+            await describe_queue.put(_DONE)
+        await asyncio.gather(renderer, *describers)
+
+        await save_queue.put(_DONE)
+        await saver
+
+    def _fail(self, task, error):
+        first = task.error is None
+        if first:
+            task.error = str(error)
+            print(f"에러 발생 ({task.song}): {task.error}")
+        # 기록하지 못해도 (예: 다른 실행이 작업 저장소를 잠근 경우) 작업자는 다음 곡을 계속 처리
+        try:
+            if first and self.store is not None:
+                self.store.fail(task.song, task.error)
+            self._checkpoint(task)
+        except Exception as e:
+            print(f"작업 기록 실패 ({task.song}): {e}")
+
+    def _checkpoint(self, task):
+        # 끝난 단계의 결과를 기록 (실패한 곡은 상태를 failed로 남겨 둠)
+        if self.store is None:
+            return
+        fields = {'chord_path': task.chord_path, 'image_path': task.image_path,
+                  'description_path': task.description_path, 'timings': task.timings, 'tokens': task.tokens}
+        if task.error is None:
+            fields['status'] = task.status
+        self.store.update(task.song, **fields)
+
+    def _finish_branch(self, task):
+        task._branches -= 1
+        if task._branches == 0:
+            task.finished = time.perf_counter()
+            task.context = None
+            if task.error is None:
+                print(f"처리 완료: {task.artist} - {task.title} ({task.seconds:.1f}초, "
+                      f"프롬프트 토큰: 코드 {task.tokens.get('chords', 0)}, 설명 {task.tokens.get('description', 0)})")
+
+    async def _generate_chords(self, inbox, render_queue, describe_queue):
+        loop = asyncio.get_running_loop()
+        while (task := await inbox.get()) is not _DONE:
+            task.started = time.perf_counter()
+            try:
+                if self.store is not None:
+                    self.store.start(task.song)
+                if _exists(task.chord_path):
+                    # 지난 실행에서 생성해 둔 코드 진행을 그대로 사용
+                    task.chord_progression = await loop.run_in_executor(None, _read_text, task.chord_path)
+                else:
+                    with _timed(task, 'chords'):
+                        result = await self.llm.agenerate_chord_progression(task.artist, task.title)
+                    task.chord_progression = result.text
+                    task.context = result.context
+                    task.tokens['chords'] = result.prompt_eval_count
+                    chord_path = os.path.join(self.output_dir, "chords", f"{task.file_name}.txt")
+                    await loop.run_in_executor(None, _write_text, chord_path, task.chord_progression)
+                    task.chord_path = chord_path
+                    self._checkpoint(task)
+            except Exception as e:
+                task._branches = 1
+                self._fail(task, e)
+                self._finish_branch(task)
+                continue
+
+            # 이미 결과 파일이 있는 단계는 건너뜀
+            puts = []
+            if _exists(task.image_path):
+                self._finish_branch(task)
+            else:
+                puts.append(render_queue.put(task))
+            if _exists(task.description_path):
+                self._finish_branch(task)
+            else:
+                puts.append(describe_queue.put(task))
+            # 렌더링이 밀려서 렌더링 대기열이 차 있어도 설명 요청은 기다리지 않도록 두 대기열에 동시에 넣음
+            await asyncio.gather(*puts)
+
+    async def _render(self, render_queue, executor):
+        loop = asyncio.get_running_loop()
+        while (task := await render_queue.get()) is not _DONE:
+            image_path = os.path.join(self.output_dir, "images", f"{task.file_name}.png")
+            try:
+                with _timed(task, 'render'):
+                    image_files = await loop.run_in_executor(executor, self.chord_gen.create_chord_image,
+                                                             task.chord_progression, image_path)
+                if not image_files:
+                    raise ValueError("코드 진행에 그릴 내용이 없습니다")
+                # 여러 페이지면 첫 페이지 경로를 기록 (확장자는 인코더 프로필에 따라 다를 수 있음)
+                task.image_path = image_files[0]
+                self._checkpoint(task)
+            except Exception as e:
+                self._fail(task, e)
+            self._finish_branch(task)
+
+    async def _describe(self, describe_queue, save_queue):
+        while (task := await describe_queue.get()) is not _DONE:
+            try:
+                with _timed(task, 'description'):
+                    # 코드 진행을 방금 생성했으면 그 대화를 이어서 요청 (지난 실행의 코드 진행이면 전체 프롬프트)
+                    result = await self.llm.agenerate_song_description(
+                        task.artist, task.title, task.chord_progression, task.context)
+                task.description = result.text
+                task.tokens['description'] = result.prompt_eval_count
+                task.tokens['context'] = len(task.context or [])
+                task.context = None
+            except Exception as e:
+                self._fail(task, e)
+                self._finish_branch(task)
+                continue
+            await save_queue.put(task)
+
+    async def _save(self, save_queue):
+        loop = asyncio.get_running_loop()
+        while (task := await save_queue.get()) is not _DONE:
+            text_path = os.path.join(self.output_dir, "descriptions", f"{task.file_name}.txt")
+            try:
+                with _timed(task, 'save'):
+                    await loop.run_in_executor(None, self.text_gen.save_description, task.description, text_path)
+                task.description_path = text_path
+                self._checkpoint(task)
+            except Exception as e:
+                self._fail(task, e)
+            self._finish_branch(task)
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+def print_summary(tasks, seconds):
+    """처리 결과와 곡별 지연 시간, 단계별 평균 시간, LLM 프롬프트 토큰 수를 출력"""
+    done = [task for task in tasks if task.error is None]
+    print(f"{len(tasks)}곡 중 {len(done)}곡 처리 완료, 실패 {len(tasks) - len(done)}곡 (전체 {seconds:.1f}초)")
+    if not done:
+        return
+    latencies = [task.seconds for task in done]
+    print(f"곡별 소요 시간: p50 {_percentile(latencies, 50):.1f}초, p95 {_percentile(latencies, 95):.1f}초")
+    for stage in ('chords', 'render', 'description', 'save'):
+        times = [task.timings[stage] for task in done if stage in task.timings]
+        if times:
+            print(f"  {stage:<12} 평균 {sum(times) / len(times):.2f}초")
+    totals = {name: sum(task.tokens.get(name, 0) for task in done) for name in ('chords', 'description', 'context')}
+    print(f"프롬프트 토큰: 코드 진행 {totals['chords']}, 설명 {totals['description']} "
+          f"(context 재사용으로 다시 평가하지 않은 토큰 {totals['context']})")
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+from benchmark import git_commit, percentile
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MODULE = 'text_to_image_gui'
+
+# 창이 뜨기 전에 import되면 안 되는 모듈 (WarmUpWorker가 창이 뜬 뒤 불러옴)
+DEFERRED_MODULES = ['PIL', 'convert_text_to_image', 'batch_converter', 'numpy']
+
+def parse_importtime(output):
+    """python -X importtime 출력을 [(모듈, 자체 us, 누적 us, 깊이), ...]로 변환"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 머리글 줄
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+def _run_once(module):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{module}을(를) import할 수 없습니다: {result.stderr.strip().splitlines()[-1]}")
+    return wall, parse_importtime(result.stderr)
+
+def measure(module=DEFAULT_MODULE, runs=5, top=15):
+    """
+    새 인터프리터에서 module을 runs번 import해서 시간을 측정
+
+    wall은 인터프리터 시작을 포함한 전체 시간, import는 module 자체의 누적 import 시간입니다.
+    첫 실행은 .pyc 생성이 섞이므로 버립니다.
+    """
+    _run_once(module)
+    samples = [_run_once(module) for _ in range(runs)]
+
+    import_times = []
+    for _, entries in samples:
+        total = [cumulative for name, _, cumulative, depth in entries if name == module and depth == 0]
+        import_times.append(total[-1] / 1000 if total else None)
+
+    # 중앙값에 해당하는 실행에서 자체 시간이 큰 모듈
+    walls = [wall for wall, _ in samples]
+    median_entries = samples[walls.index(percentile(walls, 50))][1]
+    slowest = sorted(median_entries, key=lambda entry: entry[1], reverse=True)[:top]
+    imported = {name for name, _, _, _ in median_entries}
+
+    return {
+        'module': module,
+        'runs': runs,
+        'wall_ms': round(percentile(walls, 50) * 1000, 1),
+        'import_ms': round(percentile([t for t in import_times if t is not None], 50) or 0, 1),
+        'modules': len(median_entries),
+        'slowest': [{'module': name, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cumulative / 1000, 2)}
+                    for name, self_us, cumulative, _ in slowest],
+        'imported': sorted(imported),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI(또는 다른 모듈)를 import하는 데 걸리는 시간을 측정합니다.")
+    parser.add_argument("module", nargs='?', default=DEFAULT_MODULE, help="측정할 모듈 (기본값: text_to_image_gui)")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="표시할 느린 모듈 수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="import 시간이 이 값을 넘으면 실패 (종료 코드 1)")
+    parser.add_argument("--deferred", nargs='*', default=DEFERRED_MODULES,
+                        help="시작할 때 import되면 실패로 처리할 모듈 (기본값: PIL, 렌더러 모듈)")
+    parser.add_argument("-o", "--output", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    try:
+        result = measure(args.module, args.runs, args.top)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"{args.module}: import {result['import_ms']} ms, 인터프리터 포함 {result['wall_ms']} ms "
+          f"(모듈 {result['modules']}개, {args.runs}회 중앙값)")
+    print(f"\n{'모듈':<40}{'자체(ms)':>10}{'누적(ms)':>10}")
+    for entry in result['slowest']:
+        print(f"{entry['module']:<40}{entry['self_ms']:>10}{entry['cumulative_ms']:>10}")
+
+    failed = False
+    early = [name for name in args.deferred if name != args.module and name in result['imported']]
+    if early:
+        print(f"\n시작할 때 import되면 안 되는 모듈이 import되었습니다: {', '.join(early)}")
+        failed = True
+    if args.budget_ms is not None and result['import_ms'] > args.budget_ms:
+        print(f"\nimport 시간이 예산({args.budget_ms} ms)을 넘었습니다.")
+        failed = True
+
+    if args.output:
+        report = {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'result': result,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과가 저장되었습니다: {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
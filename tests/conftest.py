@@ -0,0 +1,64 @@
+import os
+import sys
+import struct
+
+import pytest
+
+# 저장소 루트의 모듈과 src/ 의 악보 생성 도구를 모두 import할 수 있도록 경로 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'src')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class FontBuilder:
+    """테스트용 최소한의 TTF 파일을 만드는 도구 (directory에 저장)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def format4(segments):
+        # segments: [(시작, 끝, delta)], 마지막 0xFFFF 구간은 자동으로 추가
+        segments = list(segments) + [(0xFFFF, 0xFFFF, 1)]
+        count = len(segments)
+        data = struct.pack(f'>{count}H', *[end for _, end, _ in segments]) + b'\0\0'
+        data += struct.pack(f'>{count}H', *[start for start, _, _ in segments])
+        data += struct.pack(f'>{count}h', *[delta for _, _, delta in segments])
+        data += struct.pack(f'>{count}H', *[0] * count)
+        return struct.pack('>HHHHHHH', 4, 14 + len(data), 0, 2 * count, 0, 0, 0) + data
+
+    @staticmethod
+    def cmap(subtable):
+        return struct.pack('>HHHHI', 0, 1, 3, 1, 12) + subtable
+
+    @staticmethod
+    def name_table(family, style):
+        strings = [(1, family.encode('utf-16-be')), (2, style.encode('utf-16-be'))]
+        records = b''
+        data = b''
+        for name_id, text in strings:
+            records += struct.pack('>HHHHHH', 3, 1, 0x409, name_id, len(text), len(data))
+            data += text
+        return struct.pack('>HHH', 0, len(strings), 6 + len(records)) + records + data
+
+    @staticmethod
+    def font(tables):
+        # tables: {태그: 데이터} → TTF 파일 바이트
+        offset = 12 + 16 * len(tables)
+        directory = b''
+        body = b''
+        for tag, data in tables.items():
+            directory += struct.pack('>4sIII', tag.encode('latin-1'), 0, offset + len(body), len(data))
+            body += data
+        return struct.pack('>IHHHH', 0x00010000, len(tables), 0, 0, 0) + directory + body
+
+    def write(self, tables, name='font.ttf'):
+        path = self.directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.font(tables))
+        return str(path)
+
+@pytest.fixture
+def font_builder(tmp_path):
+    return FontBuilder(tmp_path)
@@ -0,0 +1,30 @@
+import os
+import threading
+
+from batch_converter import convert_batch
+
+def test_cancel_leaves_unstarted_files_in_input(tmp_path):
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    input_dir.mkdir()
+    output_dir.mkdir()
+    files = []
+    for i in range(12):
+        path = input_dir / f's{i:02d}.txt'
+        path.write_text(f'[Verse]\nAm  G\n가사 {i}\n' * 20, encoding='utf-8')
+        files.append(str(path))
+
+    cancel_event = threading.Event()
+    results = []
+    for result in convert_batch(files, str(output_dir), jobs=2, use_manifest=False, cancel_event=cancel_event):
+        results.append(result)
+        cancel_event.set()
+
+    converted = {result.input_file for result in results}
+    assert all(result.error is None for result in results)
+    # 첫 결과 때 대기 중이던 jobs * 4개 중 아직 시작하지 않은 작업은 변환하지 않음
+    assert len(converted) < 2 * 4
+    # 결과를 받은 파일만 이동하고, 취소된 파일은 입력 폴더에 그대로 남음
+    for path in files:
+        assert os.path.exists(path) == (path not in converted)
+        assert os.path.exists(output_dir / os.path.basename(path)) == (path in converted)
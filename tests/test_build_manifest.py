@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from build_manifest import BuildManifest, file_hash, settings_hash, MANIFEST_NAME
+from batch_converter import convert_batch
+
+SHEET = '[Verse]\nAm  G\n사랑해\n'
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def run(files, output_dir, **kwargs):
+    return list(convert_batch(files, output_dir, jobs=1, **kwargs))
+
+@pytest.fixture
+def dirs(tmp_path):
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    input_dir.mkdir()
+    output_dir.mkdir()
+    return str(input_dir), str(output_dir)
+
+def test_is_current(tmp_path):
+    output = tmp_path / 'a.png'
+    output.write_bytes(b'png')
+    manifest = BuildManifest(str(tmp_path / MANIFEST_NAME))
+    manifest.record('a.txt', 'content', 'settings', str(output))
+    manifest.save()
+
+    manifest = BuildManifest(str(tmp_path / MANIFEST_NAME))
+    assert manifest.is_current('a.txt', 'content', 'settings')
+    assert not manifest.is_current('a.txt', 'changed', 'settings')
+    assert not manifest.is_current('a.txt', 'content', 'changed')
+    assert not manifest.is_current('b.txt', 'content', 'settings')
+    output.unlink()
+    assert not manifest.is_current('a.txt', 'content', 'settings')
+
+def test_hashes(tmp_path):
+    path = tmp_path / 'a.txt'
+    path.write_bytes(SHEET.encode('utf-8'))
+    first = file_hash(str(path))
+    path.write_bytes(SHEET.encode('utf-8') + b'C\n')
+    assert file_hash(str(path)) != first
+    assert settings_hash({'a': 1, 'b': 2}) == settings_hash({'b': 2, 'a': 1})
+
+def test_unchanged_file_is_skipped_and_moved(dirs):
+    input_dir, output_dir = dirs
+    path = os.path.join(input_dir, 'a.txt')
+    write(path, SHEET)
+    [first] = run([path], output_dir)
+    assert not first.error and not first.skipped
+    mtime = os.path.getmtime(first.image_file)
+
+    write(path, SHEET)
+    [second] = run([path], output_dir)
+    assert second.skipped and second.error is None
+    assert os.path.abspath(second.image_file) == os.path.abspath(first.image_file)
+    assert os.path.getmtime(first.image_file) == mtime
+    # 건너뛴 파일도 변환한 파일처럼 입력 폴더에서 output 폴더로 이동
+    assert not os.path.exists(path)
+    assert os.path.exists(os.path.join(output_dir, 'a.txt'))
+
+def test_changed_file_is_converted(dirs):
+    input_dir, output_dir = dirs
+    path = os.path.join(input_dir, 'a.txt')
+    write(path, SHEET)
+    run([path], output_dir)
+
+    write(path, SHEET + 'C  G\n')
+    [result] = run([path], output_dir)
+    assert not result.skipped and result.error is None
+
+def test_force_converts_unchanged_file(dirs):
+    input_dir, output_dir = dirs
+    path = os.path.join(input_dir, 'a.txt')
+    write(path, SHEET)
+    run([path], output_dir)
+
+    write(path, SHEET)
+    [result] = run([path], output_dir, force=True)
+    assert not result.skipped and result.error is None
+
+def test_manifest_is_keyed_by_file_name(dirs, tmp_path):
+    input_dir, output_dir = dirs
+    write(os.path.join(input_dir, 'a.txt'), SHEET)
+    run([os.path.join(input_dir, 'a.txt')], output_dir)
+
+    # 다른 폴더에서 온 같은 이름, 같은 내용의 파일은 같은 항목으로 보고 건너뜀
+    other = str(tmp_path / 'other' / 'a.txt')
+    write(other, SHEET)
+    [result] = run([other], output_dir)
+    assert result.skipped
+
+    # 이름이 다르면 내용이 같아도 새로 변환
+    renamed = str(tmp_path / 'other' / 'b.txt')
+    write(renamed, SHEET)
+    [result] = run([renamed], output_dir)
+    assert not result.skipped and result.error is None
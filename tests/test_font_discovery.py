@@ -0,0 +1,24 @@
+from font_discovery import FontIndex
+
+def test_malformed_fonts_are_skipped(tmp_path, font_builder, capsys):
+    fonts = tmp_path / 'fonts'
+    fonts.mkdir()
+    font_builder.write({'name': font_builder.name_table('Test Sans', 'Bold'),
+                        'cmap': font_builder.cmap(font_builder.format4([(0xAC00, 0xD7A3, 1)]))}, 'fonts/good.ttf')
+    font_builder.write({'name': b'\0\0\0\5\0\0', 'cmap': b'\0\0\0\1'}, 'fonts/bad_name.ttf')
+    (fonts / 'short.ttf').write_bytes(b'\0\1\0\0\0')
+    (fonts / 'bad.ttc').write_bytes(b'ttcf\0\1\0\0\0\0\0\5')
+
+    index = FontIndex(font_dirs=[str(fonts)], index_path=str(tmp_path / 'index.json'))
+    faces = index.faces()
+
+    assert [(face.family, face.style) for face in faces] == [('Test Sans', 'Bold')]
+    assert faces[0].coverage['ko'] == 1.0
+    assert index.find('ko').family == 'Test Sans'
+    output = capsys.readouterr().out
+    for name in ('bad_name.ttf', 'short.ttf', 'bad.ttc'):
+        assert name in output
+
+    # 읽을 수 없는 파일도 색인에 기록되어 다음 실행에서 다시 읽지 않음
+    assert FontIndex(font_dirs=[str(fonts)], index_path=str(tmp_path / 'index.json')).faces() == faces
+    assert capsys.readouterr().out == ''
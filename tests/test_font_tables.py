@@ -0,0 +1,45 @@
+import struct
+
+import pytest
+
+from font_tables import read_cmap_ranges, read_faces, FontFormatError
+from font_coverage import CoverageIndex
+
+# 손상된 cmap 테이블 (FontBuilder → 테이블 바이트)
+CORRUPT_CMAPS = {
+    'truncated_header': lambda fonts: b'\0\0\0\1',                               # 서브테이블 목록이 잘림
+    'offset_outside': lambda fonts: struct.pack('>HHHHI', 0, 1, 3, 1, 4000),     # 서브테이블 위치가 테이블 밖
+    'truncated_format4': lambda fonts: fonts.cmap(fonts.format4([(0x41, 0x5A, 1)]))[:24],  # format 4 배열이 잘림
+    'format12_groups': lambda fonts: fonts.cmap(struct.pack('>HHIII', 12, 0, 1000, 0, 1000)),  # 그룹 수가 실제보다 많음
+}
+
+def test_format4_ranges(font_builder):
+    path = font_builder.write({'cmap': font_builder.cmap(font_builder.format4([(0x41, 0x5A, 1),
+                                                                                (0xAC00, 0xAC10, 100)]))})
+    assert read_cmap_ranges(path) == [(0x41, 0x5A), (0xAC00, 0xAC10)]
+
+@pytest.mark.parametrize('case', sorted(CORRUPT_CMAPS))
+def test_corrupt_cmap_raises_font_format_error(font_builder, case):
+    path = font_builder.write({'cmap': CORRUPT_CMAPS[case](font_builder)})
+    with pytest.raises(FontFormatError):
+        read_cmap_ranges(path)
+
+def test_corrupt_cmap_has_no_coverage(font_builder, tmp_path):
+    path = font_builder.write({'cmap': b'\0\0\0\1'})
+
+    class Font:
+        pass
+    bad = Font()
+    bad.path = path
+    index = CoverageIndex(cache_path=str(tmp_path / 'coverage.json'))
+    assert index.coverage(bad) is None
+
+def test_read_faces_with_corrupt_tables(font_builder):
+    # cmap이 손상되면 ranges만 비우고, name 테이블이 손상되면 FontFormatError
+    path = font_builder.write({'cmap': b'\0\0\0\1'})
+    [face] = read_faces(path)
+    assert face.ranges == [] and face.style == 'Regular' and face.weight == 400
+
+    path = font_builder.write({'name': b'\0\0\0\5\0\0', 'cmap': b'\0\0\0\1'}, 'name.ttf')
+    with pytest.raises(FontFormatError):
+        read_faces(path)
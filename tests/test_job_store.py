@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+import job_store
+from job_store import (JobStore, parse_song, retry_delay, PENDING, GENERATING, RENDERED, DESCRIBED, FAILED,
+                       MAX_ATTEMPTS, RETRY_BASE, RETRY_MAX)
+
+SONGS = ['IU - Song 0', 'IU - Song 1', 'IU - Song 2']
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    store.sync(SONGS)
+    yield store
+    store.close()
+
+def titles(jobs):
+    return [job.title for job in jobs]
+
+@pytest.mark.parametrize('line, parsed', [
+    ('IU - 좋은 날', ('IU', '좋은 날')),
+    ('  AC/DC  -  Back In Black ', ('AC/DC', 'Back In Black')),
+    ('AC - DC - Back - In Black', ('AC', 'DC - Back - In Black')),
+    ('bad line', None),
+    ('IU-좋은 날', None),
+    (' - 제목', None),
+    ('IU - ', None),
+])
+def test_parse_song(line, parsed):
+    assert parse_song(line) == parsed
+
+def test_retry_delay(monkeypatch):
+    monkeypatch.setattr(job_store.random, 'uniform', lambda low, high: high)
+    assert retry_delay(1) == RETRY_BASE
+    assert retry_delay(3) == RETRY_BASE * 4
+    assert retry_delay(100) == RETRY_MAX
+    monkeypatch.setattr(job_store.random, 'uniform', lambda low, high: low)
+    assert retry_delay(1) == RETRY_BASE / 2
+
+def test_sync_records_invalid_lines(store):
+    store.sync(SONGS + ['bad line'])
+    jobs = {job.song: job for job in store.jobs()}
+    assert jobs['bad line'].status == FAILED and jobs['bad line'].next_attempt_at is None
+    assert store.counts() == {PENDING: 3, GENERATING: 0, RENDERED: 0, DESCRIBED: 0, FAILED: 1}
+    # 형식이 잘못된 줄은 다시 시도하지 않음
+    assert titles(store.runnable(SONGS + ['bad line'], now=float('inf'))) == ['Song 0', 'Song 1', 'Song 2']
+
+def test_runnable_skips_described_and_keeps_order(store):
+    store.update('IU - Song 1', status=DESCRIBED)
+    store.update('IU - Song 2', status=RENDERED, image_path='song2.png', timings={'render': 0.5})
+    assert titles(store.runnable(list(reversed(SONGS)) + SONGS)) == ['Song 2', 'Song 0']
+    job = {job.song: job for job in store.jobs()}['IU - Song 2']
+    assert job.image_path == 'song2.png' and job.timings == {'render': 0.5}
+    # 목록에 없는 곡은 처리하지 않음
+    assert titles(store.runnable(['IU - Song 0', 'IU - Other'])) == ['Song 0']
+
+def test_failed_job_waits_for_next_attempt(store, monkeypatch):
+    monkeypatch.setattr(job_store.time, 'time', lambda: 1000.0)
+    store.start('IU - Song 0')
+    store.fail('IU - Song 0', 'boom')
+    job = store.jobs()[0]
+    assert job.status == FAILED and job.error == 'boom' and job.attempts == 1
+    assert 1000 + RETRY_BASE / 2 <= job.next_attempt_at <= 1000 + RETRY_BASE
+
+    assert 'Song 0' not in titles(store.runnable(SONGS, now=job.next_attempt_at - 1))
+    assert 'Song 0' in titles(store.runnable(SONGS, now=job.next_attempt_at))
+
+    # 다시 시작하면 오류와 다음 시도 시각을 지움
+    store.start('IU - Song 0')
+    job = store.jobs()[0]
+    assert job.status == GENERATING and job.attempts == 2 and job.error is None and job.next_attempt_at is None
+
+def test_attempts_exhausted(store):
+    for _ in range(MAX_ATTEMPTS):
+        store.start('IU - Song 0')
+        store.fail('IU - Song 0', 'boom')
+    job = store.jobs()[0]
+    assert job.attempts == MAX_ATTEMPTS and job.next_attempt_at is None
+    assert 'Song 0' not in titles(store.runnable(SONGS, now=float('inf')))
+
+def test_update_rejects_unknown_fields(store):
+    with pytest.raises(ValueError):
+        store.update('IU - Song 0', attempts=0)
+
+def test_tokens_round_trip(store):
+    store.update('IU - Song 0', tokens={'chords': 10, 'description': 5})
+    assert store.jobs()[0].tokens == {'chords': 10, 'description': 5}
+    assert store.jobs()[1].tokens == {}
+
+def test_migrates_store_without_tokens(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE jobs (
+            song TEXT PRIMARY KEY, artist TEXT, title TEXT, status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0, chord_path TEXT, image_path TEXT, description_path TEXT,
+            timings TEXT NOT NULL DEFAULT '{}', error TEXT, next_attempt_at REAL, updated_at REAL NOT NULL
+        )""")
+    db.execute("INSERT INTO jobs (song, artist, title, status, attempts, chord_path, timings, updated_at) "
+               "VALUES ('IU - Song 0', 'IU', 'Song 0', 'rendered', 1, 'song0.txt', '{\"chords\": 1.5}', 0)")
+    db.commit()
+    db.close()
+
+    store = JobStore(path)
+    [job] = store.jobs()
+    assert job.status == RENDERED and job.chord_path == 'song0.txt'
+    assert job.timings == {'chords': 1.5} and job.tokens == {}
+    store.update('IU - Song 0', tokens={'description': 5})
+    store.close()
+
+    # 이미 옮긴 저장소를 다시 열어도 그대로
+    store = JobStore(path)
+    assert store.jobs()[0].tokens == {'description': 5}
+    assert titles(store.runnable(['IU - Song 0'])) == ['Song 0']
+    store.close()
@@ -0,0 +1,29 @@
+import layout_engine
+from layout_engine import measure, measure_runs
+
+class FakeFont:
+    """글자마다 너비 10, 첫 글자의 왼쪽 여백 bearing인 폰트"""
+
+    def __init__(self, name, bearing):
+        self.name = name
+        self.bearing = bearing
+
+    def getbbox(self, text):
+        return (self.bearing, 2, 10 * len(text), 20)
+
+    def getlength(self, text):
+        return 10 * len(text)
+
+def test_multi_run_width_matches_measure(monkeypatch):
+    primary = FakeFont('primary', 3)
+    fallback = FakeFont('fallback', 1)
+    monkeypatch.setattr(layout_engine, 'split_runs', lambda text, fonts: [(text, fonts[0])])
+    single_width, single_height, _ = measure_runs((primary, fallback), '[Chorus]')
+    assert (single_width, single_height) == measure(primary, '[Chorus]') == (77, 18)
+
+    # 같은 너비의 글자를 두 폰트로 나눠 그려도 첫 구간의 왼쪽 여백을 빼서 같은 너비로 측정
+    monkeypatch.setattr(layout_engine, 'split_runs',
+                        lambda text, fonts: [(text[:3], fonts[0]), (text[3:], fonts[1])])
+    width, height, runs = measure_runs((primary, fallback), '[Chorus]')
+    assert [run for run, _ in runs] == ['[Ch', 'orus]']
+    assert (width, height) == (single_width, single_height)
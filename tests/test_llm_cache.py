@@ -0,0 +1,68 @@
+from llm_cache import ResponseCache, cache_key
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def payload(prompt, **extra):
+    return dict({'model': 'llama3', 'prompt': prompt, 'stream': True, 'options': {'temperature': 0.1}}, **extra)
+
+def make_cache(tmp_path, **kwargs):
+    clock = Clock()
+    return ResponseCache(str(tmp_path / 'responses.sqlite3'), clock=clock, **kwargs), clock
+
+def test_cache_key():
+    assert cache_key(payload('a')) == cache_key(payload('a', stream=False))
+    assert cache_key(payload('a')) != cache_key(payload('b'))
+    assert cache_key(payload('a')) != cache_key(dict(payload('a'), options={'temperature': 0.5}))
+    assert cache_key(payload('a', context=[1, 2])) != cache_key(payload('a', context=[1, 3]))
+    assert cache_key(payload('a', context=[])) == cache_key(payload('a'))
+
+def test_hits_and_misses(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    assert cache.get('k') is None
+    cache.put('k', 'llama3', {'response': '응답'})
+    assert cache.get('k') == {'response': '응답'}
+    assert cache.get('k') == {'response': '응답'}
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'entries': 1}
+
+def test_ttl_expiry(tmp_path):
+    cache, clock = make_cache(tmp_path, ttl=60)
+    cache.put('old', 'llama3', {'response': 'a'})
+    clock.now += 30
+    cache.put('new', 'llama3', {'response': 'b'})
+    assert cache.get('old') is not None
+
+    # 사용해도 저장한 시각 기준으로 만료
+    clock.now += 31
+    assert cache.get('old') is None
+    assert cache.get('new') is not None
+    assert cache.stats()['entries'] == 1
+
+    clock.now += 60
+    assert cache.purge_expired() == 1
+    assert cache.stats()['entries'] == 0
+
+def test_lru_eviction(tmp_path):
+    cache, clock = make_cache(tmp_path, max_entries=2)
+    cache.put('a', 'llama3', {'response': 'a'})
+    clock.now += 1
+    cache.put('b', 'llama3', {'response': 'b'})
+    clock.now += 1
+    assert cache.get('a') is not None   # a를 최근에 사용
+    clock.now += 1
+    cache.put('c', 'llama3', {'response': 'c'})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['entries'] == 2
+
+def test_persists_between_instances(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.put('k', 'llama3', {'response': '응답'})
+    cache.close()
+    cache, _ = make_cache(tmp_path)
+    assert cache.get('k') == {'response': '응답'}
@@ -0,0 +1,57 @@
+import asyncio
+import sqlite3
+import json
+
+import pytest
+
+pytest.importorskip('requests')
+
+from llm_cache import ResponseCache
+from llm_handler import LLMHandler
+
+class FakeClient:
+    max_concurrency = 1
+
+    def __init__(self):
+        self.payloads = []
+
+    async def agenerate(self, payload, on_chunk=None):
+        self.payloads.append(payload)
+        text = 'Am  G' if 'context' not in payload else '설명'
+        return {'response': text, 'done': True, 'prompt_eval_count': len(payload['prompt']), 'eval_count': 3,
+                'total_duration': 1, 'context': list(range(50))}
+
+def stored(cache):
+    db = sqlite3.connect(cache.path)
+    try:
+        return [json.loads(row[0]) for row in db.execute("SELECT data FROM responses")]
+    finally:
+        db.close()
+
+def test_context_reuse_and_cached_fields(tmp_path):
+    client = FakeClient()
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite3'))
+    llm = LLMHandler(client=client, cache=cache)
+
+    async def describe():
+        chords = await llm.agenerate_chord_progression('IU', '좋은 날')
+        description = await llm.agenerate_song_description('IU', '좋은 날', chords.text, chords.context)
+        return chords, description
+
+    chords, description = asyncio.run(describe())
+    assert client.payloads[1]['context'] == chords.context
+    assert 'Am  G' not in client.payloads[1]['prompt']
+    assert description.text.endswith('📝 코드 진행\nAm  G')
+    assert chords.prompt_eval_count > 0 and description.prompt_eval_count > 0
+
+    # 이어서 요청하지 않는 설명 응답은 context 없이 저장
+    entries = sorted(stored(cache), key=lambda data: 'context' in data)
+    assert entries[0] == {'response': '설명', 'done': True, 'prompt_eval_count': description.prompt_eval_count,
+                          'eval_count': 3}
+    assert entries[1]['context'] == list(range(50)) and 'total_duration' not in entries[1]
+
+    # 캐시 적중이면 새로 평가한 토큰은 0이고, 코드 진행의 context로 설명도 캐시에서 찾음
+    cached_chords, cached_description = asyncio.run(describe())
+    assert len(client.payloads) == 2
+    assert cached_chords.cached and cached_chords.prompt_eval_count == 0
+    assert cached_description.text == description.text
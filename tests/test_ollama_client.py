@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from ollama_client import OllamaClient, OllamaError, _read_stream
+
+class FakeResponse:
+    def __init__(self, lines, status_code=200):
+        self.lines = lines
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = ''
+        self.headers = {}
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+def chunks(*parts, done=True):
+    lines = [json.dumps({'response': part, 'done': False}).encode() for part in parts]
+    if done:
+        lines.append(json.dumps({'response': '', 'done': True, 'prompt_eval_count': 3}).encode())
+    return lines
+
+def test_read_stream_joins_chunks():
+    seen = []
+    data = _read_stream(FakeResponse(chunks('Am', ' G')), seen.append)
+    assert data['response'] == 'Am G' and data['prompt_eval_count'] == 3
+    assert seen == ['Am', ' G']
+
+@pytest.mark.parametrize('lines', [
+    chunks('Am')[:1] + [b'{"response": "G", "do'],   # 잘린 조각
+    [b'not json'],
+    chunks('Am', done=False),                         # done 전에 끝남
+])
+def test_broken_stream_is_retryable(lines):
+    with pytest.raises(requests.ConnectionError):
+        _read_stream(FakeResponse(lines))
+
+def test_broken_stream_is_retried(monkeypatch):
+    monkeypatch.setattr('ollama_client.backoff_delay', lambda attempt, retry_after=None: 0)
+    responses = [FakeResponse([b'{"response": "A']), FakeResponse(chunks('Am'))]
+    client = OllamaClient(max_retries=1)
+    monkeypatch.setattr(client.session, 'post', lambda *args, **kwargs: responses.pop(0))
+    assert client.generate({'prompt': 'x'})['response'] == 'Am'
+    assert client.stats == {'requests': 2, 'retries': 1, 'failures': 0}
+
+def test_error_chunk_is_not_retried(monkeypatch):
+    client = OllamaClient(max_retries=3)
+    monkeypatch.setattr(client.session, 'post', lambda *args, **kwargs: FakeResponse([b'{"error": "bad"}']))
+    with pytest.raises(OllamaError):
+        client.generate({'prompt': 'x'})
+    assert client.stats['requests'] == 1
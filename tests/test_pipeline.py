@@ -0,0 +1,175 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import namedtuple
+
+import pytest
+
+from job_store import JobStore, DESCRIBED, FAILED, RETRY_MAX
+from pipeline import SongPipeline
+
+# LLMHandler.Generation과 같은 이름의 항목만 가진 결과
+Generation = namedtuple('Generation', ['text', 'context', 'prompt_eval_count'])
+
+SONGS = [f'IU - Song {i}' for i in range(4)]
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+class FakeLLM:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+
+    async def agenerate_chord_progression(self, artist, title):
+        self.calls.append(('chords', title))
+        await asyncio.sleep(0)
+        if ('chords', title) in self.fail:
+            raise ValueError('chords failed')
+        return Generation(f'{title}\nAm  G\n', [len(self.calls)], 10)
+
+    async def agenerate_song_description(self, artist, title, chord_progression, context=None):
+        self.calls.append(('description', title, context))
+        await asyncio.sleep(0)
+        if ('description', title) in self.fail:
+            raise ValueError('description failed')
+        return Generation(f'{title} 설명', None, 5)
+
+class FakeRenderer:
+    def __init__(self, fail=(), gate=None):
+        self.fail = set(fail)
+        self.gate = gate
+        self.rendered = []
+
+    def create_chord_image(self, text, image_path):
+        if self.gate is not None:
+            self.gate.wait(5)
+        title = text.split('\n')[0]
+        if title in self.fail:
+            raise ValueError('render failed')
+        write(image_path, text)
+        self.rendered.append(title)
+        return [image_path]
+
+class FakeTextGenerator:
+    def save_description(self, description, path):
+        write(path, description)
+
+def run(tmp_path, llm, renderer, store=None, songs=SONGS, now=None, **kwargs):
+    store = store or JobStore(str(tmp_path / 'jobs.sqlite3'))
+    store.sync(songs)
+    pipeline = SongPipeline(llm, renderer, FakeTextGenerator(), generators=2,
+                            output_dir=str(tmp_path / 'output'), store=store, **kwargs)
+    return asyncio.run(pipeline.run(store.runnable(songs, now))), store
+
+def test_all_songs_processed(tmp_path):
+    llm = FakeLLM()
+    tasks, store = run(tmp_path, llm, FakeRenderer())
+
+    assert [task.song for task in tasks] == SONGS
+    for task in tasks:
+        assert task.error is None and task.finished is not None
+        assert task.status == DESCRIBED
+        assert os.path.exists(task.chord_path) and os.path.exists(task.description_path)
+        assert task.tokens['chords'] == 10 and task.tokens['description'] == 5
+        assert task.context is None
+    # 설명 요청은 코드 진행 요청의 context를 이어서 사용
+    assert all(call[2] for call in llm.calls if call[0] == 'description')
+    assert store.counts()[DESCRIBED] == len(SONGS)
+    assert {job.song: job.tokens for job in store.jobs()}[SONGS[0]]['description'] == 5
+
+def test_description_not_blocked_by_render_queue(tmp_path):
+    gate = threading.Event()
+    llm = FakeLLM()
+
+    async def main():
+        store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+        store.sync(SONGS)
+        pipeline = SongPipeline(llm, FakeRenderer(gate=gate), FakeTextGenerator(), generators=1,
+                                queue_size=1, output_dir=str(tmp_path / 'output'))
+        run_task = asyncio.create_task(pipeline.run(store.runnable(SONGS)))
+        # 렌더링이 막혀 있어도 렌더링 대기열이 찬 곡(세 번째 곡)까지 설명 요청을 보냄
+        for _ in range(200):
+            if sum(call[0] == 'description' for call in llm.calls) >= 3:
+                break
+            await asyncio.sleep(0.01)
+        described = sum(call[0] == 'description' for call in llm.calls)
+        gate.set()
+        return described, await run_task
+
+    described, tasks = asyncio.run(main())
+    assert described == 3
+    assert all(task.error is None for task in tasks)
+
+def test_branch_failures(tmp_path):
+    llm = FakeLLM(fail={('chords', 'Song 1'), ('description', 'Song 2')})
+    renderer = FakeRenderer(fail={'Song 3'})
+    tasks, store = run(tmp_path, llm, renderer)
+    by_title = {task.title: task for task in tasks}
+
+    assert by_title['Song 0'].error is None
+    # 코드 진행이 실패하면 렌더링과 설명 요청 모두 하지 않음
+    assert by_title['Song 1'].error == 'chords failed' and by_title['Song 1'].finished is not None
+    assert ('description', 'Song 1') not in [call[:2] for call in llm.calls]
+    assert 'Song 1' not in renderer.rendered
+    # 한쪽 단계가 실패해도 다른 쪽은 끝까지 진행
+    assert by_title['Song 2'].error == 'description failed' and by_title['Song 2'].image_path
+    assert by_title['Song 3'].error == 'render failed' and by_title['Song 3'].description_path
+    assert all(task.finished is not None for task in tasks)
+
+    jobs = {job.title: job for job in store.jobs()}
+    assert jobs['Song 0'].status == DESCRIBED
+    for title in ('Song 1', 'Song 2', 'Song 3'):
+        assert jobs[title].status == FAILED and jobs[title].error
+
+def test_resume_skips_finished_stages(tmp_path):
+    llm = FakeLLM(fail={('description', 'Song 2')})
+    _, store = run(tmp_path, llm, FakeRenderer(fail={'Song 3'}))
+
+    # 재시도 대기 시간이 지난 뒤 다시 실행
+    llm = FakeLLM()
+    renderer = FakeRenderer()
+    tasks, store = run(tmp_path, llm, renderer, store=store, now=time.time() + 2 * RETRY_MAX)
+
+    # 완료된 곡은 다시 처리하지 않고, 실패한 곡은 끝나지 않은 단계만 다시 실행
+    assert [task.title for task in tasks] == ['Song 2', 'Song 3']
+    assert [call[0] for call in llm.calls] == ['description']
+    assert llm.calls[0][1] == 'Song 2' and llm.calls[0][2] is None
+    assert renderer.rendered == ['Song 3']
+    assert store.counts()[DESCRIBED] == len(SONGS)
+    assert {job.title: job.attempts for job in store.jobs()} == {
+        'Song 0': 1, 'Song 1': 1, 'Song 2': 2, 'Song 3': 2}
+
+class LockedStore(JobStore):
+    # 다른 실행이 작업 저장소를 잠근 경우
+    def start(self, song):
+        raise sqlite3.OperationalError('database is locked')
+
+    def fail(self, song, error):
+        raise sqlite3.OperationalError('database is locked')
+
+def test_store_errors_fail_songs_without_stopping_workers(tmp_path):
+    store = LockedStore(str(tmp_path / 'jobs.sqlite3'))
+    store.sync(SONGS)
+    pipeline = SongPipeline(FakeLLM(), FakeRenderer(), FakeTextGenerator(), generators=2, queue_size=1,
+                            output_dir=str(tmp_path / 'output'), store=store)
+    tasks = asyncio.run(asyncio.wait_for(pipeline.run(store.runnable(SONGS)), 5))
+
+    assert [task.error for task in tasks] == ['database is locked'] * len(SONGS)
+    assert all(task.finished is not None for task in tasks)
+
+def test_dead_worker_raises_instead_of_hanging(tmp_path):
+    class BrokenPipeline(SongPipeline):
+        async def _render(self, render_queue, executor):
+            raise RuntimeError('renderer died')
+
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    store.sync(SONGS)
+    pipeline = BrokenPipeline(FakeLLM(), FakeRenderer(), FakeTextGenerator(), generators=1, queue_size=1,
+                              output_dir=str(tmp_path / 'output'), store=store)
+    with pytest.raises(RuntimeError, match='renderer died'):
+        asyncio.run(asyncio.wait_for(pipeline.run(store.runnable(SONGS)), 5))
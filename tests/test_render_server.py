@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from render_server import RenderServer, HTTPError, content_length, MAX_BODY_SIZE
+
+@pytest.mark.parametrize('value, length', [(None, 0), ('', 0), ('0', 0), ('12', 12), (str(MAX_BODY_SIZE), MAX_BODY_SIZE)])
+def test_content_length(value, length):
+    assert content_length(value) == length
+
+@pytest.mark.parametrize('value, status', [
+    ('abc', 400), ('-1', 400), ('1.5', 400), ('1 2', 400), ('١٢', 400), (str(MAX_BODY_SIZE + 1), 413),
+])
+def test_content_length_rejects(value, status):
+    with pytest.raises(HTTPError) as error:
+        content_length(value)
+    assert error.value.status == status
+
+@pytest.mark.parametrize('value, status', [('abc', 400), ('-5', 400), (str(MAX_BODY_SIZE + 1), 413)])
+def test_bad_content_length_gets_response(value, status):
+    async def request():
+        # 렌더링 전에 거절되므로 워커 풀 없이 연결 처리만 확인
+        server = RenderServer(jobs=1)
+        listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'POST /render HTTP/1.1\r\nContent-Length: {value}\r\n\r\n'.encode('latin-1'))
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+        return response
+
+    response = asyncio.run(request())
+    assert response.startswith(f'HTTP/1.1 {status} '.encode())
+    assert b'Connection: close' in response
@@ -0,0 +1,53 @@
+import pytest
+
+from sheet_parser import (classify_line, parse_sheet, SECTION_RE, BLANK, SECTION, CAPO, CHORDS,
+                          CHORD_LYRIC, LYRIC, METADATA)
+
+@pytest.mark.parametrize('line, kind', [
+    ('', BLANK),
+    ('   ', BLANK),
+    # 괄호, 번호, 한글 섹션 헤더
+    ('[Chorus]', SECTION),
+    ('(Verse 2)', SECTION),
+    ('Bridge', SECTION),
+    ('verse 2', SECTION),
+    ('[Intro] 2', SECTION),
+    ('Pre-Chorus', SECTION),
+    ('  Solo 1  ', SECTION),
+    ('간주', SECTION),
+    ('후렴 2', SECTION),
+    ('[브릿지]', SECTION),
+    ('Capo 2', CAPO),
+    ('capo 3', CAPO),
+    ('Am  G  F', CHORDS),
+    ('Am 사랑해', CHORD_LYRIC),
+    ('G hello there', CHORD_LYRIC),
+    ('그대 나를 보면', LYRIC),
+    ('Verse 2:', LYRIC),
+    # 메타데이터
+    ('Written by Someone', METADATA),
+    ('© 2020', METADATA),
+    ('https://example.com/tab', METADATA),
+    ('www.example.com', METADATA),
+    ('Key: G', METADATA),
+    ('tuning: standard', METADATA),
+    ('Published by Label', METADATA),
+])
+def test_classify_line(line, kind):
+    assert classify_line(line) == kind
+
+@pytest.mark.parametrize('line', ['Chorus', '[chorus]', '(Outro)', 'Interlude 3', '[Verse 1]', '후렴'])
+def test_section_re_matches_headers(line):
+    assert SECTION_RE.match(line)
+
+@pytest.mark.parametrize('line', ['Chorus line of the song', 'Verses', '[Chorus] 사랑해', '사랑의 후렴'])
+def test_section_re_rejects_lyrics(line):
+    assert SECTION_RE.match(line) is None
+
+def test_parse_sheet_sections():
+    doc = parse_sheet('Capo 2\r\n[Verse 1]\r\nAm  G\r\n가사\n\n후렴 2\nC  G\n')
+    assert [section.name for section in doc.sections] == ['[Verse 1]', '후렴 2']
+    assert [(section.start, section.end) for section in doc.sections] == [(1, 5), (5, 8)]
+    assert doc.lines[0].section is None
+    assert doc.lines[2].chords == ((0, 'Am'), (4, 'G'))
+    assert doc.lines[6].section == 1
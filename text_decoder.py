@@ -0,0 +1,96 @@
+import codecs
+from collections import namedtuple
+
+# 디코딩 결과 (confidence: 0.0 ~ 1.0, 0이면 어떤 인코딩으로도 읽을 수 없었음)
+DecodedText = namedtuple('DecodedText', ['text', 'encoding', 'confidence'])
+
+# 이 값보다 신뢰도가 낮으면 인코딩 판별이 불확실한 파일로 봄
+LOW_CONFIDENCE = 0.5
+
+# BOM으로 바로 판별 가능한 인코딩 (UTF-32 LE가 UTF-16 LE BOM을 포함하므로 먼저 확인)
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# UTF-8이 아닐 때 후보로 점수를 매길 CJK 인코딩과 각 언어에서 자주 쓰이는 문자
+# (EUC 계열 인코딩은 서로의 바이트를 문법적으로는 디코딩할 수 있어서 빈도로 구분함)
+CANDIDATES = [
+    ('cp949', set("이다는의에가을고하지로나를서한기사어도리인수자아그시게내대니해요우주마라"
+                  "거전보상정면네너랑사랑날말만들음일없있할것같은제때더까세워줘봐눈맘")),
+    ('cp932', set("のにはをたがでてとしれさかなるいもうくあんっこすきらだりまそよつ"
+                  "ねめけえわせみおどずやちろ人日私心夢愛今見行時言君僕")),
+    ('gbk', set("的一是不了人我在有他这中大来上个国到说们为子和你地出道也时年得就那要下以生会"
+                "自着去之过家学对可她里后小么心多天而能好都然没日于起还发成事只作当想看文无")),
+    ('big5', set("的一是不了人我在有他這中大來上個國到說們為子和你地出道也時年得就那要下以生會"
+                 "自著去之過家學對可她裡後小麼心多天而能好都然沒日於起還發成事只作當想看文無")),
+]
+
+SAMPLE_SIZE = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+
+def _decode_utf8(data):
+    # 청크 단위로 검증하며 디코딩 - 잘못된 바이트를 만나면 바로 중단
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    view = memoryview(data)
+    parts = []
+    try:
+        for start in range(0, len(data), CHUNK_SIZE):
+            parts.append(decoder.decode(view[start:start + CHUNK_SIZE]))
+        parts.append(decoder.decode(b'', final=True))
+    except UnicodeDecodeError:
+        return None
+    return ''.join(parts)
+
+def _score(sample, encoding, common_chars):
+    # 샘플을 디코딩할 수 없으면 None, 아니면 비ASCII 문자 중 자주 쓰는 문자 비율
+    try:
+        # final=False: 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return None
+
+    non_ascii = [c for c in text if ord(c) > 0x7F and not c.isspace()]
+    if not non_ascii:
+        return 1.0
+    return sum(1 for c in non_ascii if c in common_chars) / len(non_ascii)
+
+def decode_bytes(data):
+    """바이트를 한 번만 읽은 상태에서 인코딩을 판별해 DecodedText로 반환"""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            try:
+                return DecodedText(data.decode(encoding), encoding, 1.0)
+            except UnicodeDecodeError:
+                break
+
+    text = _decode_utf8(data)
+    if text is not None:
+        return DecodedText(text, 'utf-8', 1.0)
+
+    # 후보 인코딩마다 앞부분 샘플로 점수를 매기고 가장 높은 것을 선택
+    sample = data[:SAMPLE_SIZE]
+    best_encoding, best_score = None, -1.0
+    for encoding, common_chars in CANDIDATES:
+        score = _score(sample, encoding, common_chars)
+        if score is not None and score > best_score:
+            best_encoding, best_score = encoding, score
+
+    if best_encoding is None:
+        # 어떤 인코딩으로도 읽을 수 없음 - 깨진 글자는 대체 문자로 표시
+        return DecodedText(data.decode('utf-8', errors='replace'), None, 0.0)
+
+    try:
+        return DecodedText(data.decode(best_encoding), best_encoding, best_score)
+    except UnicodeDecodeError:
+        # 샘플 이후에 잘못된 바이트가 있는 경우
+        return DecodedText(data.decode(best_encoding, errors='replace'), best_encoding, best_score * 0.5)
+
+def read_text(file_path):
+    """파일을 한 번만 읽어서 디코딩"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return decode_bytes(data)
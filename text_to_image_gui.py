@@ -1,11 +1,32 @@
 import sys
 import os
+import threading
+import multiprocessing
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout, 
                            QHBoxLayout, QWidget, QLabel, QFileDialog, QProgressBar,
-                           QMessageBox, QFrame)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QIcon
-from convert_text_to_image import convert_file
+                           QMessageBox, QFrame, QListWidget, QListWidgetItem, QSplitter,
+                           QPlainTextEdit, QScrollArea)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QIcon, QImage, QPixmap
+from sheet_preview import content_key, draw_preview, PreviewCache
+from text_decoder import read_text
+
+# batch_converter, convert_text_to_image는 PIL과 폰트 설정을 함께 불러오므로 필요할 때 import함
+# (창을 먼저 띄우고 WarmUpWorker가 백그라운드에서 미리 불러 둠)
+
+# 진행 상황을 화면에 반영하는 간격 (약 30fps)
+UI_FRAME_MS = 33
+
+# 편집이 멈추고 이만큼 지나면 미리보기를 다시 그림
+PREVIEW_DEBOUNCE_MS = 300
+
+# 파일별 상태 표시
+STATUS_PENDING = '⏳'
+STATUS_DONE = '✅'
+STATUS_SKIPPED = '⏭️'
+STATUS_FAILED = '❌'
+STATUS_CANCELLED = '🚫'
 
 class CuteButton(QPushButton):
     def __init__(self, text, parent=None):
@@ -25,51 +46,104 @@ class CuteFrame(QFrame):
             }
         """)
 
+class WarmUpWorker(QThread):
+    """창이 뜬 뒤 백그라운드에서 렌더러 모듈, 폰트, 워터마크를 미리 불러오는 스레드"""
+
+    def run(self):
+        try:
+            from batch_converter import warm_up
+            warm_up()
+        except Exception as e:
+            print(f"미리 불러오기 실패: {e}")
+
 class ConversionWorker(QThread):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal()
+    """
+    병렬 변환 백엔드(convert_batch)를 백그라운드에서 실행하는 스레드
+
+    파일마다 시그널을 보내지 않고 결과를 큐에 쌓아 두면, 화면 쪽 타이머가 일정한 간격으로
+    한꺼번에 가져가서 그립니다. 파일이 수천 개여도 이벤트 루프가 밀리지 않습니다.
+    """
     error = pyqtSignal(str)
-    
-    def __init__(self, input_dir):
+
+    def __init__(self, files, output_dir):
         super().__init__()
-        self.input_dir = input_dir
-        
+        self.files = files
+        self.output_dir = output_dir
+        self.results = deque()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
     def run(self):
         try:
-            files = [f for f in os.listdir(self.input_dir) 
-                    if os.path.isfile(os.path.join(self.input_dir, f)) and 
-                    (f.lower().endswith('.txt') or os.path.splitext(f)[1] == '')]
-            
-            if not files:
-                self.error.emit('변환할 텍스트 파일이 없습니다 🥺')
-                return
-                
-            output_dir = os.path.join(os.path.dirname(self.input_dir), "output")
-            os.makedirs(output_dir, exist_ok=True)
-            
-            total_files = len(files)
-            for i, filename in enumerate(files, 1):
-                try:
-                    file_path = os.path.join(self.input_dir, filename)
-                    image_file = convert_file(file_path)
-                    
-                    if image_file:
-                        # 파일 이동
-                        os.rename(file_path, os.path.join(output_dir, filename))
-                        os.rename(image_file, os.path.join(output_dir, os.path.basename(image_file)))
-                    
-                    progress = int((i / total_files) * 100)
-                    self.progress.emit(progress)
-                    
-                except Exception as e:
-                    self.error.emit(f'파일 변환 중 오류 발생: {filename}\n{str(e)} 😢')
-                    continue
-            
-            self.finished.emit()
-            
+            from batch_converter import convert_batch
+            for result in convert_batch(self.files, self.output_dir, cancel_event=self.cancel_event):
+                self.results.append(result)
         except Exception as e:
             self.error.emit(f'처리 중 오류가 발생했습니다: {str(e)} 😢')
 
+def pil_to_qimage(img):
+    # QImage는 데이터를 복사하지 않으므로 copy()로 버퍼를 소유하게 함
+    img = img.convert('RGB')
+    data = img.tobytes()
+    return QImage(data, img.width, img.height, img.width * 3, QImage.Format_RGB888).copy()
+
+class PreviewWorker(QThread):
+    """
+    미리보기를 백그라운드에서 그리는 스레드
+
+    가장 최근 요청 하나만 기억하므로, 그리는 도중 새 요청이 들어오면 남은 단계는 건너뛰고
+    새 요청을 그립니다. 요청마다 초안(워터마크 없음, 축소)을 먼저 보내고 이어서 완성본을 보냅니다.
+    """
+    rendered = pyqtSignal(int, str, bool, QImage)  # 요청 번호, 캐시 키, 초안 여부, 이미지
+    failed = pyqtSignal(int, str)
+
+    def __init__(self):
+        super().__init__()
+        self._condition = threading.Condition()
+        self._request = None
+        self._stopped = False
+
+    def request(self, generation, key, text, title, draft=True):
+        # 아직 시작하지 않은 이전 요청은 덮어씀
+        with self._condition:
+            self._request = (generation, key, text, title, draft)
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _is_stale(self):
+        with self._condition:
+            return self._request is not None or self._stopped
+
+    def run(self):
+        from convert_text_to_image import layout_sheet, EmptySheetError
+
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, key, text, title, draft = self._request
+                self._request = None
+
+            try:
+                plan = layout_sheet(text, title)[0]
+                for quality in ((True, False) if draft else (False,)):
+                    if self._is_stale():
+                        break
+                    image = pil_to_qimage(draw_preview(plan, quality))
+                    self.rendered.emit(generation, key, quality, image)
+            except EmptySheetError:
+                self.failed.emit(generation, '미리볼 내용이 없어요 🥺')
+            except Exception as e:
+                self.failed.emit(generation, f'미리보기를 그릴 수 없습니다: {str(e)} 😢')
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -77,7 +151,8 @@ class MainWindow(QMainWindow):
         
     def initUI(self):
         self.setWindowTitle('✨ 텍스트 → 이미지 변환기 ✨')
-        self.setFixedSize(500, 300)
+        self.setMinimumSize(900, 560)
+        self.resize(1100, 720)
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #FFF5F5;
@@ -113,12 +188,16 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        # 메인 위젯과 레이아웃
+        # 메인 위젯과 레이아웃 (왼쪽: 변환, 오른쪽: 미리보기)
         main_widget = QWidget()
-        self.setCentralWidget(main_widget)
         layout = QVBoxLayout()
         layout.setSpacing(15)
         main_widget.setLayout(layout)
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(main_widget)
+        splitter.addWidget(self.create_preview_panel())
+        splitter.setSizes([450, 650])
+        self.setCentralWidget(splitter)
         
         # 타이틀 레이블
         title_label = QLabel('🎵 텍스트를 예쁜 이미지로 변환해드려요! 🎵')
@@ -153,12 +232,34 @@ class MainWindow(QMainWindow):
         self.progress_bar = QProgressBar()
         self.progress_bar.setFixedHeight(20)
         content_layout.addWidget(self.progress_bar)
+
+        # 진행 상황 요약
+        self.status_label = QLabel('')
+        self.status_label.setAlignment(Qt.AlignCenter)
+        content_layout.addWidget(self.status_label)
+
+        # 파일별 상태 목록 (항목 높이를 고정해서 수천 개도 빠르게 그림)
+        self.file_list = QListWidget()
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setStyleSheet('background-color: white; border-radius: 5px;')
+        self.file_list.currentItemChanged.connect(self.file_selected)
+        content_layout.addWidget(self.file_list)
         
-        # 변환 버튼
+        # 변환/취소 버튼
+        button_frame = QFrame()
+        button_layout = QHBoxLayout()
+        button_frame.setLayout(button_layout)
+
         self.convert_btn = CuteButton('✨ 변환 시작 ✨')
         self.convert_btn.clicked.connect(self.start_conversion)
         self.convert_btn.setEnabled(False)
-        content_layout.addWidget(self.convert_btn)
+        button_layout.addWidget(self.convert_btn)
+
+        self.cancel_btn = CuteButton('취소 🛑')
+        self.cancel_btn.clicked.connect(self.cancel_conversion)
+        self.cancel_btn.setEnabled(False)
+        button_layout.addWidget(self.cancel_btn)
+        content_layout.addWidget(button_frame)
         
         layout.addWidget(content_frame)
         
@@ -169,6 +270,55 @@ class MainWindow(QMainWindow):
         
         self.selected_dir = None
         self.worker = None
+        self.rows = {}
+        self.errors = []
+        self.counts = {}
+
+        # 백그라운드 변환 결과를 일정한 간격으로 모아서 화면에 반영
+        self.ui_timer = QTimer(self)
+        self.ui_timer.setInterval(UI_FRAME_MS)
+        self.ui_timer.timeout.connect(self.drain_results)
+
+        # 미리보기: 편집이 멈출 때까지 기다렸다가 그리고, 결과는 내용별로 캐시
+        self.preview_title = ''
+        self.preview_generation = 0
+        self.preview_image = None
+        self.preview_cache = PreviewCache()
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.update_preview)
+        self.preview_worker = PreviewWorker()
+        self.preview_worker.rendered.connect(self.preview_rendered)
+        self.preview_worker.failed.connect(self.preview_failed)
+        self.warm_up_worker = WarmUpWorker()
+
+    def start_warm_up(self):
+        # 창이 그려진 다음 이벤트 루프에서 호출됨
+        self.warm_up_worker.start()
+
+    def create_preview_panel(self):
+        panel = CuteFrame()
+        panel_layout = QVBoxLayout()
+        panel.setLayout(panel_layout)
+
+        self.preview_label = QLabel('👀 파일을 선택하면 미리보기가 나타나요')
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        panel_layout.addWidget(self.preview_label)
+
+        # 편집한 내용은 미리보기에만 반영되고 파일에는 저장되지 않음
+        self.editor = QPlainTextEdit()
+        self.editor.setStyleSheet('background-color: white; border-radius: 5px;')
+        self.editor.textChanged.connect(self.preview_timer_restart)
+        panel_layout.addWidget(self.editor, 1)
+
+        self.preview_view = QLabel()
+        self.preview_view.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        self.preview_scroll = QScrollArea()
+        self.preview_scroll.setWidgetResizable(True)
+        self.preview_scroll.setWidget(self.preview_view)
+        panel_layout.addWidget(self.preview_scroll, 2)
+        return panel
         
     def select_folder(self):
         folder = QFileDialog.getExistingDirectory(self, '폴더 선택')
@@ -176,34 +326,219 @@ class MainWindow(QMainWindow):
             self.selected_dir = folder
             self.path_label.setText(f'선택된 폴더: {folder} 📂')
             self.convert_btn.setEnabled(True)
+            from batch_converter import find_input_files
+            self.fill_file_list(find_input_files(folder))
+
+    def fill_file_list(self, files, status=None):
+        self.file_list.clear()
+        self.rows = {}
+        for i, file_path in enumerate(files):
+            filename = os.path.basename(file_path)
+            item = QListWidgetItem(f'{status} {filename}' if status else filename)
+            item.setData(Qt.UserRole, file_path)
+            self.file_list.addItem(item)
+            self.rows[file_path] = i
+
+    def file_selected(self, item, previous=None):
+        if item is None:
+            return
+        file_path = item.data(Qt.UserRole)
+        try:
+            decoded = read_text(file_path)
+        except OSError:
+            # 변환이 끝난 파일은 Done 폴더로 옮겨짐
+            self.preview_label.setText('파일을 찾을 수 없어요 (이미 변환되어 옮겨졌을 수 있어요) 🥺')
+            return
+        if decoded.encoding is None:
+            self.preview_label.setText('파일을 읽을 수 없어요 (인코딩 문제) 😢')
+            return
+
+        # 파일명의 내용을 타이틀로 사용 (convert_file과 같음)
+        self.preview_title = os.path.splitext(os.path.basename(file_path))[0]
+        self.editor.blockSignals(True)
+        self.editor.setPlainText(decoded.text)
+        self.editor.blockSignals(False)
+        self.update_preview()
+
+    def preview_timer_restart(self):
+        # 입력할 때마다 타이머를 다시 시작해서 입력이 멈춘 뒤에만 그림
+        self.preview_timer.start()
+
+    def update_preview(self):
+        self.preview_timer.stop()
+        text = self.editor.toPlainText()
+        key = content_key(text, self.preview_title)
+        self.preview_generation += 1
+
+        cached = self.preview_cache.best(key)
+        if cached is not None:
+            image, draft = cached
+            self.show_preview(image, draft)
+            if not draft:
+                return
+            # 초안만 있으면 완성본만 다시 그림
+            self.request_preview(key, text, draft=False)
+            return
+
+        self.preview_label.setText('🎨 미리보기를 그리는 중...')
+        self.request_preview(key, text)
+
+    def request_preview(self, key, text, draft=True):
+        # 미리보기 스레드는 렌더러를 import하므로 창이 처음 그려지는 동안이 아니라 첫 요청에서 시작
+        if not self.preview_worker.isRunning():
+            self.preview_worker.start()
+        self.preview_worker.request(self.preview_generation, key, text, self.preview_title, draft)
+
+    def preview_rendered(self, generation, key, draft, image):
+        # 지난 요청의 결과도 내용별로 캐시해 두고, 화면에는 최근 요청의 결과만 표시
+        self.preview_cache.put(key, draft, image, image.sizeInBytes())
+        if generation == self.preview_generation:
+            self.show_preview(image, draft)
+
+    def preview_failed(self, generation, message):
+        if generation == self.preview_generation:
+            self.preview_image = None
+            self.preview_view.clear()
+            self.preview_label.setText(message)
+
+    def show_preview(self, image, draft):
+        self.preview_image = image
+        self.preview_label.setText('✏️ 초안 미리보기 (완성본을 그리는 중...)' if draft else '✨ 미리보기')
+        self.fit_preview()
+
+    def fit_preview(self):
+        # 초안은 작게 그려지므로 완성본과 같은 폭으로 맞춰서 표시
+        if self.preview_image is None:
+            return
+        width = self.preview_scroll.viewport().width() - 4
+        pixmap = QPixmap.fromImage(self.preview_image)
+        if width > 0:
+            pixmap = pixmap.scaledToWidth(width, Qt.SmoothTransformation)
+        self.preview_view.setPixmap(pixmap)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.fit_preview()
             
     def start_conversion(self):
         if not self.selected_dir:
             QMessageBox.warning(self, '알림 🔔', '폴더를 선택해주세요!')
             return
-            
+
+        from batch_converter import find_input_files
+        files = find_input_files(self.selected_dir)
+        if not files:
+            QMessageBox.warning(self, '알림 🔔', '변환할 텍스트 파일이 없습니다 🥺')
+            return
+
+        output_dir = os.path.join(os.path.dirname(self.selected_dir), "output")
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 파일 목록을 먼저 모두 '대기' 상태로 표시
+        self.fill_file_list(files, STATUS_PENDING)
+        self.errors = []
+        self.counts = {STATUS_DONE: 0, STATUS_SKIPPED: 0, STATUS_FAILED: 0}
+
         self.convert_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setMaximum(len(files))
         self.progress_bar.setValue(0)
-        
-        self.worker = ConversionWorker(self.selected_dir)
-        self.worker.progress.connect(self.update_progress)
+        self.status_label.setText(f'파일 {len(files)}개 변환 중...')
+
+        self.worker = ConversionWorker(files, output_dir)
         self.worker.finished.connect(self.conversion_finished)
         self.worker.error.connect(self.show_error)
         self.worker.start()
-        
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
-        
+        self.ui_timer.start()
+
+    def cancel_conversion(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText('취소하는 중... (변환 중인 파일은 마저 끝냅니다)')
+
+    def drain_results(self):
+        # 지난 프레임 이후에 끝난 파일들을 한 번에 반영
+        if self.worker is None:
+            return
+        results = self.worker.results
+        if not results:
+            return
+
+        while results:
+            result = results.popleft()
+            filename = os.path.basename(result.input_file)
+            if result.error:
+                status = STATUS_FAILED
+                self.errors.append(f'{filename}: {result.error}')
+            elif result.skipped:
+                status = STATUS_SKIPPED
+            else:
+                status = STATUS_DONE
+            self.counts[status] += 1
+            row = self.rows.get(result.input_file)
+            if row is not None:
+                self.file_list.item(row).setText(f'{status} {filename}')
+
+        done = sum(self.counts.values())
+        self.progress_bar.setValue(done)
+        self.status_label.setText(
+            f'{done}/{len(self.rows)} · 완료 {self.counts[STATUS_DONE]} · '
+            f'건너뜀 {self.counts[STATUS_SKIPPED]} · 실패 {self.counts[STATUS_FAILED]}')
+
     def conversion_finished(self):
-        QMessageBox.information(self, '완료 🎉', '모든 파일이 성공적으로 변환되었어요! ✨')
+        self.ui_timer.stop()
+        self.drain_results()
+        cancelled = self.worker.cancel_event.is_set()
+        self.worker = None
         self.convert_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+        # 결과가 오지 않은 파일은 취소된 것
+        cancelled_count = 0
+        for i in range(self.file_list.count()):
+            item = self.file_list.item(i)
+            if item.text().startswith(STATUS_PENDING):
+                item.setText(STATUS_CANCELLED + item.text()[len(STATUS_PENDING):])
+                cancelled_count += 1
+
+        summary = (f'완료 {self.counts[STATUS_DONE]}개, 건너뜀 {self.counts[STATUS_SKIPPED]}개, '
+                   f'실패 {self.counts[STATUS_FAILED]}개')
+        if cancelled_count:
+            summary += f', 취소 {cancelled_count}개'
+        self.status_label.setText(summary)
+
+        # 실패한 파일은 배치가 끝난 뒤 한 번에 보여줌
+        if self.errors:
+            box = QMessageBox(self)
+            box.setIcon(QMessageBox.Warning)
+            box.setWindowTitle('변환 결과 😢')
+            box.setText(f'{summary}\n\n실패한 파일 목록은 자세히 보기에서 확인할 수 있어요.')
+            box.setDetailedText('\n'.join(self.errors))
+            box.exec_()
+        elif cancelled:
+            QMessageBox.information(self, '취소됨 🛑', f'변환을 취소했어요.\n{summary}')
+        else:
+            QMessageBox.information(self, '완료 🎉', '모든 파일이 성공적으로 변환되었어요! ✨')
         
     def show_error(self, message):
         QMessageBox.critical(self, '오류 😢', message)
-        self.convert_btn.setEnabled(True)
+
+    def closeEvent(self, event):
+        # 변환 중에 창을 닫으면 남은 파일을 취소하고 실행 중인 파일이 끝날 때까지 기다림
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        self.preview_worker.stop()
+        self.preview_worker.wait()
+        self.warm_up_worker.wait()
+        event.accept()
 
 if __name__ == '__main__':
+    # PyInstaller로 패키징된 실행 파일에서 프로세스 풀을 사용하기 위해 필요
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    QTimer.singleShot(0, window.start_warm_up)
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -0,0 +1,125 @@
+import os
+import hashlib
+import threading
+from PIL import Image
+
+LOGO_PATH = "assets/logo.png"
+CACHE_DIR = os.path.join(".cache", "watermark")
+
+# 워터마크 세로 간격 (로고 높이의 배수)
+SPACING_RATIO = 3
+
+_tiles = {}
+_strips = {}
+_lock = threading.Lock()
+
+def _logo_key(logo_path):
+    # 로고 파일이 바뀌면 캐시가 무효화되도록 경로, 수정 시각, 크기로 키를 만듦
+    stat = os.stat(logo_path)
+    return f"{os.path.abspath(logo_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+def _cache_path(logo_key, width, opacity):
+    digest = hashlib.sha1(f"{logo_key}:{width}:{opacity}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"logo_{width}_{digest}.png")
+
+def _build_tile(logo_path, width, opacity):
+    logo_img = Image.open(logo_path)
+    ratio = width / logo_img.width
+    height = int(logo_img.height * ratio)
+    logo_img = logo_img.resize((width, height), Image.Resampling.LANCZOS)
+
+    if logo_img.mode != 'RGBA':
+        logo_img = logo_img.convert('RGBA')
+
+    # 픽셀 단위 루프 대신 알파 채널 전체를 한 번에 교체
+    logo_img.putalpha(int(255 * opacity))
+    return logo_img
+
+def get_watermark(width, opacity=0.15, logo_path=LOGO_PATH):
+    """
+    지정한 너비와 투명도의 워터마크 로고를 반환 (로고가 없으면 None)
+
+    결과는 메모리와 디스크(.cache/watermark)에 캐시되며, 로고 파일이 바뀌면 다시 만듭니다.
+    """
+    if not os.path.exists(logo_path):
+        print(f"로고 이미지({logo_path})를 찾을 수 없습니다.")
+        return None
+
+    logo_key = _logo_key(logo_path)
+    key = (logo_key, width, opacity)
+    with _lock:
+        tile = _tiles.get(key)
+        if tile is not None:
+            return tile
+
+        cache_path = _cache_path(logo_key, width, opacity)
+        try:
+            tile = Image.open(cache_path)
+            tile.load()
+        except (IOError, OSError):
+            tile = _build_tile(logo_path, width, opacity)
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tile.save(cache_path)
+            except OSError as e:
+                print(f"워터마크 캐시를 저장할 수 없습니다: {e}")
+
+        _tiles[key] = tile
+        return tile
+
+def _tile_count(tile_height, canvas_height):
+    # 캔버스 안에 완전히 들어가는 워터마크 개수
+    if canvas_height - tile_height <= tile_height:
+        return 0
+    spacing = tile_height * SPACING_RATIO
+    return (canvas_height - 2 * tile_height - 1) // spacing + 1
+
+def get_watermark_positions(canvas_width, canvas_height, width, opacity=0.15, logo_path=LOGO_PATH):
+    """
+    워터마크 로고와 붙일 위치 목록을 반환 (로고가 없으면 (None, []))
+
+    캔버스 전체 크기의 레이어를 만들지 않고 띠(strip) 단위로 그릴 때 사용합니다.
+    """
+    tile = get_watermark(width, opacity, logo_path)
+    if tile is None:
+        return None, []
+    x = (canvas_width - tile.width) // 2
+    spacing = tile.height * SPACING_RATIO
+    count = _tile_count(tile.height, canvas_height)
+    return tile, [(x, tile.height + spacing * i) for i in range(count)]
+
+def _build_strip(tile, canvas_width, count):
+    spacing = tile.height * SPACING_RATIO
+    height = tile.height + spacing * (count - 1) + tile.height
+    strip = Image.new('RGBA', (canvas_width, height), (0, 0, 0, 0))
+    x = (canvas_width - tile.width) // 2
+    for i in range(count):
+        strip.paste(tile, (x, tile.height + spacing * i))
+    return strip
+
+def get_watermark_layer(canvas_width, canvas_height, width, opacity=0.15, logo_path=LOGO_PATH):
+    """
+    캔버스에 한 번에 합성할 수 있는 반복 워터마크 레이어를 반환
+
+    레이어는 캔버스 상단에 맞춰 붙이면 되고, 높이는 마지막 워터마크까지만 포함합니다.
+    워터마크가 들어갈 자리가 없거나 로고가 없으면 None을 반환합니다.
+    """
+    tile = get_watermark(width, opacity, logo_path)
+    if tile is None:
+        return None
+
+    count = _tile_count(tile.height, canvas_height)
+    if count == 0:
+        return None
+
+    key = (id(tile), canvas_width)
+    with _lock:
+        strip, strip_count = _strips.get(key, (None, 0))
+        if strip_count < count:
+            # 긴 곡이 들어올 때마다 다시 만들지 않도록 넉넉하게 두 배씩 늘림
+            strip_count = max(count, strip_count * 2, 8)
+            strip = _build_strip(tile, canvas_width, strip_count)
+            _strips[key] = (strip, strip_count)
+
+    height = tile.height * 2 + tile.height * SPACING_RATIO * (count - 1)
+    return strip.crop((0, 0, canvas_width, height))